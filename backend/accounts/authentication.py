@@ -0,0 +1,149 @@
+"""
+Stateless JWT authentication.
+
+Access tokens issued by LoginView already carry id, username, role and
+profession (see CustomTokenObtainPairSerializer.get_token), which is all
+the role permissions and the provider queue read, so requests are
+authenticated from the signed claims without loading the CustomUser row.
+
+Views that need the full record call cached_user(), a short-TTL cache of
+user rows. When a user's role, profession or active flag changes (see
+accounts.signals) their cached row is dropped and the new identity is
+stored for one access token lifetime, overriding the stale claims of
+tokens issued before the change; refreshed tokens are built from the row.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+USER_CACHE_TTL = 60
+
+IDENTITY_FIELDS = ("role", "profession", "is_active")
+
+
+def _user_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def _identity_key(user_id):
+    return f"auth-identity:{user_id}"
+
+
+# =========================================================
+# User row cache
+# =========================================================
+def cached_user(user_id):
+    """
+    Return the CustomUser row for user_id, from the cache when possible.
+    Read-only: save() a fresh instance, never a cached one.
+    """
+
+    key = _user_key(user_id)
+    user = cache.get(key)
+
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+
+        if user is not None:
+            cache.set(key, user, USER_CACHE_TTL)
+
+    return user
+
+
+def forget_user(user_id):
+    cache.delete(_user_key(user_id))
+
+
+def identity_changed(user_id, identity):
+    """
+    Override the role/profession/is_active claims of every token already
+    issued to user_id until those tokens have expired.
+    """
+
+    forget_user(user_id)
+
+    cache.set(
+        _identity_key(user_id),
+        identity,
+        int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+# =========================================================
+# Token user + authentication class
+# =========================================================
+class ClaimsUser(TokenUser):
+    """
+    Request user built from access token claims. `record` loads the full
+    (cached) CustomUser row for the views that need it.
+    """
+
+    def __init__(self, token, identity=None):
+        super().__init__(token)
+        self.identity = identity or {}
+
+    def _claim(self, name):
+
+        if name in self.identity:
+            return self.identity[name]
+
+        if name in self.token:
+            return self.token[name]
+
+        # tokens from the stock TokenObtainPairView carry no role claims
+        return getattr(self.record, name, None)
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self._claim("role")
+
+    @cached_property
+    def profession(self):
+        return self._claim("profession")
+
+    @cached_property
+    def is_staff(self):
+        # not a token claim; staff-only views load the row
+        return bool(self._claim("is_staff"))
+
+    @property
+    def is_active(self):
+        return self.identity.get("is_active", True)
+
+    @cached_property
+    def record(self):
+        return cached_user(self.id)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication without the per-request user query: one cache
+    read for a pending identity change instead.
+    """
+
+    def get_user(self, validated_token):
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+        user = ClaimsUser(validated_token, cache.get(_identity_key(user_id)))
+
+        if "role" not in validated_token and user.record is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return user
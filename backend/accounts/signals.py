@@ -0,0 +1,54 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import IDENTITY_FIELDS, forget_user, identity_changed
+from .models import CustomUser
+
+
+# =========================================================
+# Cached identity (see accounts.authentication)
+# =========================================================
+def user_identity(user):
+    return {field: getattr(user, field) for field in IDENTITY_FIELDS}
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_user_identity(sender, instance, update_fields=None, raw=False, **kwargs):
+
+    instance._previous_identity = None
+
+    if raw or instance._state.adding:
+        return
+
+    # e.g. the last_login update on every login
+    if update_fields is not None and not (
+        set(IDENTITY_FIELDS) & set(update_fields)
+    ):
+        instance._previous_identity = user_identity(instance)
+        return
+
+    instance._previous_identity = (
+        CustomUser.objects.filter(pk=instance.pk)
+        .values(*IDENTITY_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_cached_identity(sender, instance, created, raw=False, **kwargs):
+
+    if raw or created:
+        return
+
+    before = instance.__dict__.pop("_previous_identity", None)
+    after = user_identity(instance)
+
+    if before is not None and before != after:
+        identity_changed(instance.pk, after)
+    else:
+        forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_deleted_identity(sender, instance, **kwargs):
+    identity_changed(instance.pk, {**user_identity(instance), "is_active": False})
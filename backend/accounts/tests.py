@@ -1,3 +1,140 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import CustomUser
+
+
+# =========================================================
+# Stateless JWT authentication
+# =========================================================
+class ClaimsAuthenticationTests(TestCase):
+
+    def setUp(self):
+
+        cache.clear()
+
+        self.provider = CustomUser.objects.create_user(
+            username="crew",
+            password="pass12345",
+            role="provider",
+            profession="road",
+            latitude=Decimal("28.613900"),
+            longitude=Decimal("77.209000"),
+        )
+
+        self.client = APIClient()
+
+    def login(self):
+
+        response = self.client.post(
+            "/api/v1/token/",
+            {"username": "crew", "password": "pass12345"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["profession"], "road")
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+        return response.data
+
+    def test_requests_skip_the_user_query(self):
+
+        self.login()
+
+        # ETag aggregates + issues + archived issues, no user row
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/v1/reports/provider/issues/my-issues/")
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_reads_cached_row(self):
+
+        self.login()
+
+        self.assertEqual(self.client.get("/api/v1/accounts/profile/").status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/v1/accounts/profile/")
+
+        self.assertEqual(response.data["username"], "crew")
+
+    def test_identity_changes_override_issued_tokens(self):
+
+        tokens = self.login()
+
+        self.provider.profession = "water"
+        self.provider.save()
+
+        self.assertEqual(
+            self.client.get("/api/v1/accounts/profile/").data["profession"],
+            "water",
+        )
+
+        self.provider.role = "consumer"
+        self.provider.profession = None
+        self.provider.latitude = self.provider.longitude = None
+        self.provider.save()
+
+        self.assertEqual(
+            self.client.get("/api/v1/reports/provider/issues/my-issues/").status_code,
+            403,
+        )
+
+        refreshed = self.client.post(
+            "/api/v1/token/refresh/",
+            {"refresh": tokens["refresh"]},
+        )
+
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(AccessToken(refreshed.data["access"])["role"], "consumer")
+
+        self.provider.is_active = False
+        self.provider.save()
+
+        self.assertEqual(
+            self.client.get("/api/v1/accounts/profile/").status_code,
+            401,
+        )
+
+    def test_tokens_without_role_claims_fall_back_to_the_user_row(self):
+
+        # issued by the stock TokenObtainPairView before LoginView was routed
+        token = AccessToken.for_user(self.provider)
+        self.assertNotIn("role", token)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        self.assertEqual(
+            self.client.get("/api/v1/reports/provider/issues/my-issues/").status_code,
+            200,
+        )
+
+        self.provider.delete()
+
+        self.assertEqual(
+            self.client.get("/api/v1/reports/provider/issues/my-issues/").status_code,
+            401,
+        )
+
+    def test_staff_only_views_check_the_user_row(self):
+
+        self.login()
+
+        self.assertEqual(self.client.get("/health/db-pool/").status_code, 403)
+
+        self.provider.is_staff = True
+        self.provider.save()
+
+        response = self.client.get("/health/db-pool/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("databases", response.data)
+
+        self.client.credentials()
 
-# Create your tests here.
+        self.assertEqual(self.client.get("/health/db-pool/").status_code, 401)
@@ -11,9 +11,14 @@ from django.utils.encoding import force_bytes
 
 from django.contrib.auth import get_user_model
 
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 
+from .authentication import cached_user
 from .serializers import (
     RegisterSerializer,
     UserSerializer,
@@ -59,6 +64,29 @@ class LoginView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Build refreshed access tokens from the user row, not from the
+    refresh token's claims, so role/profession changes reach the
+    (stateless) access token on the next refresh.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.get(pk=refresh[api_settings.USER_ID_CLAIM])
+
+        data["access"] = str(
+            CustomTokenObtainPairSerializer.get_token(user).access_token
+        )
+        return data
+
+
+class RefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+
 # =========================================================
 # Profile (READ)
 # =========================================================
@@ -67,7 +95,7 @@ class UserProfileView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        return cached_user(self.request.user.pk)
 
 
 # =========================================================
@@ -79,7 +107,7 @@ class UserProfileUpdateView(generics.UpdateAPIView):
     parser_classes = [MultiPartParser, FormParser]
 
     def get_object(self):
-        return self.request.user
+        return User.objects.get(pk=self.request.user.pk)
 
 
 # =========================================================
@@ -0,0 +1,120 @@
+"""
+Benchmark: per-row distance loops vs the vectorized engine in reports.geo
+
+Compares the old haversine() loop from nearby_issues and the geodesic()
+loop from auto_assign_issue against reports.geo.distances_km, and checks
+haversine accuracy against geopy's WGS-84 geodesic.
+
+Usage (from backend/):
+    python benchmarks/bench_geo.py
+"""
+
+import os
+import sys
+import time
+from decimal import Decimal
+from math import radians, cos, sin, asin, sqrt
+
+import numpy as np
+from geopy.distance import geodesic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reports.geo import distances_km, distance_matrix_km  # noqa: E402
+
+
+SIZES = [1_000, 10_000, 100_000]
+ORIGIN = (Decimal("28.613900"), Decimal("77.209000"))
+
+
+# ---------------------------------------------------------
+# Previous per-row implementations
+# ---------------------------------------------------------
+def haversine(lat1, lon1, lat2, lon2):
+    R = 6371
+
+    lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
+
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+
+    a = (
+        sin(dlat / 2) ** 2
+        + cos(radians(lat1))
+        * cos(radians(lat2))
+        * sin(dlon / 2) ** 2
+    )
+
+    c = 2 * asin(min(1, sqrt(a)))
+
+    return R * c
+
+
+def haversine_loop(lats, lons):
+    return [haversine(*ORIGIN, lat, lon) for lat, lon in zip(lats, lons)]
+
+
+def geodesic_loop(lats, lons):
+    origin = (float(ORIGIN[0]), float(ORIGIN[1]))
+
+    return [
+        geodesic(origin, (float(lat), float(lon))).km
+        for lat, lon in zip(lats, lons)
+    ]
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+def random_points(n, rng):
+    # DecimalFields come back from the ORM as Decimal
+    lats = [Decimal(f"{v:.6f}") for v in rng.uniform(28.0, 29.2, n)]
+    lons = [Decimal(f"{v:.6f}") for v in rng.uniform(76.6, 77.8, n)]
+    return lats, lons
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = np.random.default_rng(42)
+
+    print(f"{'points':>8}  {'haversine loop':>15}  {'geodesic loop':>14}  {'vectorized':>11}  {'speedup':>8}")
+
+    for n in SIZES:
+        lats, lons = random_points(n, rng)
+
+        t_loop = timed(haversine_loop, lats, lons)
+        # geodesic is slow; time a sample and extrapolate for large n
+        sample = min(n, 10_000)
+        t_geo = timed(geodesic_loop, lats[:sample], lons[:sample]) * n / sample
+        t_vec = timed(distances_km, *ORIGIN, lats, lons)
+
+        print(
+            f"{n:>8}  {t_loop * 1000:>12.1f} ms  {t_geo * 1000:>11.1f} ms"
+            f"  {t_vec * 1000:>8.2f} ms  {t_loop / t_vec:>7.0f}x"
+        )
+
+    # N x M (issues x providers)
+    lats, lons = random_points(2_000, rng)
+    plats, plons = random_points(500, rng)
+    t_matrix = timed(distance_matrix_km, lats, lons, plats, plons)
+    print(f"\n2000 x 500 distance matrix: {t_matrix * 1000:.1f} ms")
+
+    # Accuracy against WGS-84 geodesic
+    lats, lons = random_points(2_000, rng)
+    vec = distances_km(*ORIGIN, lats, lons)
+    geo = np.array(geodesic_loop(lats, lons))
+    rel = np.abs(vec - geo) / np.maximum(geo, 1e-9)
+
+    print(
+        f"accuracy vs geodesic: max abs {np.max(np.abs(vec - geo)) * 1000:.1f} m, "
+        f"max rel {np.max(rel) * 100:.3f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark: requests/sec with and without database connection pooling
+
+Each mode runs in its own process and drives an authenticated, DB-backed
+endpoint (GET /api/v1/reports/heatmap/) through Django's full request
+cycle from concurrent threads for a fixed number of seconds:
+
+    direct  - CONN_MAX_AGE=0, a new connection for every request
+    pool    - psycopg_pool with DB_POOL_OPTIONS (see settings/base.py)
+
+Connection setup dominates when the database is remote or uses TLS, so
+run it against the real database host to see the production gap.
+
+Usage (from backend/):
+    python benchmarks/bench_pool.py [threads] [seconds]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_THREADS = 8
+DEFAULT_DURATION = 10.0
+
+URL = "/api/v1/reports/heatmap/?bbox=77.1,28.5,77.3,28.7"
+
+
+# ---------------------------------------------------------
+# Child process: one mode
+# ---------------------------------------------------------
+def run_mode(mode, threads, duration):
+    sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "civictrack.settings")
+
+    from django.conf import settings
+
+    # configure before the first connection is opened
+    for database in settings.DATABASES.values():
+        database["CONN_MAX_AGE"] = 0
+        options = database.setdefault("OPTIONS", {})
+        options.pop("pool", None)
+
+        if mode == "pool":
+            options["pool"] = {
+                **settings.DB_POOL_OPTIONS,
+                "max_size": max(settings.DB_POOL_OPTIONS["max_size"], threads),
+            }
+
+    import django
+
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.test import RequestFactory
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from civictrack.db_pool import pool_stats
+
+    user = get_user_model().objects.create_user(
+        username=f"bench-pool-{os.getpid()}",
+        password="bench-pool-pass",
+        role="consumer",
+    )
+    connection.close()
+
+    # a bare WSGI handler, unlike the test Client, releases connections
+    # on request_finished exactly as gunicorn does
+    handler = WSGIHandler()
+    path, query = URL.split("?")
+    environ = RequestFactory()._base_environ(
+        PATH_INFO=path,
+        QUERY_STRING=query,
+        HTTP_HOST="localhost",
+        HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}",
+    )
+
+    counts = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def start_response(status, headers):
+        assert status.startswith("200"), status
+
+    def worker(index):
+        while time.perf_counter() < deadline:
+            response = handler(dict(environ), start_response)
+            b"".join(response)
+            response.close()
+            counts[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+
+    start = time.perf_counter()
+
+    for thread in workers:
+        thread.start()
+
+    for thread in workers:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+
+    if not sum(counts):
+        raise SystemExit(f"{mode}: no successful requests")
+
+    stats = pool_stats().get("default", {})
+    user.delete()
+
+    print(json.dumps({
+        "requests": sum(counts),
+        "rps": sum(counts) / elapsed,
+        "wait_ms_avg": stats.get("wait_ms_avg"),
+        "exhausted": stats.get("exhausted"),
+    }))
+
+
+# ---------------------------------------------------------
+# Parent: run both modes and compare
+# ---------------------------------------------------------
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_THREADS
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DURATION
+
+    results = {}
+
+    for mode in ("direct", "pool"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, str(threads), str(duration)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{threads} threads x {duration:.0f} s against {URL}\n")
+    print(f"{'mode':<8}  {'requests':>9}  {'req/s':>8}  {'avg wait':>9}  {'exhausted':>9}")
+
+    for mode, r in results.items():
+        wait = "-" if r["wait_ms_avg"] is None else f"{r['wait_ms_avg']:.1f} ms"
+        exhausted = "-" if r["exhausted"] is None else r["exhausted"]
+
+        print(f"{mode:<8}  {r['requests']:>9}  {r['rps']:>8.1f}  {wait:>9}  {exhausted:>9}")
+
+    print(f"\nspeedup: {results['pool']['rps'] / results['direct']['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]))
+    else:
+        main()
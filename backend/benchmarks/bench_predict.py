@@ -0,0 +1,75 @@
+"""
+Benchmark: per-item vs batched category prediction
+
+Classifies N synthetic descriptions one call at a time (the old
+predict-category/ path) and in batches of up to ml.predict.MAX_BATCH_SIZE
+through predict_issue_categories (one vectorizer.transform + one
+predict_proba per batch), and reports descriptions per second.
+
+Usage (from backend/):
+    python benchmarks/bench_predict.py [items]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml.predict import (  # noqa: E402
+    MAX_BATCH_SIZE,
+    load_model,
+    predict_issue_categories,
+    predict_issue_category,
+)
+
+
+ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+BATCH_SIZES = [10, 100, MAX_BATCH_SIZE]
+
+WORDS = [
+    "pothole", "garbage", "streetlight", "water", "leak", "broken", "drain",
+    "sewage", "traffic", "signal", "tree", "fallen", "wire", "electric",
+    "road", "crack", "flood", "pipeline", "market", "sector",
+]
+
+
+def descriptions(count):
+    rng = random.Random(42)
+    return [" ".join(rng.choices(WORDS, k=12)) for _ in range(count)]
+
+
+def per_item(texts):
+    for text in texts:
+        predict_issue_category(text)
+
+
+def batched(texts, size):
+    for start in range(0, len(texts), size):
+        predict_issue_categories(texts[start:start + size])
+
+
+def rate(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return ITEMS / (time.perf_counter() - start)
+
+
+def main():
+    load_model()
+    texts = descriptions(ITEMS)
+
+    print(f"{ITEMS} descriptions\n")
+    print(f"{'mode':<12}  {'items/s':>10}  {'speedup':>8}")
+
+    base = rate(per_item, texts)
+    print(f"{'per item':<12}  {base:>10.0f}  {1:>7.1f}x")
+
+    for size in BATCH_SIZES:
+        r = rate(batched, texts, size)
+        print(f"{f'batch {size}':<12}  {r:>10.0f}  {r / base:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: icontains search vs ranked full-text search (?q=)
+
+Seeds N synthetic issues inside a transaction (rolled back at the end),
+then times the old admin-style icontains lookup against
+reports.querysets.search_issues for broad, selective and empty queries.
+
+Usage (from backend/, against a Postgres database):
+    python benchmarks/bench_search.py [rows]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "civictrack.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from reports.models import Issue  # noqa: E402
+from reports.querysets import search_issues  # noqa: E402
+
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+TOP = 20
+QUERIES = ["pothole", "pothole or flood", '"fallen tree"', "flood wire 4242", "nosuchword"]
+
+WORDS = [
+    "pothole", "garbage", "streetlight", "water", "leak", "broken", "drain",
+    "sewage", "traffic", "signal", "tree", "fallen", "noise", "smoke",
+    "road", "crack", "flood", "wire", "pole", "bin",
+]
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+def seed(rows, reporter):
+    # one INSERT ... SELECT; the generated search_vector fills itself
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO reports_issue (
+                title, description, category, status, priority,
+                latitude, longitude, grid_cell, likes_count,
+                is_anonymous, is_flagged, reported_by_id,
+                created_at, updated_at
+            )
+            SELECT
+                w[1 + (i * 7) %% 20] || ' ' || w[1 + (i * 13) %% 20] || ' ' || i,
+                'near ' || w[1 + (i * 3) %% 20] || ' street block ' || (i %% 997),
+                'road', 'pending', 'medium', 28.6, 77.2, 0, 0,
+                false, false, %s,
+                now() - i * interval '1 minute', now()
+            FROM generate_series(1, %s) AS i, (SELECT %s::text[] AS w) AS words
+            """,
+            [reporter.pk, rows, WORDS],
+        )
+        cursor.execute("ANALYZE reports_issue")
+
+
+def icontains(text):
+    return Issue.objects.filter(
+        Q(title__icontains=text) | Q(description__icontains=text)
+    ).order_by("-created_at")
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(fn(*args)[:TOP])
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    with transaction.atomic():
+        reporter = get_user_model().objects.create_user(
+            username="bench-search",
+            password="bench-search-pass",
+            role="consumer",
+        )
+
+        start = time.perf_counter()
+        seed(ROWS, reporter)
+        print(f"seeded {ROWS} issues in {time.perf_counter() - start:.1f} s\n")
+
+        print(f"{'query':<20}  {'icontains':>10}  {'full-text':>10}")
+
+        for text in QUERIES:
+            # icontains has no phrase/OR syntax; time the bare words
+            plain = text.replace('"', "").split(" or ")[0]
+
+            t_like = timed(icontains, plain, repeat=1)
+            t_fts = timed(search_issues, Issue.objects.all(), text)
+
+            print(f"{text:<20}  {t_like * 1000:>7.1f} ms  {t_fts * 1000:>7.1f} ms")
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
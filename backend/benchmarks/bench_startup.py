@@ -0,0 +1,73 @@
+"""
+Benchmark: process startup time with lazy vs eager ML model loading
+
+Times `manage.py check` (which imports every URLconf and view module,
+ml.predict included) in fresh processes, in two modes:
+
+    lazy   - current behaviour: the model loads on first prediction
+    eager  - the model is loaded during startup, as the old import-time
+             joblib.load did (and as gunicorn's warm-up hook still does)
+
+Usage (from backend/):
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_RUNS = 5
+
+EAGER = """
+import django
+django.setup()
+from ml.predict import load_model
+load_model()
+from django.core.management import call_command
+call_command("check")
+"""
+
+COMMANDS = {
+    "lazy": [sys.executable, "manage.py", "check"],
+    "eager": [sys.executable, "-c", EAGER],
+}
+
+
+def timed(command):
+    env = {"DJANGO_SETTINGS_MODULE": "civictrack.settings", **os.environ}
+
+    start = time.perf_counter()
+    subprocess.run(
+        command,
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS
+
+    # warm the OS page cache so the first mode isn't penalised
+    timed(COMMANDS["eager"])
+
+    print(f"manage.py check, median of {runs} runs\n")
+
+    results = {}
+
+    for mode, command in COMMANDS.items():
+        results[mode] = statistics.median(timed(command) for _ in range(runs))
+        print(f"{mode:<6}  {results[mode] * 1000:>8.0f} ms")
+
+    print(f"\nsaved per process start: {(results['eager'] - results['lazy']) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
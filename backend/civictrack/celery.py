@@ -0,0 +1,18 @@
+"""
+Celery application for civictrack.
+
+Workers are started with `celery -A civictrack worker` (see infra/docker);
+tasks are discovered from each app's tasks.py.
+"""
+
+import os
+
+from celery import Celery
+
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "civictrack.settings")
+
+app = Celery("civictrack")
+
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
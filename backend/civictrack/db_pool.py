@@ -0,0 +1,48 @@
+"""
+Connection pool metrics.
+
+psycopg_pool keeps cumulative counters per process. A request that finds
+no idle connection is "queued"; one that waits longer than the pool
+timeout fails and counts as an error, i.e. the pool was exhausted.
+"""
+
+from django.db import connections
+
+
+def pool_stats():
+    """
+    Return {alias: stats} for every pooled database in this process.
+    """
+
+    stats = {}
+
+    for alias in connections:
+
+        connection = connections[alias]
+
+        if not connection.settings_dict.get("OPTIONS", {}).get("pool"):
+            continue
+
+        raw = connection.pool.get_stats()
+
+        queued = raw.get("requests_queued", 0)
+
+        stats[alias] = {
+            "pool_min": raw.get("pool_min"),
+            "pool_max": raw.get("pool_max"),
+            "pool_size": raw.get("pool_size", 0),
+            "pool_available": raw.get("pool_available", 0),
+            "requests_waiting": raw.get("requests_waiting", 0),
+            "requests": raw.get("requests_num", 0),
+            "requests_queued": queued,
+            "wait_ms_total": raw.get("requests_wait_ms", 0),
+            "wait_ms_avg": (
+                round(raw.get("requests_wait_ms", 0) / queued, 1)
+                if queued else 0.0
+            ),
+            "exhausted": raw.get("requests_errors", 0),
+            "connections": raw.get("connections_num", 0),
+            "connection_ms_total": raw.get("connections_ms", 0),
+        }
+
+    return stats
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .routers import replica_aliases, replica_reads
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Send safe-method requests to the read replicas, except for clients
+    that wrote something in the last REPLICA_STICKY_SECONDS: those stay
+    pinned to the primary so they read their own updates despite
+    replication lag.
+
+    Clients are identified by the JWT user id (signature checked, no DB
+    hit) or, for the admin, the session cookie. Pins live in the shared
+    cache so every worker sees them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = bool(replica_aliases())
+        self.jwt = JWTAuthentication()
+
+    def __call__(self, request):
+
+        if not self.enabled:
+            return self.get_response(request)
+
+        client = self.client_key(request)
+        safe = request.method in SAFE_METHODS
+
+        use_replica = safe and not (client and cache.get(self.pin_key(client)))
+
+        with replica_reads(use_replica):
+            response = self.get_response(request)
+
+        if not safe and client and response.status_code < 400:
+            cache.set(
+                self.pin_key(client),
+                True,
+                settings.REPLICA_STICKY_SECONDS,
+            )
+
+        return response
+
+    def client_key(self, request):
+
+        header = self.jwt.get_header(request)
+
+        if header is not None:
+            raw_token = self.jwt.get_raw_token(header)
+
+            if raw_token is None:
+                return None
+
+            try:
+                token = self.jwt.get_validated_token(raw_token)
+                return f"user:{token[jwt_settings.USER_ID_CLAIM]}"
+            except (APIException, KeyError):
+                return None
+
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+
+        return f"session:{session_key}" if session_key else None
+
+    def pin_key(self, client):
+        return f"db-primary-pin:{client}"
@@ -0,0 +1,65 @@
+"""
+Primary / read-replica database routing.
+
+Writes always go to "default". Reads go to a random replica (any
+DATABASES alias starting with "replica") only inside replica_reads():
+ReplicaRoutingMiddleware enables it for safe-method requests, and
+exports wrap themselves in it. Everything else, and every read inside a
+transaction on the primary, stays on "default".
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith("replica")]
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Route reads in this block to a replica (or, with enabled=False,
+    force them to the primary).
+    """
+
+    token = _replica_reads.set(enabled)
+
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+
+    def __init__(self):
+        self.replicas = replica_aliases()
+
+    def db_for_read(self, model, **hints):
+
+        if not self.replicas or not _replica_reads.get():
+            return DEFAULT_DB_ALIAS
+
+        # read-your-writes inside a transaction
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -5,6 +5,8 @@ Base settings for civictrack
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 
@@ -40,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Local apps
     "accounts",
@@ -62,6 +65,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "civictrack.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -107,8 +111,16 @@ AUTH_PASSWORD_VALIDATORS = [
 # =====================================================
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # identity from the token claims, no per-request user query
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
+    # keyset pagination on (created_at, id); see reports/pagination.py
+    "DEFAULT_PAGINATION_CLASS": "reports.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
+    # per-user rates for the throttled endpoints
+    "DEFAULT_THROTTLE_RATES": {
+        "predict_batch": "30/min",
+    },
 }
 
 SIMPLE_JWT = {
@@ -151,6 +163,82 @@ REDIS_URL = os.getenv(
 )
 
 
+# =====================================================
+# Cache (shared across workers)
+# =====================================================
+TESTING = sys.argv[1:2] == ["test"]
+
+if TESTING or not os.getenv("REDIS_URL"):
+    # per-process cache: the test suite calls cache.clear(), which must
+    # never FLUSHDB the Redis that also holds the Celery broker queues
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+
+# =====================================================
+# Database Connection Pool (psycopg 3)
+# =====================================================
+# DB_POOL=1 gives every process its own psycopg_pool instead of one
+# persistent connection per thread. Default sizes depend on the
+# PROCESS_TYPE env var ("web" for gunicorn, "celery" for workers; see
+# infra/docker); DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE override.
+DB_POOL_ENABLED = os.getenv("DB_POOL", "0") == "1"
+
+PROCESS_TYPE = os.getenv("PROCESS_TYPE", "web")
+
+DB_POOL_SIZES = {
+    "web": (2, 8),
+    "celery": (1, 4),
+}
+
+DB_POOL_OPTIONS = {
+    "min_size": int(os.getenv(
+        "DB_POOL_MIN_SIZE",
+        DB_POOL_SIZES.get(PROCESS_TYPE, DB_POOL_SIZES["web"])[0],
+    )),
+    "max_size": int(os.getenv(
+        "DB_POOL_MAX_SIZE",
+        DB_POOL_SIZES.get(PROCESS_TYPE, DB_POOL_SIZES["web"])[1],
+    )),
+    # seconds a request may wait for a free connection before failing
+    "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+}
+
+
+# =====================================================
+# Read Replicas
+# =====================================================
+# Replicas are DATABASES aliases named "replica*", added by the
+# environment settings from DATABASE_REPLICA_URLS (comma-separated).
+DATABASE_ROUTERS = ["civictrack.routers.ReplicaRouter"]
+
+DATABASE_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+
+# after a write, the client reads from the primary for this long
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+
+# =====================================================
+# Issue Archival
+# =====================================================
+# resolved/rejected issues untouched for this long move to ArchivedIssue
+ISSUE_ARCHIVE_AFTER_DAYS = int(os.getenv("ISSUE_ARCHIVE_AFTER_DAYS", "180"))
+
+
 # =====================================================
 # Celery
 # =====================================================
@@ -163,6 +251,17 @@ CELERY_RESULT_SERIALIZER = "json"
 
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 
+CELERY_BEAT_SCHEDULE = {
+    "archive-closed-issues": {
+        "task": "reports.tasks.archive_closed_issues",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "categorize-pending-issues": {
+        "task": "reports.tasks.categorize_pending_issues",
+        "schedule": crontab(minute="*/10"),
+    },
+}
+
 # Required for Upstash TLS connection
 CELERY_BROKER_USE_SSL = {"ssl_cert_reqs": None}
 CELERY_REDIS_BACKEND_USE_SSL = {"ssl_cert_reqs": None}
\ No newline at end of file
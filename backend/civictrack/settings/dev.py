@@ -4,6 +4,7 @@ Development settings
 
 from .base import *
 from dotenv import load_dotenv
+import dj_database_url
 import os
 
 load_dotenv(BASE_DIR / ".env.development")
@@ -56,4 +57,16 @@ DATABASES = {
         "HOST": os.getenv("DB_HOST", "localhost"),
         "PORT": os.getenv("DB_PORT", "5432"),
     }
-}
\ No newline at end of file
+}
+
+for index, url in enumerate(DATABASE_REPLICA_URLS):
+    DATABASES[f"replica_{index}"] = {
+        **dj_database_url.parse(url),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# pooled connections replace persistent ones (Django forbids both)
+if DB_POOL_ENABLED:
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = dict(DB_POOL_OPTIONS)
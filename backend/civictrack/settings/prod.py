@@ -61,6 +61,18 @@ DATABASES = {
     )
 }
 
+for index, url in enumerate(DATABASE_REPLICA_URLS):
+    DATABASES[f"replica_{index}"] = {
+        **dj_database_url.parse(url, conn_max_age=600, ssl_require=True),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# pooled connections replace persistent ones (Django forbids both)
+if DB_POOL_ENABLED:
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = dict(DB_POOL_OPTIONS)
+
 
 # =====================================================
 # Security
@@ -0,0 +1,126 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .middleware import ReplicaRoutingMiddleware
+from .routers import ReplicaRouter, replica_reads
+
+
+REPLICAS = ["replica_0", "replica_1"]
+
+
+def make_router():
+
+    router = ReplicaRouter()
+    router.replicas = REPLICAS
+
+    return router
+
+
+# =========================================================
+# Replica router
+# =========================================================
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = make_router()
+
+    def test_reads_use_a_replica_only_inside_replica_reads(self):
+
+        self.assertEqual(self.router.db_for_read(None), DEFAULT_DB_ALIAS)
+
+        with replica_reads():
+            self.assertIn(self.router.db_for_read(None), REPLICAS)
+
+            with replica_reads(False):
+                self.assertEqual(self.router.db_for_read(None), DEFAULT_DB_ALIAS)
+
+            self.assertIn(self.router.db_for_read(None), REPLICAS)
+
+    def test_reads_inside_a_transaction_stay_on_the_primary(self):
+
+        with replica_reads(), mock.patch.object(
+            connections[DEFAULT_DB_ALIAS], "in_atomic_block", True,
+        ):
+            self.assertEqual(self.router.db_for_read(None), DEFAULT_DB_ALIAS)
+
+    def test_writes_and_migrations_go_to_the_primary(self):
+
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(None), DEFAULT_DB_ALIAS)
+
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "reports"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "reports"))
+
+    def test_without_replicas_everything_reads_the_primary(self):
+
+        self.router.replicas = []
+
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(None), DEFAULT_DB_ALIAS)
+
+
+# =========================================================
+# Sticky-after-write middleware
+# =========================================================
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+
+        cache.clear()
+
+        self.router = make_router()
+        self.factory = RequestFactory()
+        self.read_from = None
+
+        self.middleware = ReplicaRoutingMiddleware(self.respond)
+        self.middleware.enabled = True
+
+    def respond(self, request):
+
+        self.read_from = self.router.db_for_read(None)
+
+        return HttpResponse(status=request.status)
+
+    def request(self, method, user_id=None, status=200):
+
+        headers = {}
+
+        if user_id is not None:
+            token = AccessToken.for_user(get_user_model()(pk=user_id))
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+        request = getattr(self.factory, method)("/api/v1/reports/", **headers)
+        request.status = status
+
+        self.middleware(request)
+
+        return self.read_from
+
+    def test_safe_requests_read_from_a_replica(self):
+
+        self.assertIn(self.request("get", user_id=1), REPLICAS)
+        self.assertIn(self.request("head"), REPLICAS)
+
+    def test_a_write_pins_that_client_to_the_primary(self):
+
+        self.assertEqual(self.request("post", user_id=1), DEFAULT_DB_ALIAS)
+
+        self.assertEqual(self.request("get", user_id=1), DEFAULT_DB_ALIAS)
+        self.assertIn(self.request("get", user_id=2), REPLICAS)
+        self.assertIn(self.request("get"), REPLICAS)
+
+        cache.delete(self.middleware.pin_key("user:1"))
+
+        self.assertIn(self.request("get", user_id=1), REPLICAS)
+
+    def test_failed_writes_do_not_pin(self):
+
+        self.assertEqual(self.request("patch", user_id=1, status=400), DEFAULT_DB_ALIAS)
+
+        self.assertIn(self.request("get", user_id=1), REPLICAS)
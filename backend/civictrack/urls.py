@@ -3,11 +3,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView
-)
+from civictrack.db_pool import pool_stats
+from reports.services import queue_cache
+
+from accounts.views import LoginView, RefreshView
 
 
 # =========================================================
@@ -20,6 +23,28 @@ def health_check(request):
     })
 
 
+# =========================================================
+# Database Pool Metrics (per worker process)
+# =========================================================
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def db_pool_metrics(request):
+    return Response({
+        "process_type": settings.PROCESS_TYPE,
+        "pooling": settings.DB_POOL_ENABLED,
+        "databases": pool_stats(),
+    })
+
+
+# =========================================================
+# Provider Queue Cache Metrics
+# =========================================================
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def queue_cache_metrics(request):
+    return Response(queue_cache.stats())
+
+
 # =========================================================
 # API Root
 # =========================================================
@@ -39,6 +64,8 @@ urlpatterns = [
 
     # Health check
     path("health/", health_check, name="health"),
+    path("health/db-pool/", db_pool_metrics, name="health-db-pool"),
+    path("health/queue-cache/", queue_cache_metrics, name="health-queue-cache"),
 
     # API root
     path("api/v1/", api_root),
@@ -53,13 +80,13 @@ urlpatterns = [
     # JWT authentication
     path(
         "api/v1/token/",
-        TokenObtainPairView.as_view(),
+        LoginView.as_view(),
         name="token_obtain_pair"
     ),
 
     path(
         "api/v1/token/refresh/",
-        TokenRefreshView.as_view(),
+        RefreshView.as_view(),
         name="token_refresh"
     ),
 ]
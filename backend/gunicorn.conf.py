@@ -0,0 +1,26 @@
+"""
+Gunicorn settings and server hooks (see gunicorn.sh).
+
+GUNICORN_PRELOAD=1 imports the app in the master and loads the ML model
+there once, so forked workers share its pages copy-on-write; otherwise
+each worker loads it right after forking, before taking requests.
+"""
+
+import os
+
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "0") == "1"
+
+
+def when_ready(server):
+    if preload_app:
+        from ml.predict import warm_up
+
+        warm_up()
+
+
+def post_fork(server, worker):
+    # a no-op when the master already loaded the model
+    from ml.predict import warm_up
+
+    warm_up()
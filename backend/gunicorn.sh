@@ -9,6 +9,7 @@ python manage.py collectstatic --noinput
 
 echo "Starting Gunicorn..."
 exec gunicorn civictrack.wsgi:application \
+  --config gunicorn.conf.py \
   --bind 0.0.0.0:${PORT:-8000} \
   --workers 1 \
   --threads 2 \
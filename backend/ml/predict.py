@@ -1,16 +1,76 @@
+"""
+Issue category prediction.
+
+The model and vectorizer are unpickled on first use, not at import, so
+processes that never predict (migrate, Celery beat, the test runner)
+don't pay for importing scikit-learn. Web workers call warm_up() from
+Gunicorn's post_fork hook (see gunicorn.conf.py) to load them before the
+first request.
+"""
+
+import hashlib
 import os
-import joblib
-from django.conf import settings
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
+import threading
+
 
 # Paths to model files
-MODEL_PATH = os.path.join(settings.BASE_DIR, "ml", "issue_model.pkl")
-VEC_PATH = os.path.join(settings.BASE_DIR, "ml", "issue_vectorizer.pkl")
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODEL_PATH = os.path.join(ML_DIR, "issue_model.pkl")
+VEC_PATH = os.path.join(ML_DIR, "issue_vectorizer.pkl")
+
+# largest batch for in-process callers (predict-category/batch/ caps HTTP
+# requests lower); a 1000 x vocabulary sparse matrix and its
+# probabilities stay well under a few MB
+MAX_BATCH_SIZE = 1000
+
+_load_lock = threading.Lock()
+_loaded = None
+_version = None
+
+
+def load_model():
+    """
+    Return (model, vectorizer), loading them once per process. Threads
+    racing on the first call wait for a single load.
+    """
+
+    global _loaded, _version
+
+    if _loaded is None:
+        with _load_lock:
+            if _loaded is None:
+                import joblib
+
+                digest = hashlib.sha256()
+
+                for path in (MODEL_PATH, VEC_PATH):
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
 
-# Load model + vectorizer once
-model = joblib.load(MODEL_PATH)
-vectorizer = joblib.load(VEC_PATH)
+                _version = digest.hexdigest()[:16]
+                _loaded = (joblib.load(MODEL_PATH), joblib.load(VEC_PATH))
+
+    return _loaded
+
+
+def model_version():
+    """
+    Content hash of the deployed model + vectorizer files; changes
+    whenever a retrained model is shipped.
+    """
+
+    load_model()
+    return _version
+
+
+def warm_up():
+    """
+    Load the model and run one prediction, so the first request doesn't
+    pay for unpickling or scikit-learn's lazy imports.
+    """
+
+    predict_issue_category("warm up")
 
 
 def predict_issue_category(description: str) -> str:
@@ -18,19 +78,37 @@ def predict_issue_category(description: str) -> str:
     Predict issue category using trained ML model.
     Returns one of: road, garbage, water, electricity, other
     """
-    if not description:
-        return "other"
+    category, _ = predict_issue_categories([description])[0]
+    return category
+
+
+def predict_issue_categories(descriptions):
+    """
+    Predict a (category, confidence) pair for each description.
+
+    The whole batch goes through one sparse vectorizer.transform and one
+    model.predict_proba call; confidence is the winning class's
+    probability. Empty descriptions get ("other", None). Callers should
+    keep batches within MAX_BATCH_SIZE.
+    """
+
+    results = [("other", None)] * len(descriptions)
+
+    texts = [(i, text) for i, text in enumerate(descriptions) if text]
+
+    if not texts:
+        return results
+
+    model, vectorizer = load_model()
+
+    X = vectorizer.transform([text for _, text in texts])
+    proba = model.predict_proba(X)
 
-    X = vectorizer.transform([description])
-    prediction = model.predict(X)[0]
-    return prediction
+    best = proba.argmax(axis=1)
+    categories = model.classes_[best]
+    confidences = proba[range(len(texts)), best]
 
+    for (i, _), category, confidence in zip(texts, categories, confidences):
+        results[i] = (str(category), float(confidence))
 
-# ---------------------------------------------------------
-# API wrapper for Django REST Framework
-# ---------------------------------------------------------
-@api_view(["POST"])
-def predict_issue_category_api(request):
-    description = request.data.get("description", "")
-    category = predict_issue_category(description)
-    return Response({"category": category})
+    return results
@@ -0,0 +1,133 @@
+"""
+Memoized category predictions for predict-category/.
+
+The frontend classifies the description as the user types, so the same
+text is predicted over and over. Results are cached in two tiers:
+
+    local  - a per-process LRU of LOCAL_CACHE_SIZE entries
+    shared - the Django cache (Redis), expiring after PREDICTION_CACHE_TTL
+
+Keys hash the description as the vectorizer sees it (its analyzer's
+tokens, sorted: the bag-of-words model ignores case, punctuation, stop
+words and word order), so near-identical texts share an entry without
+ever changing the answer. Keys also carry ml.predict.model_version(),
+so deploying a retrained model starts a fresh keyspace and the old
+entries age out on their own.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.core.cache import cache
+
+from ml import predict
+
+
+LOCAL_CACHE_SIZE = 10_000
+PREDICTION_CACHE_TTL = 60 * 60 * 24
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded least-recently-used mapping.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local = LRUCache(LOCAL_CACHE_SIZE)
+
+
+def normalize(description):
+    """
+    Reduce a description to what the model sees: its sorted tokens.
+    """
+
+    _, vectorizer = predict.load_model()
+
+    return " ".join(sorted(_analyzer(vectorizer)(description)))
+
+
+@lru_cache(maxsize=1)
+def _analyzer(vectorizer):
+    return vectorizer.build_analyzer()
+
+
+def cache_key(description):
+
+    digest = hashlib.sha256(normalize(description).encode()).hexdigest()
+
+    return f"ml-predict:{predict.model_version()}:{digest}"
+
+
+def cached_categories(descriptions):
+    """
+    predict.predict_issue_categories() through the local and shared
+    caches; misses are predicted together in one batch.
+    """
+
+    results = [("other", None)] * len(descriptions)
+
+    keys = {i: cache_key(text) for i, text in enumerate(descriptions) if text}
+
+    missing = {}
+
+    for i, key in keys.items():
+        hit = _local.get(key)
+
+        if hit is None:
+            missing.setdefault(key, []).append(i)
+        else:
+            results[i] = hit
+
+    if missing:
+        found = cache.get_many(list(missing))
+
+        to_predict = [key for key in missing if key not in found]
+
+        if to_predict:
+            predicted = predict.predict_issue_categories(
+                [descriptions[missing[key][0]] for key in to_predict]
+            )
+            new = dict(zip(to_predict, predicted))
+
+            cache.set_many(new, PREDICTION_CACHE_TTL)
+            found.update(new)
+
+        for key, positions in missing.items():
+            _local.set(key, found[key])
+
+            for i in positions:
+                results[i] = found[key]
+
+    return results
+
+
+def cached_category(description):
+
+    category, _ = cached_categories([description])[0]
+    return category
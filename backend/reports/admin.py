@@ -1,7 +1,39 @@
 from django.contrib import admin
 from django.contrib import messages
+from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, Q
 
-from .models import Issue, IssuePhoto, FlagReport
+from .models import ArchivedIssue, BulkActionJob, Issue, IssuePhoto, FlagReport
+from .querysets import search_query
+from .services import bulk_actions
+
+
+# =========================================================
+# Bulk action helpers
+# =========================================================
+def run_bulk_action(request, action, queryset, done_message, **params):
+    """
+    Run a set-based bulk action and report the outcome. Large
+    selections are handed to a background job instead.
+    """
+
+    updated, job = bulk_actions.run_action(
+        action,
+        queryset,
+        user=request.user,
+        **params,
+    )
+
+    if job is not None:
+        messages.info(
+            request,
+            f"{job.total} rows queued as background job #{job.pk}; "
+            "follow its progress under Bulk action jobs."
+        )
+        return
+
+    messages.success(request, done_message.format(count=updated))
 
 
 # =========================================================
@@ -17,22 +49,68 @@ def assign_to_provider(modeladmin, request, queryset):
         )
         return
 
-    updated = 0
-    for issue in queryset:
-        if issue.assigned_provider is None:
-            issue.assigned_provider = user
-            issue.status = "assigned"
-            issue.save()
-            updated += 1
-
-    messages.success(
+    run_bulk_action(
         request,
-        f"{updated} issue(s) assigned to {user.username}."
+        "assign_issues",
+        queryset,
+        f"{{count}} issue(s) assigned to {user.username}.",
+        provider_id=user.pk,
     )
 
 assign_to_provider.short_description = "Assign selected issues to me (provider)"
 
 
+# =========================================================
+# Admin Actions: Priority / Status
+# =========================================================
+def make_set_priority_action(priority, label):
+
+    def set_priority(modeladmin, request, queryset):
+        run_bulk_action(
+            request,
+            "set_issue_priority",
+            queryset,
+            f"{{count}} issue(s) set to {label} priority.",
+            priority=priority,
+        )
+
+    set_priority.__name__ = f"set_priority_{priority}"
+    set_priority.short_description = f"Set priority: {label}"
+
+    return set_priority
+
+
+def make_set_status_action(status, label):
+
+    def set_status(modeladmin, request, queryset):
+        run_bulk_action(
+            request,
+            "set_issue_status",
+            queryset,
+            f"{{count}} issue(s) marked {label}.",
+            status=status,
+        )
+
+    set_status.__name__ = f"set_status_{status}"
+    set_status.short_description = f"Set status: {label}"
+
+    return set_status
+
+
+# =========================================================
+# Admin Action: Mark flags reviewed
+# =========================================================
+def mark_reviewed(modeladmin, request, queryset):
+    run_bulk_action(
+        request,
+        "mark_flags_reviewed",
+        queryset,
+        "{count} flag(s) marked as reviewed.",
+    )
+
+mark_reviewed.short_description = "Mark selected flags as reviewed"
+
+
 # =========================================================
 # Issue Admin
 # =========================================================
@@ -53,13 +131,46 @@ class IssueAdmin(admin.ModelAdmin):
         "priority",
         "assigned_provider",
     )
-    search_fields = (
-        "title",
-        "description",
-        "reported_by__username",
+    # title/description are matched through the GIN-indexed
+    # search_vector in get_search_results, not with icontains
+    search_fields = ("reported_by__username",)
+    search_help_text = (
+        "Full-text search on title and description, "
+        "or part of the reporter username."
     )
     ordering = ("-created_at",)
-    actions = [assign_to_provider]
+    actions = [
+        assign_to_provider,
+        *(
+            make_set_priority_action(value, label)
+            for value, label in Issue.PRIORITY_CHOICES
+        ),
+        *(
+            make_set_status_action(value, label)
+            for value, label in Issue.STATUS_CHOICES
+        ),
+    ]
+
+    def get_search_results(self, request, queryset, search_term):
+
+        search_term = search_term.strip()
+
+        if not search_term:
+            return queryset, False
+
+        query = search_query(search_term)
+
+        matches = queryset.filter(
+            Q(search_vector=query)
+            | Q(reported_by__username__icontains=search_term)
+        ).annotate(rank=SearchRank(F("search_vector"), query))
+
+        # best text matches first unless a column header was clicked;
+        # username-only matches rank 0
+        if ORDER_VAR not in request.GET:
+            matches = matches.order_by("-rank", "-created_at", "-pk")
+
+        return matches, False
 
 
 # =========================================================
@@ -90,3 +201,72 @@ class FlagReportAdmin(admin.ModelAdmin):
         "reported_by__username",
     )
     ordering = ("-created_at",)
+    actions = [mark_reviewed]
+
+
+# =========================================================
+# Archived Issue Admin (read-only)
+# =========================================================
+@admin.register(ArchivedIssue)
+class ArchivedIssueAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "title",
+        "status",
+        "reported_by",
+        "assigned_provider",
+        "created_at",
+        "archived_at",
+    )
+    list_filter = ("status", "category")
+    ordering = ("-created_at",)
+    list_select_related = ("reported_by", "assigned_provider")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+# =========================================================
+# Bulk Action Job Admin
+# =========================================================
+@admin.register(BulkActionJob)
+class BulkActionJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "action",
+        "status",
+        "progress_display",
+        "updated",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("action", "status")
+    ordering = ("-created_at",)
+    exclude = ("object_ids",)
+    readonly_fields = (
+        "action",
+        "params",
+        "total",
+        "processed",
+        "updated",
+        "status",
+        "error",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+
+    @admin.display(description="Progress")
+    def progress_display(self, obj):
+        return f"{obj.progress}% ({obj.processed}/{obj.total})"
+
+    def get_queryset(self, request):
+        # the stored id list can be large; the changelist never needs it
+        return super().get_queryset(request).defer("object_ids")
+
+    def has_add_permission(self, request):
+        return False
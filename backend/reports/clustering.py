@@ -0,0 +1,212 @@
+"""
+Server-side map clustering.
+
+Issues are bucketed into Web Mercator cells for every zoom level in
+CLUSTER_ZOOM_LEVELS. Each cell is a tile at zoom + CLUSTER_SUBDIVISION,
+i.e. a 4x4 grid inside every 256px map tile (~64px clusters on screen).
+Counts live in IssueClusterCell and are adjusted incrementally from the
+issues_changed signal, so reads never aggregate raw issue rows.
+"""
+
+from collections import defaultdict
+from math import asinh, floor, pi, radians, tan
+
+from django.db import transaction
+
+from .models import IssueClusterCell
+from .rollups import increment
+
+
+MAX_CLUSTER_ZOOM = 16
+CLUSTER_ZOOM_LEVELS = range(0, MAX_CLUSTER_ZOOM + 1)
+CLUSTER_SUBDIVISION = 2
+
+MAX_CLUSTER_CELLS = 10_000
+
+MAX_MERCATOR_LAT = 85.05112878
+
+CLUSTER_KEY_FIELDS = ("zoom", "cell_x", "cell_y", "status", "category")
+
+
+# =========================================================
+# Cell math
+# =========================================================
+def _cells_per_side(zoom):
+    return 2 ** (zoom + CLUSTER_SUBDIVISION)
+
+
+def cell_for(lat, lon, zoom):
+    """
+    Return the (x, y) cluster cell of a coordinate at a zoom level.
+    """
+
+    n = _cells_per_side(zoom)
+    lat = max(min(float(lat), MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+
+    x = int(floor((float(lon) + 180) / 360 * n))
+    y = int(floor((1 - asinh(tan(radians(lat))) / pi) / 2 * n))
+
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+# =========================================================
+# Incremental maintenance
+# =========================================================
+def _add_contribution(deltas, state, sign):
+
+    if not state or state["latitude"] is None or state["longitude"] is None:
+        return
+
+    lat = float(state["latitude"])
+    lon = float(state["longitude"])
+    category = state["category"] or ""
+
+    for zoom in CLUSTER_ZOOM_LEVELS:
+
+        x, y = cell_for(lat, lon, zoom)
+        delta = deltas[(zoom, x, y, state["status"], category)]
+
+        delta["count"] += sign
+        delta["lat_sum"] += sign * lat
+        delta["lon_sum"] += sign * lon
+
+
+def apply_changes(changes):
+    """
+    Adjust cluster counts for a batch of (before, after) issue states.
+    """
+
+    deltas = defaultdict(lambda: {"count": 0, "lat_sum": 0.0, "lon_sum": 0.0})
+
+    for before, after in changes:
+        _add_contribution(deltas, before, -1)
+        _add_contribution(deltas, after, +1)
+
+    # unchanged cells cancel out; float sums may leave tiny residue
+    deltas = {
+        key: values
+        for key, values in deltas.items()
+        if values["count"]
+        or abs(values["lat_sum"]) > 1e-9
+        or abs(values["lon_sum"]) > 1e-9
+    }
+
+    increment(IssueClusterCell, CLUSTER_KEY_FIELDS, deltas)
+
+
+def rebuild(issue_model=None, cell_model=IssueClusterCell):
+    """
+    Recompute every cluster cell from the issue table.
+    """
+
+    if issue_model is None:
+        from .models import Issue as issue_model
+
+    deltas = defaultdict(lambda: {"count": 0, "lat_sum": 0.0, "lon_sum": 0.0})
+
+    rows = issue_model.objects.filter(
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).values("latitude", "longitude", "status", "category")
+
+    for state in rows.iterator(chunk_size=2000):
+        _add_contribution(deltas, state, +1)
+
+    with transaction.atomic():
+
+        cell_model.objects.all().delete()
+
+        cell_model.objects.bulk_create(
+            (
+                cell_model(
+                    zoom=zoom,
+                    cell_x=x,
+                    cell_y=y,
+                    status=status,
+                    category=category,
+                    **values,
+                )
+                for (zoom, x, y, status, category), values in deltas.items()
+            ),
+            batch_size=2000,
+        )
+
+    return len(deltas)
+
+
+# =========================================================
+# Read path
+# =========================================================
+def clusters_in_bbox(west, south, east, north, zoom, statuses=None, categories=None):
+    """
+    Return clusters overlapping a bounding box at a zoom level, each
+    with its total count, centroid and per-status/category breakdown.
+    Raises ValueError when the box covers more than MAX_CLUSTER_CELLS.
+    """
+
+    zoom = max(min(int(zoom), MAX_CLUSTER_ZOOM), 0)
+
+    x_min, y_min = cell_for(north, west, zoom)
+    x_max, y_max = cell_for(south, east, zoom)
+
+    # a box crossing the antimeridian is split in two x ranges
+    x_ranges = (
+        [(x_min, x_max)]
+        if x_min <= x_max
+        else [(x_min, _cells_per_side(zoom) - 1), (0, x_max)]
+    )
+
+    n_cells = sum(hi - lo + 1 for lo, hi in x_ranges) * (y_max - y_min + 1)
+
+    if n_cells > MAX_CLUSTER_CELLS:
+        raise ValueError("Bounding box too large for this zoom level")
+
+    clusters = {}
+
+    for x_lo, x_hi in x_ranges:
+
+        cells = IssueClusterCell.objects.filter(
+            zoom=zoom,
+            cell_y__range=(y_min, y_max),
+            cell_x__range=(x_lo, x_hi),
+            count__gt=0,
+        )
+
+        if statuses:
+            cells = cells.filter(status__in=statuses)
+
+        if categories:
+            cells = cells.filter(category__in=categories)
+
+        for cell in cells.values_list(
+            "cell_x", "cell_y", "status", "category",
+            "count", "lat_sum", "lon_sum",
+        ):
+
+            x, y, status, category, count, lat_sum, lon_sum = cell
+
+            cluster = clusters.setdefault((x, y), {
+                "count": 0,
+                "lat_sum": 0.0,
+                "lon_sum": 0.0,
+                "by_status": defaultdict(int),
+                "by_category": defaultdict(int),
+            })
+
+            cluster["count"] += count
+            cluster["lat_sum"] += lat_sum
+            cluster["lon_sum"] += lon_sum
+            cluster["by_status"][status] += count
+            cluster["by_category"][category or "uncategorized"] += count
+
+    return [
+        {
+            "cell": f"{zoom}/{x}/{y}",
+            "count": cluster["count"],
+            "latitude": round(cluster["lat_sum"] / cluster["count"], 6),
+            "longitude": round(cluster["lon_sum"] / cluster["count"], 6),
+            "by_status": dict(cluster["by_status"]),
+            "by_category": dict(cluster["by_category"]),
+        }
+        for (x, y), cluster in clusters.items()
+    ]
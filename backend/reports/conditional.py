@@ -0,0 +1,103 @@
+"""
+Conditional GET (ETag / Last-Modified) for issue endpoints.
+
+Validators come from a cheap aggregate over the rows a response would
+render: their count and newest updated_at. Saves and set-based updates
+all move updated_at, and a row entering the set is either new or was
+just updated, so an unchanged aggregate means an unchanged response.
+Likes don't touch updated_at (they must not reset the archive clock),
+so the issue detail, whose serializer shows likes_count, adds it to its
+ETag. A matching If-None-Match or If-Modified-Since is answered with
+304 before the page is queried or serialized.
+"""
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def _validators(newest, version):
+
+    stamp = int(newest.timestamp() * 1_000_000) if newest else 0
+
+    # Last-Modified has whole-second precision; the ETag is exact
+    return f'"{stamp:x}-{version}"', int(newest.timestamp()) if newest else None
+
+
+def collection_validators(*querysets):
+    """
+    Return (etag, last_modified) for the rows of all querysets taken
+    together, one aggregate query each.
+    """
+
+    count, newest = 0, None
+
+    for queryset in querysets:
+
+        stats = queryset.order_by().aggregate(
+            count=Count("pk"),
+            newest=Max("updated_at"),
+        )
+
+        count += stats["count"]
+
+        if stats["newest"] and (newest is None or stats["newest"] > newest):
+            newest = stats["newest"]
+
+    return _validators(newest, count)
+
+
+def detail_validators(pk, *querysets):
+    """
+    Return (etag, last_modified) for one issue, from the first queryset
+    holding it, or None when it can't be found.
+    """
+
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+
+    for queryset in querysets:
+
+        row = (
+            queryset.filter(pk=pk)
+            .values_list("updated_at", "likes_count")
+            .first()
+        )
+
+        if row is not None:
+            return _validators(*row)
+
+    return None
+
+
+def conditional_response(request, validators, build):
+    """
+    Answer 304 (or 412) when the request's preconditions match
+    validators, otherwise return build(). Either way the response
+    carries the ETag and Last-Modified headers.
+    """
+
+    if validators is None:
+        return build()
+
+    etag, last_modified = validators
+
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified,
+    )
+
+    if response is None:
+        response = build()
+
+    if response.status_code in (200, 304):
+
+        response.headers["ETag"] = etag
+
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+
+    return response
@@ -0,0 +1,301 @@
+from math import cos, pi, radians
+
+import numpy as np
+from django.db.models import Q
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+# =========================================================
+# Fixed Grid Spatial Index
+# =========================================================
+# The globe is split into square cells of GRID_CELL_DEG degrees.
+# Each cell gets a single integer id (row * GRID_COLS + col), so a
+# row of neighbouring cells is always one contiguous id range and a
+# radius search becomes a handful of indexed BETWEEN lookups.
+
+KM_PER_DEGREE_LAT = EARTH_RADIUS_KM * pi / 180
+
+GRID_CELL_DEG = 0.05  # ~5.5 km north-south
+
+GRID_ROWS = int(round(180 / GRID_CELL_DEG))
+GRID_COLS = int(round(360 / GRID_CELL_DEG))
+
+
+def _longitude_span(lat, radius_km):
+    """
+    Return (min_lat, max_lat, dlon) for a circle, where dlon is None when
+    the circle spans every longitude (very large radius or near a pole).
+    """
+
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat = max(lat - dlat, -90.0)
+    max_lat = min(lat + dlat, 90.0)
+
+    # Longitude degrees are narrowest nearest the pole, so use the
+    # extreme latitude of the box for a conservative width.
+    cos_lat = cos(radians(max(abs(min_lat), abs(max_lat))))
+
+    if cos_lat < 1e-6 or radius_km / (KM_PER_DEGREE_LAT * cos_lat) >= 180:
+        return min_lat, max_lat, None
+
+    return min_lat, max_lat, radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+
+
+def _grid_row(lat):
+    return min(max(int((lat + 90) // GRID_CELL_DEG), 0), GRID_ROWS - 1)
+
+
+def _grid_col(lon):
+    return int(((lon + 180) % 360) // GRID_CELL_DEG) % GRID_COLS
+
+
+def grid_cell(lat, lon):
+    """
+    Return the grid cell id for a coordinate, or None when the
+    coordinate is incomplete.
+    """
+
+    if lat is None or lon is None:
+        return None
+
+    lat, lon = float(lat), float(lon)
+
+    return _grid_row(lat) * GRID_COLS + _grid_col(lon)
+
+
+def grid_cell_ranges(lat, lon, radius_km):
+    """
+    Return inclusive (low, high) cell id ranges covering every cell
+    that overlaps a circle of radius_km around (lat, lon).
+    """
+
+    lat, lon = float(lat), float(lon)
+
+    min_lat, max_lat, dlon = _longitude_span(lat, radius_km)
+    full_width = dlon is None
+
+    if not full_width:
+        col_lo = _grid_col(lon - dlon)
+        col_hi = _grid_col(lon + dlon)
+
+    ranges = []
+
+    for row in range(_grid_row(min_lat), _grid_row(max_lat) + 1):
+
+        base = row * GRID_COLS
+
+        if full_width:
+            # consecutive full rows collapse into one range
+            if ranges and ranges[-1][1] == base - 1:
+                ranges[-1] = (ranges[-1][0], base + GRID_COLS - 1)
+            else:
+                ranges.append((base, base + GRID_COLS - 1))
+
+        elif col_lo <= col_hi:
+            ranges.append((base + col_lo, base + col_hi))
+
+        else:
+            # circle crosses the antimeridian
+            ranges.append((base + col_lo, base + GRID_COLS - 1))
+            ranges.append((base, base + col_hi))
+
+    return ranges
+
+
+def grid_cells_covering(lat, lon, radius_km):
+    """
+    Return the list of cell ids overlapping the bounding box of a circle.
+    """
+
+    return [
+        cell
+        for low, high in grid_cell_ranges(lat, lon, radius_km)
+        for cell in range(low, high + 1)
+    ]
+
+
+def grid_cell_center(cell):
+    """
+    Return the (lat, lon) center of a grid cell.
+    """
+
+    row, col = divmod(cell, GRID_COLS)
+
+    return (
+        (row + 0.5) * GRID_CELL_DEG - 90,
+        (col + 0.5) * GRID_CELL_DEG - 180,
+    )
+
+
+def grid_cell_ranges_for_bbox(west, south, east, north):
+    """
+    Return inclusive (low, high) cell id ranges covering a bounding box.
+    A box with west > east is taken to cross the antimeridian.
+    """
+
+    west, east = float(west), float(east)
+
+    if east - west >= 360:
+        col_lo, col_hi = 0, GRID_COLS - 1
+    else:
+        # an east edge of exactly 180 must not wrap to column 0
+        col_lo, col_hi = _grid_col(west), _grid_col(east - 1e-9)
+
+    ranges = []
+
+    for row in range(_grid_row(float(south)), _grid_row(float(north)) + 1):
+
+        base = row * GRID_COLS
+
+        if col_lo <= col_hi:
+            ranges.append((base + col_lo, base + col_hi))
+        else:
+            ranges.append((base + col_lo, base + GRID_COLS - 1))
+            ranges.append((base, base + col_hi))
+
+    return ranges
+
+
+def grid_cell_filter(lat, lon, radius_km, field="grid_cell"):
+    """
+    Build a Q object selecting rows whose grid cell overlaps the
+    search circle.
+    """
+
+    query = Q()
+
+    for low, high in grid_cell_ranges(lat, lon, radius_km):
+        query |= Q(**{f"{field}__range": (low, high)})
+
+    return query
+
+
+# =========================================================
+# Bounding Box Prefilter
+# =========================================================
+def bounding_box_filter(lat, lon, radius_km):
+    """
+    Build a Q object selecting rows whose latitude/longitude fall inside
+    the bounding box of the search circle. Served by the composite
+    (status, category, latitude, longitude) index on Issue.
+    """
+
+    lat, lon = float(lat), float(lon)
+
+    min_lat, max_lat, dlon = _longitude_span(lat, radius_km)
+
+    # pad outwards so rounding to the column's 6 decimals never clips
+    pad = 1e-6
+
+    query = Q(latitude__range=(min_lat - pad, max_lat + pad))
+
+    if dlon is None:
+        return query & Q(longitude__isnull=False)
+
+    min_lon, max_lon = lon - dlon - pad, lon + dlon + pad
+
+    if min_lon < -180:
+        return query & (
+            Q(longitude__gte=min_lon + 360) | Q(longitude__lte=max_lon)
+        )
+
+    if max_lon > 180:
+        return query & (
+            Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon - 360)
+        )
+
+    return query & Q(longitude__range=(min_lon, max_lon))
+
+
+def radius_candidates(queryset, lat, lon, radius_km):
+    """
+    Narrow queryset in SQL to the rows that may lie within radius_km of
+    (lat, lon): a superset of within_radius(), by grid cell and
+    bounding box.
+    """
+
+    return queryset.filter(
+        grid_cell_filter(lat, lon, radius_km),
+        bounding_box_filter(lat, lon, radius_km),
+    )
+
+
+def within_radius(queryset, lat, lon, radius_km):
+    """
+    Return the rows of queryset within radius_km of (lat, lon), nearest
+    first, with `_distance` set on each instance.
+
+    The grid cell and bounding box filters run in SQL; exact distances
+    are only computed for the rows that survive them.
+    """
+
+    candidates = list(radius_candidates(queryset, lat, lon, radius_km))
+
+    if not candidates:
+        return []
+
+    distances = distances_km(
+        lat,
+        lon,
+        [row.latitude for row in candidates],
+        [row.longitude for row in candidates],
+    )
+
+    results = []
+
+    for row, dist in zip(candidates, distances.tolist()):
+
+        if dist <= radius_km:
+            row._distance = dist
+            results.append(row)
+
+    results.sort(key=lambda row: row._distance)
+
+    return results
+
+
+# =========================================================
+# Vectorized Great-Circle Distances
+# =========================================================
+def _as_radians(values):
+    return np.radians(np.asarray(values, dtype=np.float64))
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    # inputs in radians, any broadcastable shapes
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distances_km(lat, lon, lats, lons):
+    """
+    Haversine distance (km) from one point to N points.
+    Accepts floats, Decimals or strings; returns an array of shape (N,).
+    """
+
+    return _haversine(
+        _as_radians(lat),
+        _as_radians(lon),
+        _as_radians(lats),
+        _as_radians(lons),
+    )
+
+
+def distance_matrix_km(lats1, lons1, lats2, lons2):
+    """
+    Haversine distances (km) between N points and M points.
+    Returns an array of shape (N, M).
+    """
+
+    return _haversine(
+        _as_radians(lats1)[:, np.newaxis],
+        _as_radians(lons1)[:, np.newaxis],
+        _as_radians(lats2)[np.newaxis, :],
+        _as_radians(lons2)[np.newaxis, :],
+    )
@@ -0,0 +1,141 @@
+"""
+Open-issue density heatmap.
+
+IssueHeatCell keeps one counter per (grid cell, category) of issues in
+Issue.OPEN_STATUSES. Counters are adjusted from the issues_changed
+signal, so reading a bounding box never touches raw issue rows.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+from .geo import GRID_CELL_DEG, grid_cell, grid_cell_center, grid_cell_ranges_for_bbox
+from .models import Issue, IssueHeatCell
+from .rollups import increment
+
+
+MAX_HEATMAP_CELLS = 20_000
+
+HEAT_KEY_FIELDS = ("grid_cell", "category")
+
+
+# =========================================================
+# Incremental maintenance
+# =========================================================
+def _heat_key(state):
+
+    if not state or state["status"] not in Issue.OPEN_STATUSES:
+        return None
+
+    cell = grid_cell(state["latitude"], state["longitude"])
+
+    if cell is None:
+        return None
+
+    return cell, state["category"] or ""
+
+
+def apply_changes(changes):
+    """
+    Adjust heatmap counters for a batch of (before, after) issue states.
+    """
+
+    deltas = defaultdict(lambda: {"open_count": 0})
+
+    for before, after in changes:
+
+        old_key, new_key = _heat_key(before), _heat_key(after)
+
+        if old_key == new_key:
+            continue
+
+        if old_key is not None:
+            deltas[old_key]["open_count"] -= 1
+
+        if new_key is not None:
+            deltas[new_key]["open_count"] += 1
+
+    increment(IssueHeatCell, HEAT_KEY_FIELDS, deltas)
+
+
+def rebuild(issue_model=None, cell_model=IssueHeatCell):
+    """
+    Recompute every heatmap counter from the issue table.
+    """
+
+    if issue_model is None:
+        issue_model = Issue
+
+    counts = defaultdict(int)
+
+    rows = issue_model.objects.filter(
+        status__in=Issue.OPEN_STATUSES,
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).values("latitude", "longitude", "status", "category")
+
+    for state in rows.iterator(chunk_size=2000):
+        counts[_heat_key(state)] += 1
+
+    with transaction.atomic():
+
+        cell_model.objects.all().delete()
+
+        cell_model.objects.bulk_create(
+            (
+                cell_model(grid_cell=cell, category=category, open_count=count)
+                for (cell, category), count in counts.items()
+            ),
+            batch_size=2000,
+        )
+
+    return len(counts)
+
+
+# =========================================================
+# Read path
+# =========================================================
+def heatmap_in_bbox(west, south, east, north, categories=None):
+    """
+    Return non-empty heatmap cells inside a bounding box, each with its
+    center, total open count and per-category counts.
+    Raises ValueError when the box covers more than MAX_HEATMAP_CELLS.
+    """
+
+    ranges = grid_cell_ranges_for_bbox(west, south, east, north)
+
+    if sum(high - low + 1 for low, high in ranges) > MAX_HEATMAP_CELLS:
+        raise ValueError("Bounding box too large for the heatmap grid")
+
+    in_box = Q()
+    for low, high in ranges:
+        in_box |= Q(grid_cell__range=(low, high))
+
+    cells = IssueHeatCell.objects.filter(in_box, open_count__gt=0)
+
+    if categories:
+        cells = cells.filter(category__in=categories)
+
+    grid = {}
+
+    for cell, category, count in cells.values_list(
+        "grid_cell", "category", "open_count"
+    ):
+        entry = grid.setdefault(cell, {"total": 0, "by_category": {}})
+        entry["total"] += count
+        entry["by_category"][category or "uncategorized"] = count
+
+    cells = []
+
+    for cell, entry in grid.items():
+        lat, lon = grid_cell_center(cell)
+        cells.append({
+            "cell": cell,
+            "latitude": round(lat, 6),
+            "longitude": round(lon, 6),
+            **entry,
+        })
+
+    return {"cell_size_deg": GRID_CELL_DEG, "cells": cells}
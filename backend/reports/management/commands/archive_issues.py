@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reports.services.archival import (
+    ARCHIVE_BATCH_SIZE,
+    archivable_issues,
+    archive_closed_issues,
+)
+
+
+class Command(BaseCommand):
+    help = "Move resolved/rejected issues closed for more than N days to the archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ISSUE_ARCHIVE_AFTER_DAYS,
+        )
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--limit", type=int, default=None)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the issues that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"]
+
+        if options["dry_run"]:
+            count = archivable_issues(days).count()
+            self.stdout.write(f"{count} issues closed for more than {days} days")
+            return
+
+        archived = archive_closed_issues(
+            days=days,
+            batch_size=options["batch_size"],
+            limit=options["limit"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Archived {archived} issues closed for more than {days} days"))
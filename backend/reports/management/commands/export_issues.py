@@ -1,11 +1,17 @@
 import csv
 from django.core.management.base import BaseCommand
+from civictrack.routers import replica_reads
 from reports.models import Issue  # adjust if your model path differs
 
 class Command(BaseCommand):
     help = "Export all issues to CSV for machine learning or analysis."
 
     def handle(self, *args, **kwargs):
+        # a full-table read; keep it off the primary when replicas exist
+        with replica_reads():
+            self.export()
+
+    def export(self):
         filename = "issues_dataset.csv"
 
         # Define CSV fields (you can add more like priority, location, etc.)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reports import clustering
+
+
+class Command(BaseCommand):
+    help = "Recompute map cluster aggregates from the issue table."
+
+    def handle(self, *args, **kwargs):
+        cells = clustering.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt {cells} cluster cells"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reports import heatmap
+
+
+class Command(BaseCommand):
+    help = "Recompute the open issue heatmap rollup from the issue table."
+
+    def handle(self, *args, **kwargs):
+        cells = heatmap.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt {cells} heatmap cells"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from reports.models import ProviderCoverageCell
+from reports.services import provider_coverage
+
+
+class Command(BaseCommand):
+    help = "Recompute the provider coverage index from provider locations."
+
+    def handle(self, *args, **kwargs):
+        provider_coverage.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rebuilt {ProviderCoverageCell.objects.count()} coverage cells"
+        ))
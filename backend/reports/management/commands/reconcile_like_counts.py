@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from reports.services.likes import reconcile_like_counts
+
+
+class Command(BaseCommand):
+    help = "Repair Issue.likes_count from the likes through table."
+
+    def handle(self, *args, **kwargs):
+        fixed = reconcile_like_counts()
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Reconciled likes_count on {fixed} issues"))
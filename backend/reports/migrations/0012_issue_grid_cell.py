@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def populate_grid_cells(apps, schema_editor):
+    from reports.geo import grid_cell
+
+    Issue = apps.get_model("reports", "Issue")
+
+    issues = Issue.objects.filter(
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).only("id", "latitude", "longitude")
+
+    batch = []
+
+    for issue in issues.iterator(chunk_size=2000):
+        issue.grid_cell = grid_cell(issue.latitude, issue.longitude)
+        batch.append(issue)
+
+        if len(batch) >= 2000:
+            Issue.objects.bulk_update(batch, ["grid_cell"])
+            batch = []
+
+    if batch:
+        Issue.objects.bulk_update(batch, ["grid_cell"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0011_alter_issue_assigned_provider_alter_issue_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='grid_cell',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, help_text='Spatial grid cell id, derived from latitude/longitude', null=True),
+        ),
+        migrations.RunPython(populate_grid_cells, migrations.RunPython.noop),
+    ]
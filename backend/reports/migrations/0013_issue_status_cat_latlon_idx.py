@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0012_issue_grid_cell'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['status', 'category', 'latitude', 'longitude'], name='issue_status_cat_latlon_idx'),
+        ),
+    ]
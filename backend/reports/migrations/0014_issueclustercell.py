@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+def build_clusters(apps, schema_editor):
+    from reports.clustering import rebuild
+
+    rebuild(
+        apps.get_model("reports", "Issue"),
+        apps.get_model("reports", "IssueClusterCell"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0013_issue_status_cat_latlon_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueClusterCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zoom', models.PositiveSmallIntegerField()),
+                ('cell_x', models.IntegerField()),
+                ('cell_y', models.IntegerField()),
+                ('status', models.CharField(max_length=20)),
+                ('category', models.CharField(blank=True, default='', max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('lat_sum', models.FloatField(default=0)),
+                ('lon_sum', models.FloatField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('zoom', 'cell_x', 'cell_y', 'status', 'category'), name='unique_issue_cluster_cell')],
+            },
+        ),
+        migrations.RunPython(build_clusters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_coverage(apps, schema_editor):
+    from reports.services.provider_coverage import rebuild
+
+    rebuild(
+        apps.get_model("accounts", "CustomUser"),
+        apps.get_model("reports", "ProviderCoverageCell"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0014_issueclustercell'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderCoverageCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grid_cell', models.PositiveIntegerField()),
+                ('profession', models.CharField(max_length=50)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coverage_cells', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('profession', 'grid_cell', 'provider'), name='unique_provider_coverage_cell')],
+            },
+        ),
+        migrations.RunPython(build_coverage, migrations.RunPython.noop),
+    ]
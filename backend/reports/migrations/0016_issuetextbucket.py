@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def index_issue_text(apps, schema_editor):
+    from reports.services.duplicate_detection import (
+        issue_text,
+        lsh_buckets,
+        shingles,
+    )
+
+    Issue = apps.get_model("reports", "Issue")
+    IssueTextBucket = apps.get_model("reports", "IssueTextBucket")
+
+    batch = []
+
+    for issue in Issue.objects.only("id", "title", "description").iterator(chunk_size=2000):
+        buckets = lsh_buckets(shingles(issue_text(issue.title, issue.description)))
+        batch.extend(
+            IssueTextBucket(issue_id=issue.id, bucket=bucket)
+            for bucket in set(buckets)
+        )
+
+        if len(batch) >= 5000:
+            IssueTextBucket.objects.bulk_create(batch)
+            batch = []
+
+    IssueTextBucket.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0015_providercoveragecell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueTextBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='text_buckets', to='reports.issue')),
+            ],
+        ),
+        migrations.RunPython(index_issue_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:58
+
+from django.db import migrations, models
+
+
+def build_heatmap(apps, schema_editor):
+    from reports.heatmap import rebuild
+
+    rebuild(
+        apps.get_model("reports", "Issue"),
+        apps.get_model("reports", "IssueHeatCell"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0016_issuetextbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueHeatCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grid_cell', models.PositiveIntegerField()),
+                ('category', models.CharField(blank=True, default='', max_length=50)),
+                ('open_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('grid_cell', 'category'), name='unique_issue_heat_cell')],
+            },
+        ),
+        migrations.RunPython(build_heatmap, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_likes_count(apps, schema_editor):
+    Issue = apps.get_model("reports", "Issue")
+    IssueLike = Issue.likes.through
+
+    actual = (
+        IssueLike.objects.filter(issue_id=OuterRef("pk"))
+        .order_by()
+        .values("issue_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+
+    Issue.objects.update(likes_count=Coalesce(Subquery(actual), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0018_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_likes_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0021_issue_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIssue',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('category', models.CharField(blank=True, max_length=50, null=True)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('latitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitude', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('grid_cell', models.PositiveIntegerField(blank=True, null=True)),
+                ('photo', models.ImageField(blank=True, null=True, upload_to='issue_photos/')),
+                ('priority', models.CharField(max_length=10)),
+                ('status', models.CharField(max_length=20)),
+                ('is_anonymous', models.BooleanField(default=False)),
+                ('feedback', models.TextField(blank=True, null=True)),
+                ('is_flagged', models.BooleanField(default=False)),
+                ('flag_reason', models.TextField(blank=True, null=True)),
+                ('likes_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('photos', models.JSONField(blank=True, default=list)),
+                ('liked_by', models.JSONField(blank=True, default=list)),
+                ('flags', models.JSONField(blank=True, default=list)),
+                ('assigned_provider', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_assigned_issues', to=settings.AUTH_USER_MODEL)),
+                ('reported_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reported_issues', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['reported_by', '-created_at', '-id'], name='archived_reporter_created_idx'), models.Index(fields=['assigned_provider', '-created_at', '-id'], name='archived_provider_created_idx')],
+            },
+        ),
+    ]
@@ -1,9 +1,28 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
+from .geo import grid_cell
+
 User = get_user_model()
 
+# text search configuration for Issue.search_vector and ?q= queries
+SEARCH_CONFIG = "english"
+
+
+def issue_search_vector():
+    """
+    Title (weight A) + description (weight B): the expression stored in
+    Issue.search_vector and computed on the fly for archived issues.
+    """
+
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+    )
+
 
 # =========================================================
 # ISSUE MODEL
@@ -31,6 +50,8 @@ class Issue(models.Model):
         ("rejected", "Rejected"),
     ]
 
+    OPEN_STATUSES = ("pending", "under_review", "assigned", "in_progress")
+
     PRIORITY_CHOICES = [
         ("low", "Low"),
         ("medium", "Medium"),
@@ -58,6 +79,13 @@ class Issue(models.Model):
     longitude = models.DecimalField(
         max_digits=9, decimal_places=6, blank=True, null=True
     )
+    grid_cell = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        db_index=True,
+        editable=False,
+        help_text="Spatial grid cell id, derived from latitude/longitude",
+    )
 
     # ---------------- Media ----------------
     photo = models.ImageField(
@@ -108,6 +136,17 @@ class Issue(models.Model):
         related_name="liked_issues",
         blank=True,
     )
+    # denormalized; maintained by reports.services.likes.toggle_like
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # ---------------- Full-text search ----------------
+    # stored generated column, so Postgres keeps it current on every
+    # write path (save, queryset.update, bulk_create, raw SQL)
+    search_vector = models.GeneratedField(
+        expression=issue_search_vector(),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     # ---------------- Timestamps ----------------
     created_at = models.DateTimeField(auto_now_add=True)
@@ -118,15 +157,53 @@ class Issue(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # radius queries: equality on status/category, range on lat/lon
+            models.Index(
+                fields=["status", "category", "latitude", "longitude"],
+                name="issue_status_cat_latlon_idx",
+            ),
+            # keyset pagination (reports.pagination) per list endpoint
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="issue_created_id_idx",
+            ),
+            models.Index(
+                fields=["reported_by", "-created_at", "-id"],
+                name="issue_reporter_created_idx",
+            ),
+            models.Index(
+                fields=["assigned_provider", "-created_at", "-id"],
+                name="issue_provider_created_idx",
+            ),
+            models.Index(
+                fields=["category", "status", "-created_at", "-id"],
+                name="issue_queue_created_idx",
+            ),
+            # ?q= full-text search (reports.querysets.search_issues)
+            GinIndex(
+                fields=["search_vector"],
+                name="issue_search_vector_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.status})"
 
-    # ---------------- Computed ----------------
-    @property
-    def likes_count(self):
-        return self.likes.count()
+    def save(self, *args, **kwargs):
+
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
+
+        update_fields = kwargs.get("update_fields")
+
+        if update_fields is not None and (
+            {"latitude", "longitude"} & set(update_fields)
+        ):
+            kwargs["update_fields"] = {*update_fields, "grid_cell"}
+
+        super().save(*args, **kwargs)
 
+    # ---------------- Computed ----------------
     @property
     def reporter_name(self):
         return "Anonymous" if self.is_anonymous else self.reported_by.username
@@ -157,6 +234,28 @@ class IssuePhoto(models.Model):
         return f"Photo for Issue {self.issue_id}"
 
 
+# =========================================================
+# ISSUE TEXT LSH BUCKETS
+# =========================================================
+class IssueTextBucket(models.Model):
+    """
+    MinHash LSH band buckets of an issue's title + description, used to
+    find near-duplicate submissions without scanning the issue table.
+    Maintained by reports.services.duplicate_detection.
+    """
+
+    issue = models.ForeignKey(
+        Issue,
+        on_delete=models.CASCADE,
+        related_name="text_buckets",
+    )
+
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"Bucket({self.bucket}) for Issue {self.issue_id}"
+
+
 # =========================================================
 # FLAG REPORT MODEL
 # =========================================================
@@ -193,6 +292,242 @@ class FlagReport(models.Model):
     class Meta:
         unique_together = ("issue", "reported_by")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="flag_created_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Flag(issue={self.issue_id}, by={self.reported_by_id})"
+
+
+# =========================================================
+# MAP CLUSTER AGGREGATES
+# =========================================================
+class IssueClusterCell(models.Model):
+    """
+    Precomputed issue counts per map cell, zoom level, status and
+    category. Maintained incrementally by reports.clustering whenever
+    issues are created, moved, change status or are deleted.
+    """
+
+    zoom = models.PositiveSmallIntegerField()
+    cell_x = models.IntegerField()
+    cell_y = models.IntegerField()
+
+    status = models.CharField(max_length=20)
+    category = models.CharField(max_length=50, blank=True, default="")
+
+    count = models.IntegerField(default=0)
+
+    # running sums for the cluster centroid
+    lat_sum = models.FloatField(default=0)
+    lon_sum = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["zoom", "cell_x", "cell_y", "status", "category"],
+                name="unique_issue_cluster_cell",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Cluster(z={self.zoom}, {self.cell_x}/{self.cell_y}, {self.status}, n={self.count})"
+
+
+# =========================================================
+# PROVIDER COVERAGE INDEX
+# =========================================================
+class ProviderCoverageCell(models.Model):
+    """
+    Reverse coverage index: one row per (grid cell, provider) where the
+    provider's service radius reaches the cell. Maintained by
+    reports.services.provider_coverage when a provider's location,
+    radius or profession changes.
+    """
+
+    grid_cell = models.PositiveIntegerField()
+    profession = models.CharField(max_length=50)
+
+    provider = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="coverage_cells",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profession", "grid_cell", "provider"],
+                name="unique_provider_coverage_cell",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Coverage(cell={self.grid_cell}, {self.profession}, provider={self.provider_id})"
+
+
+# =========================================================
+# OPEN ISSUE HEATMAP
+# =========================================================
+class IssueHeatCell(models.Model):
+    """
+    Rollup of open issues per grid cell (see reports.geo) and category.
+    Adjusted by reports.heatmap on every issue create, status change,
+    move and delete.
+    """
+
+    grid_cell = models.PositiveIntegerField()
+    category = models.CharField(max_length=50, blank=True, default="")
+
+    open_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["grid_cell", "category"],
+                name="unique_issue_heat_cell",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Heat(cell={self.grid_cell}, {self.category}, n={self.open_count})"
+
+
+# =========================================================
+# ARCHIVED ISSUE MODEL (cold storage)
+# =========================================================
+class ArchivedIssue(models.Model):
+    """
+    A resolved or rejected issue moved out of the hot Issue table by
+    reports.services.archival, keeping its original id. Photo metadata,
+    likes and flags travel with it as JSON, so the hot-table indexes
+    only cover issues that can still change.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    category = models.CharField(max_length=50, blank=True, null=True)
+
+    location = models.CharField(max_length=255, blank=True, null=True)
+    latitude = models.DecimalField(
+        max_digits=9, decimal_places=6, blank=True, null=True
+    )
+    longitude = models.DecimalField(
+        max_digits=9, decimal_places=6, blank=True, null=True
+    )
+    grid_cell = models.PositiveIntegerField(blank=True, null=True)
+
+    photo = models.ImageField(upload_to="issue_photos/", blank=True, null=True)
+
+    priority = models.CharField(max_length=10)
+    status = models.CharField(max_length=20)
+
+    assigned_provider = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_assigned_issues",
+    )
+    reported_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_reported_issues",
+    )
+
+    is_anonymous = models.BooleanField(default=False)
+    feedback = models.TextField(blank=True, null=True)
+    is_flagged = models.BooleanField(default=False)
+    flag_reason = models.TextField(blank=True, null=True)
+
+    likes_count = models.PositiveIntegerField(default=0)
+
+    # copied verbatim, so no auto_now / auto_now_add
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    # [{"id", "image", "uploaded_at"}]
+    photos = models.JSONField(default=list, blank=True)
+    # user ids
+    liked_by = models.JSONField(default=list, blank=True)
+    # [{"id", "reported_by_id", "reason", "comment", "created_at", "reviewed"}]
+    flags = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # keyset pagination of the history endpoints
+            models.Index(
+                fields=["reported_by", "-created_at", "-id"],
+                name="archived_reporter_created_idx",
+            ),
+            models.Index(
+                fields=["assigned_provider", "-created_at", "-id"],
+                name="archived_provider_created_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.status}, archived)"
+
+
+# =========================================================
+# Admin bulk action jobs
+# =========================================================
+class BulkActionJob(models.Model):
+    """
+    An admin bulk action too large to run inside the request. The
+    selected ids are stored with the job and a Celery worker applies the
+    action in chunks, recording progress as it goes.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    action = models.CharField(max_length=50)
+    params = models.JSONField(default=dict, blank=True)
+    object_ids = models.JSONField(default=list, blank=True)
+
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="queued",
+    )
+    error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100
+        return round(100 * self.processed / self.total)
+
+    def __str__(self):
+        return f"{self.action} ({self.processed}/{self.total}, {self.status})"
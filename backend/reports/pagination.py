@@ -0,0 +1,177 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    Cursors are opaque tokens holding the boundary row's (created_at, id),
+    so every page is a single index range scan no matter how deep it is:
+
+        WHERE created_at <= :t AND (created_at < :t OR id < :id)
+        ORDER BY created_at DESC, id DESC
+        LIMIT :page_size + 1
+    """
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    # ---------------- Cursor encoding ----------------
+    def encode_cursor(self, row, reverse):
+
+        payload = json.dumps(
+            {"t": row.created_at.isoformat(), "i": row.pk, "r": int(reverse)},
+            separators=(",", ":"),
+        )
+
+        return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(
+                urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            )
+            created_at = parse_datetime(payload["t"])
+            pk = int(payload["i"])
+            reverse = bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return created_at, pk, reverse
+
+    def get_page_size(self, request):
+
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(size, 1), self.max_page_size)
+
+    # ---------------- Pagination ----------------
+    def filter_page(self, queryset, cursor, reverse):
+
+        if cursor:
+            created_at, pk, _ = cursor
+
+            if reverse:
+                queryset = queryset.filter(
+                    Q(created_at__gte=created_at),
+                    Q(created_at__gt=created_at) | Q(pk__gt=pk),
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at),
+                    Q(created_at__lt=created_at) | Q(pk__lt=pk),
+                )
+
+        ordering = ("created_at", "pk") if reverse else ("-created_at", "-pk")
+
+        return list(queryset.order_by(*ordering)[:self.size + 1])
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate a queryset, or a list of querysets over tables with
+        disjoint ids (e.g. hot and archived issues): each is read with
+        the same keyset bounds and the rows are merged, so a page still
+        costs one index range scan per table.
+        """
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor[2])
+
+        querysets = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+
+        rows = [
+            row
+            for source in querysets
+            for row in self.filter_page(source, cursor, reverse)
+        ]
+
+        if len(querysets) > 1:
+            rows.sort(key=lambda row: (row.created_at, row.pk), reverse=not reverse)
+            rows = rows[:self.size + 1]
+
+        has_more = len(rows) > self.size
+        rows = rows[:self.size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+
+        return rows
+
+    def get_next_link(self):
+
+        if not self.has_next or not self.page:
+            return None
+
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(self.page[-1], reverse=False),
+        )
+
+    def get_previous_link(self):
+
+        if not self.has_previous:
+            return None
+
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(self.page[0], reverse=True),
+        )
+
+    def get_paginated_response(self, data):
+
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
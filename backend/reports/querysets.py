@@ -0,0 +1,116 @@
+"""
+Queryset builders for the issue viewsets.
+
+Each builder loads everything its serializer reads in a fixed number of
+queries: users via select_related and photos via prefetch_related, so
+list endpoints never lazy-load per row. The search_vector column is only
+needed inside SQL and is never loaded.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+from .models import SEARCH_CONFIG, ArchivedIssue, Issue, issue_search_vector
+
+
+MAX_RANKED_CANDIDATES = 1000
+
+
+def consumer_issues(queryset=None):
+    """
+    Issues for ConsumerIssueSerializer.
+    """
+
+    if queryset is None:
+        queryset = Issue.objects.all()
+
+    return (
+        queryset.select_related("reported_by")
+        .prefetch_related("photos")
+        .defer("search_vector")
+    )
+
+
+def provider_issues(queryset=None):
+    """
+    Issues for ProviderIssueSerializer.
+    """
+
+    if queryset is None:
+        queryset = Issue.objects.all()
+
+    return (
+        queryset.select_related("reported_by", "assigned_provider")
+        .defer("search_vector")
+    )
+
+
+def archived_issues(queryset=None):
+    """
+    Archived issues for either serializer (via archival.as_issue); photos
+    are stored on the row, so no prefetch is needed.
+    """
+
+    if queryset is None:
+        queryset = ArchivedIssue.objects.all()
+
+    return queryset.select_related("reported_by", "assigned_provider")
+
+
+def search_query(text):
+    """
+    Parse a web-style search string (quoted phrases, OR, -exclusions).
+    """
+
+    return SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def search_issues(queryset, text):
+    """
+    Filter issues matching a search string and order them by rank,
+    best first.
+
+    Matches come from the GIN index on search_vector, but ranking has to
+    read every row it scores, so a broad term ("pothole") would rank
+    100k+ rows. An unordered probe (stops after MAX_RANKED_CANDIDATES + 1
+    hits) tells the cases apart: selective searches rank every match,
+    broad ones rank only their newest MAX_RANKED_CANDIDATES matches,
+    which are dense enough to find by walking the created_at index.
+    """
+
+    query = search_query(text)
+
+    matches = queryset.filter(search_vector=query).order_by()
+
+    candidates = list(
+        matches.values_list("pk", flat=True)[:MAX_RANKED_CANDIDATES + 1]
+    )
+
+    if len(candidates) > MAX_RANKED_CANDIDATES:
+        candidates = (
+            matches.order_by("-created_at", "-id")
+            .values("pk")[:MAX_RANKED_CANDIDATES]
+        )
+
+    return (
+        queryset.filter(pk__in=candidates)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "-created_at", "-id")
+    )
+
+
+def search_archived_issues(queryset, text):
+    """
+    search_issues() for archived issues, ranked the same way. The
+    archive stores no search_vector, so it is computed for every row of
+    queryset: narrow it first (e.g. to one provider's issues).
+    """
+
+    query = search_query(text)
+
+    return (
+        queryset.annotate(search_vector=issue_search_vector())
+        .filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "-created_at", "-id")
+    )
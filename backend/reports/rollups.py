@@ -0,0 +1,51 @@
+from django.db import connection, transaction
+
+
+def increment(model, key_fields, deltas):
+    """
+    Add deltas to counter rows of a rollup model in one statement.
+
+    `deltas` maps a tuple of key values (ordered like key_fields) to a
+    dict of {counter_field: delta}. Missing rows are inserted and
+    existing rows are incremented atomically, so concurrent writers
+    never lose updates. key_fields must be covered by a unique
+    constraint on the model.
+    """
+
+    # sorted so concurrent writers lock rows in the same order
+    deltas = {
+        key: values
+        for key, values in sorted(deltas.items())
+        if any(values.values())
+    }
+
+    if not deltas:
+        return
+
+    counter_fields = sorted({f for values in deltas.values() for f in values})
+
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    columns = [model._meta.get_field(f).column for f in (*key_fields, *counter_fields)]
+    key_columns = columns[:len(key_fields)]
+    counter_columns = columns[len(key_fields):]
+
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+
+    params = []
+    for key, values in deltas.items():
+        params.extend(key)
+        params.extend(values.get(f, 0) for f in counter_fields)
+
+    sql = (
+        f"INSERT INTO {table} ({', '.join(qn(c) for c in columns)}) "
+        f"VALUES {', '.join([placeholders] * len(deltas))} "
+        f"ON CONFLICT ({', '.join(qn(c) for c in key_columns)}) DO UPDATE SET "
+        + ", ".join(
+            f"{qn(c)} = {table}.{qn(c)} + EXCLUDED.{qn(c)}"
+            for c in counter_columns
+        )
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, params)
@@ -37,16 +37,24 @@ class FlagReportSerializer(serializers.ModelSerializer):
         ]
 
 
+# =========================================================
+# DUPLICATE CANDIDATE SERIALIZER
+# =========================================================
+class DuplicateIssueSerializer(serializers.Serializer):
+
+    id = serializers.IntegerField(source="issue.id")
+    title = serializers.CharField(source="issue.title")
+    status = serializers.CharField(source="issue.status")
+    created_at = serializers.DateTimeField(source="issue.created_at")
+    distance_km = serializers.FloatField()
+    similarity = serializers.FloatField()
+
+
 # =========================================================
 # CONSUMER ISSUE SERIALIZER
 # =========================================================
 class ConsumerIssueSerializer(serializers.ModelSerializer):
 
-    likes_count = serializers.IntegerField(
-        source="likes.count",
-        read_only=True
-    )
-
     reporter_name = serializers.SerializerMethodField()
 
     photos = IssuePhotoSerializer(
@@ -103,7 +111,7 @@ class ConsumerIssueSerializer(serializers.ModelSerializer):
     # ---------------- Auto Assign Reporter ----------------
     def create(self, validated_data):
 
-        validated_data["reported_by"] = self.context["request"].user
+        validated_data["reported_by_id"] = self.context["request"].user.pk
 
         return super().create(validated_data)
 
@@ -0,0 +1,204 @@
+"""
+Hot/cold split for closed issues.
+
+Issues resolved or rejected more than ISSUE_ARCHIVE_AFTER_DAYS ago are
+moved, in batches, from Issue (and its photos, likes, flags and LSH
+buckets) into ArchivedIssue. The history endpoints read both tables
+through as_issue(), which turns an archived row back into an unsaved
+Issue the existing serializers can render.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from reports.models import (
+    ArchivedIssue,
+    FlagReport,
+    Issue,
+    IssuePhoto,
+    IssueTextBucket,
+)
+from reports.signals import ISSUE_STATE_FIELDS, issues_changed
+
+
+ARCHIVE_STATUSES = ("resolved", "rejected")
+ARCHIVE_BATCH_SIZE = 500
+
+# every stored Issue column; search_vector is generated by Postgres
+ARCHIVED_FIELDS = [
+    field.attname
+    for field in Issue._meta.concrete_fields
+    if not field.generated
+]
+
+IssueLike = Issue.likes.through
+
+
+# =========================================================
+# Write path
+# =========================================================
+def archivable_issues(days=None):
+
+    if days is None:
+        days = settings.ISSUE_ARCHIVE_AFTER_DAYS
+
+    return Issue.objects.filter(
+        status__in=ARCHIVE_STATUSES,
+        updated_at__lt=timezone.now() - timedelta(days=days),
+    )
+
+
+def _delete_rows(model, column, ids):
+    # plain DELETEs: the ORM collector would load every row to send
+    # per-object delete signals, which this module replaces with one
+    # issues_changed batch
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM "{model._meta.db_table}" WHERE "{column}" = ANY(%s)',
+            [list(ids)],
+        )
+
+
+def archive_batch(ids):
+    """
+    Move the given issues into ArchivedIssue. Must run in a transaction
+    that has the issue rows locked. Returns the number archived.
+    """
+
+    issues = list(Issue.objects.filter(pk__in=ids).values(*ARCHIVED_FIELDS))
+
+    if not issues:
+        return 0
+
+    ids = [issue["id"] for issue in issues]
+
+    photos, liked_by, flags = {}, {}, {}
+
+    for photo in IssuePhoto.objects.filter(issue_id__in=ids).values(
+        "id", "issue_id", "image", "uploaded_at",
+    ):
+        photos.setdefault(photo.pop("issue_id"), []).append({
+            **photo,
+            "uploaded_at": photo["uploaded_at"].isoformat(),
+        })
+
+    for issue_id, user_id in IssueLike.objects.filter(
+        issue_id__in=ids,
+    ).values_list("issue_id", "customuser_id"):
+        liked_by.setdefault(issue_id, []).append(user_id)
+
+    for flag in FlagReport.objects.filter(issue_id__in=ids).values(
+        "id", "issue_id", "reported_by_id", "reason", "comment",
+        "created_at", "reviewed",
+    ):
+        flags.setdefault(flag.pop("issue_id"), []).append({
+            **flag,
+            "created_at": flag["created_at"].isoformat(),
+        })
+
+    ArchivedIssue.objects.bulk_create([
+        ArchivedIssue(
+            **issue,
+            photos=photos.get(issue["id"], []),
+            liked_by=liked_by.get(issue["id"], []),
+            flags=flags.get(issue["id"], []),
+        )
+        for issue in issues
+    ])
+
+    _delete_rows(IssueLike, "issue_id", ids)
+    _delete_rows(IssuePhoto, "issue_id", ids)
+    _delete_rows(FlagReport, "issue_id", ids)
+    _delete_rows(IssueTextBucket, "issue_id", ids)
+    _delete_rows(Issue, "id", ids)
+
+    issues_changed.send(
+        sender=Issue,
+        changes=[
+            ({field: issue[field] for field in ISSUE_STATE_FIELDS}, None)
+            for issue in issues
+        ],
+    )
+
+    return len(issues)
+
+
+def archive_closed_issues(days=None, batch_size=ARCHIVE_BATCH_SIZE, limit=None):
+    """
+    Archive every issue closed for more than `days` days, one batch per
+    transaction. Rows locked by a concurrent writer are skipped and
+    picked up by the next run. Returns the number archived.
+    """
+
+    archived = 0
+
+    while limit is None or archived < limit:
+
+        size = batch_size if limit is None else min(batch_size, limit - archived)
+
+        with transaction.atomic():
+
+            ids = list(
+                archivable_issues(days)
+                .order_by("pk")
+                .select_for_update(skip_locked=True)
+                .values_list("pk", flat=True)[:size]
+            )
+
+            if not ids:
+                break
+
+            archived += archive_batch(ids)
+
+    return archived
+
+
+# =========================================================
+# Read path
+# =========================================================
+def as_issue(archived):
+    """
+    Return an unsaved Issue carrying an ArchivedIssue's data, with its
+    photos prefetched, for the Issue serializers.
+    """
+
+    issue = Issue(**{field: getattr(archived, field) for field in ARCHIVED_FIELDS})
+
+    # reuse users loaded with select_related on the archive queryset
+    for relation in ("reported_by", "assigned_provider"):
+        if ArchivedIssue._meta.get_field(relation).is_cached(archived):
+            setattr(issue, relation, getattr(archived, relation))
+
+    photos = IssuePhoto.objects.none()
+    photos._result_cache = [
+        IssuePhoto(
+            id=photo["id"],
+            issue=issue,
+            image=photo["image"],
+            uploaded_at=parse_datetime(photo["uploaded_at"]),
+        )
+        for photo in archived.photos
+    ]
+    photos._prefetch_done = True
+
+    issue._prefetched_objects_cache = {"photos": photos}
+
+    # set by radius searches
+    issue._distance = getattr(archived, "_distance", None)
+
+    return issue
+
+
+def as_issues(rows):
+    """
+    Convert the ArchivedIssue rows of a mixed page to Issues.
+    """
+
+    return [
+        as_issue(row) if isinstance(row, ArchivedIssue) else row
+        for row in rows
+    ]
@@ -0,0 +1,196 @@
+"""
+Set-based bulk actions for the admin.
+
+Every action is a queryset UPDATE, never a per-row save(). Issue updates
+that touch the tracked state fields (status, location, category) lock
+and read the affected rows first so issues_changed can keep the cluster
+and heatmap rollups in sync.
+
+Selections larger than BULK_JOB_THRESHOLD are stored as a BulkActionJob
+and applied by a Celery worker in chunks of BULK_CHUNK_SIZE ids.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from reports.models import BulkActionJob, FlagReport, Issue
+from reports.signals import ISSUE_STATE_FIELDS, issues_changed
+
+
+BULK_JOB_THRESHOLD = 2000
+BULK_CHUNK_SIZE = 500
+
+
+# =========================================================
+# Set-based updates
+# =========================================================
+def _update_issues(queryset, **values):
+    """
+    UPDATE the issues in queryset and announce the state changes.
+    Returns the number of rows updated.
+    """
+
+    values["updated_at"] = timezone.now()
+
+    with transaction.atomic():
+
+        before = list(
+            queryset.order_by("pk")
+            .select_for_update()
+            .values(*ISSUE_STATE_FIELDS)
+        )
+
+        if not before:
+            return 0
+
+        updated = Issue.objects.filter(
+            pk__in=[state["id"] for state in before]
+        ).update(**values)
+
+        changed = {
+            field: value
+            for field, value in values.items()
+            if field in ISSUE_STATE_FIELDS
+        }
+
+        if changed:
+            issues_changed.send(
+                sender=Issue,
+                changes=[(state, {**state, **changed}) for state in before],
+            )
+
+    return updated
+
+
+def assign_issues(queryset, provider_id):
+    """
+    Assign the unassigned issues in queryset to a provider.
+    """
+
+    return _update_issues(
+        queryset.filter(assigned_provider__isnull=True),
+        assigned_provider_id=provider_id,
+        status="assigned",
+    )
+
+
+def set_issue_priority(queryset, priority):
+
+    # priority is not tracked state, so no locking read is needed
+    return queryset.update(priority=priority, updated_at=timezone.now())
+
+
+def set_issue_status(queryset, status):
+
+    return _update_issues(queryset.exclude(status=status), status=status)
+
+
+def mark_flags_reviewed(queryset):
+
+    return queryset.filter(reviewed=False).update(reviewed=True)
+
+
+# action name -> (model, function taking (queryset, **params))
+ACTIONS = {
+    "assign_issues": (Issue, assign_issues),
+    "set_issue_priority": (Issue, set_issue_priority),
+    "set_issue_status": (Issue, set_issue_status),
+    "mark_flags_reviewed": (FlagReport, mark_flags_reviewed),
+}
+
+
+# =========================================================
+# Dispatch (inline or background job)
+# =========================================================
+def run_action(action, queryset, user=None, **params):
+    """
+    Apply a bulk action to a queryset. Small selections run inline and
+    return (updated, None); large ones are queued as a background job and
+    return (None, job).
+    """
+
+    _, func = ACTIONS[action]
+
+    object_ids = list(
+        queryset.order_by("pk").values_list("pk", flat=True)[:BULK_JOB_THRESHOLD + 1]
+    )
+
+    if len(object_ids) <= BULK_JOB_THRESHOLD:
+        return func(queryset.model.objects.filter(pk__in=object_ids), **params), None
+
+    object_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+
+    job = BulkActionJob.objects.create(
+        action=action,
+        params=params,
+        object_ids=object_ids,
+        total=len(object_ids),
+        created_by=user,
+    )
+
+    from reports.tasks import run_bulk_action_job
+
+    transaction.on_commit(lambda: run_bulk_action_job.delay(job.pk))
+
+    return None, job
+
+
+def run_job(job_id):
+    """
+    Apply a queued BulkActionJob chunk by chunk. Each chunk's UPDATE and
+    the job's progress commit in one transaction, so a retry resumes
+    from the saved position without re-applying (or re-counting) a
+    chunk.
+    """
+
+    job = BulkActionJob.objects.get(pk=job_id)
+
+    if job.status == "done":
+        return job
+
+    model, func = ACTIONS[job.action]
+
+    BulkActionJob.objects.filter(pk=job.pk).update(status="running")
+
+    try:
+        while True:
+
+            with transaction.atomic():
+
+                # locked, so a redelivered task running alongside this
+                # one waits and then skips the chunk this one applied
+                processed, updated = (
+                    BulkActionJob.objects.select_for_update()
+                    .values_list("processed", "updated")
+                    .get(pk=job.pk)
+                )
+
+                if processed >= job.total:
+                    break
+
+                chunk = job.object_ids[processed:processed + BULK_CHUNK_SIZE]
+
+                updated += func(model.objects.filter(pk__in=chunk), **job.params)
+
+                BulkActionJob.objects.filter(pk=job.pk).update(
+                    processed=processed + len(chunk),
+                    updated=updated,
+                )
+
+    except Exception as exc:
+        BulkActionJob.objects.filter(pk=job.pk).update(
+            status="failed",
+            error=str(exc),
+            finished_at=timezone.now(),
+        )
+        raise
+
+    BulkActionJob.objects.filter(pk=job.pk).update(
+        status="done",
+        finished_at=timezone.now(),
+    )
+
+    job.refresh_from_db()
+
+    return job
+
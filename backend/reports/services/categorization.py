@@ -0,0 +1,158 @@
+"""
+Background categorization and auto-assignment of new issues.
+
+Issue creation only enqueues work (see ConsumerIssueViewSet):
+
+- issues submitted without a category wait for the next micro-batch:
+  the first one schedules categorize_pending_issues CATEGORIZE_WINDOW
+  seconds out, and every uncategorized issue that lands before it runs
+  is classified in the same ml.predict batch
+- once categorized (or straight away when the reporter chose a
+  category) auto_assign_issues hands the issue to the nearest covering
+  provider
+
+Both steps are idempotent, so Celery retries and the periodic sweep can
+re-run them freely: categorization only touches issues whose category
+is still empty, assignment only issues still pending and unassigned.
+"""
+
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ml.predict import predict_issue_categories
+from reports.models import Issue
+from reports.services.issue_assignment import auto_assign_issue
+from reports.signals import ISSUE_STATE_FIELDS, issues_changed
+
+
+CATEGORIZE_WINDOW = 2
+CATEGORIZE_BATCH_SIZE = 200
+
+# set while a batch is scheduled; expires in case the broker lost it
+SCHEDULED_KEY = "issue-categorize:scheduled"
+SCHEDULED_TIMEOUT = 60
+
+
+# =========================================================
+# Enqueueing
+# =========================================================
+def enqueue_issue(issue):
+    """
+    Queue a freshly created issue for categorization and assignment.
+    Call after the issue's transaction has committed.
+    """
+
+    from reports.tasks import auto_assign_issues, categorize_pending_issues
+
+    if issue.category:
+        auto_assign_issues.delay([issue.pk])
+
+    elif cache.add(SCHEDULED_KEY, True, SCHEDULED_TIMEOUT):
+        categorize_pending_issues.apply_async(countdown=CATEGORIZE_WINDOW)
+
+
+# =========================================================
+# Categorization
+# =========================================================
+def uncategorized_issues():
+    return Issue.objects.filter(Q(category__isnull=True) | Q(category=""))
+
+
+def categorize_batch(batch_size=CATEGORIZE_BATCH_SIZE):
+    """
+    Predict and store the category of up to batch_size uncategorized
+    issues with one model call. Returns the ids categorized.
+    """
+
+    with transaction.atomic():
+
+        rows = list(
+            uncategorized_issues()
+            .order_by("pk")
+            .select_for_update(skip_locked=True)
+            .values(*ISSUE_STATE_FIELDS, "description")[:batch_size]
+        )
+
+        if not rows:
+            return []
+
+        predictions = predict_issue_categories(
+            [row.pop("description") for row in rows]
+        )
+
+        by_category = defaultdict(list)
+
+        for row, (category, _confidence) in zip(rows, predictions):
+            by_category[category].append(row["id"])
+
+        now = timezone.now()
+
+        # one UPDATE per category, not per issue
+        for category, ids in by_category.items():
+            Issue.objects.filter(pk__in=ids).update(category=category, updated_at=now)
+
+        issues_changed.send(
+            sender=Issue,
+            changes=[
+                (row, {**row, "category": category})
+                for row, (category, _confidence) in zip(rows, predictions)
+            ],
+        )
+
+    return [row["id"] for row in rows]
+
+
+def categorize_pending_issues(batch_size=CATEGORIZE_BATCH_SIZE):
+    """
+    Categorize every uncategorized issue, batch by batch. Returns the
+    ids categorized.
+    """
+
+    # issues created from here on schedule the next run
+    cache.delete(SCHEDULED_KEY)
+
+    categorized = []
+
+    while True:
+
+        ids = categorize_batch(batch_size)
+
+        if not ids:
+            return categorized
+
+        categorized += ids
+
+
+# =========================================================
+# Assignment
+# =========================================================
+def assign_issues(issue_ids):
+    """
+    Auto-assign each issue that is still pending and unassigned.
+    Returns the number assigned.
+    """
+
+    assigned = 0
+
+    for issue_id in issue_ids:
+
+        with transaction.atomic():
+
+            issue = (
+                Issue.objects.select_for_update()
+                .filter(pk=issue_id, status="pending", assigned_provider__isnull=True)
+                .first()
+            )
+
+            if issue is None:
+                continue
+
+            auto_assign_issue(issue)
+
+            assigned += issue.assigned_provider_id is not None
+
+    return assigned
@@ -0,0 +1,203 @@
+"""
+Near-duplicate detection for new issue submissions.
+
+Text similarity uses MinHash over word unigrams + bigrams of
+title + description, with LSH banding (LSH_BANDS x LSH_ROWS hashes,
+~0.37 Jaccard threshold). Every issue stores its band buckets in
+IssueTextBucket, so candidates come from two indexed lookups: issues
+sharing a bucket, restricted to nearby grid cells / bounding box.
+Only that small candidate set is scored exactly.
+"""
+
+import re
+from datetime import timedelta
+from hashlib import blake2b
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from reports.geo import bounding_box_filter, distances_km, grid_cell_filter
+from reports.models import Issue, IssueTextBucket
+
+
+LSH_BANDS = 20
+LSH_ROWS = 3
+NUM_HASHES = LSH_BANDS * LSH_ROWS
+
+DUPLICATE_RADIUS_KM = 0.3
+DUPLICATE_WINDOW_DAYS = 30
+SIMILARITY_THRESHOLD = 0.5
+MAX_CANDIDATES = 50
+MAX_DUPLICATES = 5
+
+_PRIME = np.uint64(4294967291)  # largest 32-bit prime
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(1, int(_PRIME), NUM_HASHES, dtype=np.uint64)
+_HASH_B = _rng.integers(0, int(_PRIME), NUM_HASHES, dtype=np.uint64)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# =========================================================
+# MinHash / LSH
+# =========================================================
+def issue_text(title, description):
+    return f"{title or ''} {description or ''}"
+
+
+def shingles(text):
+
+    tokens = _TOKEN_RE.findall((text or "").lower())
+
+    return set(tokens) | {
+        f"{a} {b}" for a, b in zip(tokens, tokens[1:])
+    }
+
+
+def _stable_hash(value, digest_size=4):
+    # hash() is salted per process; LSH buckets must be stable
+    return int.from_bytes(
+        blake2b(value.encode(), digest_size=digest_size).digest(),
+        "little",
+    )
+
+
+def minhash_signature(shingle_set):
+
+    if not shingle_set:
+        return None
+
+    values = np.fromiter(
+        (_stable_hash(s) for s in shingle_set),
+        dtype=np.uint64,
+        count=len(shingle_set),
+    )
+
+    # (NUM_HASHES, n) universal hashes; a * x stays below 2**64
+    hashed = (_HASH_A[:, None] * values[None, :] + _HASH_B[:, None]) % _PRIME
+
+    return hashed.min(axis=1)
+
+
+def lsh_buckets(shingle_set):
+    """
+    Return the LSH band bucket ids (signed 64-bit) for a shingle set.
+    """
+
+    signature = minhash_signature(shingle_set)
+
+    if signature is None:
+        return []
+
+    buckets = []
+
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = blake2b(
+            band.to_bytes(1, "little") + rows.tobytes(),
+            digest_size=8,
+        ).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+
+    return buckets
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# =========================================================
+# Index maintenance
+# =========================================================
+def index_issue(issue):
+    """
+    Replace the LSH buckets of one issue.
+    """
+
+    buckets = lsh_buckets(shingles(issue_text(issue.title, issue.description)))
+
+    with transaction.atomic():
+
+        IssueTextBucket.objects.filter(issue_id=issue.pk).delete()
+
+        IssueTextBucket.objects.bulk_create(
+            IssueTextBucket(issue_id=issue.pk, bucket=bucket)
+            for bucket in set(buckets)
+        )
+
+
+# =========================================================
+# Lookup
+# =========================================================
+def find_duplicates(title, description, latitude, longitude, exclude_id=None):
+    """
+    Return likely duplicates of a submission: open issues reported in
+    the last DUPLICATE_WINDOW_DAYS within DUPLICATE_RADIUS_KM whose
+    text Jaccard similarity is at least SIMILARITY_THRESHOLD, most
+    similar first. Each item is {"issue", "distance_km", "similarity"}.
+    """
+
+    if latitude is None or longitude is None:
+        return []
+
+    query_shingles = shingles(issue_text(title, description))
+    buckets = lsh_buckets(query_shingles)
+
+    if not buckets:
+        return []
+
+    candidates = Issue.objects.filter(
+        grid_cell_filter(latitude, longitude, DUPLICATE_RADIUS_KM),
+        bounding_box_filter(latitude, longitude, DUPLICATE_RADIUS_KM),
+        status__in=Issue.OPEN_STATUSES,
+        created_at__gte=timezone.now() - timedelta(days=DUPLICATE_WINDOW_DAYS),
+        pk__in=IssueTextBucket.objects.filter(
+            bucket__in=buckets
+        ).values("issue_id"),
+    )
+
+    if exclude_id is not None:
+        candidates = candidates.exclude(pk=exclude_id)
+
+    candidates = list(
+        candidates.only(
+            "id", "title", "description", "status",
+            "latitude", "longitude", "created_at",
+        ).order_by("-created_at")[:MAX_CANDIDATES]
+    )
+
+    if not candidates:
+        return []
+
+    distances = distances_km(
+        latitude,
+        longitude,
+        [issue.latitude for issue in candidates],
+        [issue.longitude for issue in candidates],
+    ).tolist()
+
+    matches = []
+
+    for issue, distance in zip(candidates, distances):
+
+        if distance > DUPLICATE_RADIUS_KM:
+            continue
+
+        similarity = jaccard(
+            query_shingles,
+            shingles(issue_text(issue.title, issue.description)),
+        )
+
+        if similarity >= SIMILARITY_THRESHOLD:
+            matches.append({
+                "issue": issue,
+                "distance_km": round(distance, 3),
+                "similarity": round(similarity, 2),
+            })
+
+    matches.sort(key=lambda match: -match["similarity"])
+
+    return matches[:MAX_DUPLICATES]
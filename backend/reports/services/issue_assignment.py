@@ -1,39 +1,22 @@
-from geopy.distance import geodesic
-from accounts.models import ProviderProfile
+from reports.services import provider_index
 
 
 def auto_assign_issue(issue):
 
-    if not issue.latitude or not issue.longitude:
+    if issue.latitude is None or issue.longitude is None:
         return
 
-    providers = ProviderProfile.objects.filter(
-        department=issue.category
+    match = provider_index.nearest_provider(
+        issue.category,
+        issue.latitude,
+        issue.longitude,
     )
 
-    if not providers.exists():
+    if match is None:
         return
 
-    issue_location = (float(issue.latitude), float(issue.longitude))
+    provider_id, _distance = match
 
-    nearest_provider = None
-    nearest_distance = 9999
-
-    for provider in providers:
-
-        provider_location = (
-            float(provider.latitude),
-            float(provider.longitude)
-        )
-
-        distance = geodesic(issue_location, provider_location).km
-
-        if distance < nearest_distance:
-            nearest_distance = distance
-            nearest_provider = provider
-
-    if nearest_provider:
-
-        issue.assigned_provider = nearest_provider.user
-        issue.status = "assigned"
-        issue.save()
\ No newline at end of file
+    issue.assigned_provider_id = provider_id
+    issue.status = "assigned"
+    issue.save(update_fields=["assigned_provider", "status", "updated_at"])
@@ -0,0 +1,80 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from reports.models import Issue
+
+
+IssueLike = Issue.likes.through
+
+
+def toggle_like(issue_id, user_id):
+    """
+    Like or unlike an issue for a user.
+
+    The through row and Issue.likes_count change in one transaction, and
+    the counter moves by exactly the number of rows inserted/deleted, so
+    concurrent toggles can't drift it. Returns (liked, likes_count).
+    """
+
+    membership = IssueLike.objects.filter(
+        issue_id=issue_id,
+        customuser_id=user_id,
+    )
+
+    with transaction.atomic():
+
+        # served by the (issue_id, customuser_id) unique index
+        if membership.exists():
+            deleted, _ = membership.delete()
+            liked, delta = False, -deleted
+
+        else:
+            try:
+                with transaction.atomic():
+                    IssueLike.objects.create(issue_id=issue_id, customuser_id=user_id)
+                delta = 1
+            except IntegrityError:
+                # a concurrent request already liked it
+                delta = 0
+
+            liked = True
+
+        return liked, _add_to_likes_count(issue_id, delta)
+
+
+def _add_to_likes_count(issue_id, delta):
+
+    table = connection.ops.quote_name(Issue._meta.db_table)
+
+    with connection.cursor() as cursor:
+        # UPDATE ... RETURNING: increment and read back in one round trip
+        cursor.execute(
+            f"UPDATE {table} SET likes_count = likes_count + %s "
+            f"WHERE id = %s RETURNING likes_count",
+            [delta, issue_id],
+        )
+        row = cursor.fetchone()
+
+    return row[0] if row else 0
+
+
+def reconcile_like_counts():
+    """
+    Reset Issue.likes_count from the through table wherever it drifted.
+    Returns the number of issues corrected.
+    """
+
+    actual = (
+        IssueLike.objects.filter(issue_id=OuterRef("pk"))
+        .order_by()
+        .values("issue_id")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+
+    return (
+        Issue.objects.annotate(actual=Coalesce(Subquery(actual), 0))
+        .exclude(likes_count=F("actual"))
+        .update(likes_count=Coalesce(Subquery(actual), 0))
+    )
@@ -0,0 +1,125 @@
+"""
+Reverse coverage index: which providers can serve a given point.
+
+Every provider is expanded once into the grid cells (see reports.geo)
+that their service_radius_km reaches. Answering "who can serve this
+issue" is then a single indexed lookup on (profession, grid_cell)
+followed by an exact distance check on the handful of providers listed
+for that cell.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from reports.geo import distances_km, grid_cell, grid_cells_covering
+from reports.models import ProviderCoverageCell
+
+
+def _is_indexable(user):
+    return (
+        user.role == "provider"
+        and user.is_active
+        and user.profession
+        and user.latitude is not None
+        and user.longitude is not None
+    )
+
+
+def _coverage_rows(user, model=ProviderCoverageCell):
+    return [
+        model(
+            grid_cell=cell,
+            profession=user.profession,
+            provider_id=user.pk,
+        )
+        for cell in grid_cells_covering(
+            user.latitude,
+            user.longitude,
+            user.service_radius_km,
+        )
+    ]
+
+
+def update_provider(user):
+    """
+    Replace the coverage rows of one provider.
+    """
+
+    with transaction.atomic():
+
+        ProviderCoverageCell.objects.filter(provider_id=user.pk).delete()
+
+        if _is_indexable(user):
+            ProviderCoverageCell.objects.bulk_create(
+                _coverage_rows(user),
+                batch_size=2000,
+            )
+
+
+def rebuild(user_model=None, model=ProviderCoverageCell):
+    """
+    Recompute the whole coverage index.
+    """
+
+    if user_model is None:
+        user_model = get_user_model()
+
+    providers = user_model.objects.filter(
+        role="provider",
+        is_active=True,
+        profession__isnull=False,
+        latitude__isnull=False,
+        longitude__isnull=False,
+    )
+
+    with transaction.atomic():
+
+        model.objects.all().delete()
+
+        for user in providers.iterator(chunk_size=500):
+            model.objects.bulk_create(
+                _coverage_rows(user, model),
+                batch_size=2000,
+            )
+
+
+def providers_for_point(profession, lat, lon):
+    """
+    Return [(provider_id, distance_km), ...] for every provider of the
+    profession whose service radius covers (lat, lon), nearest first.
+    """
+
+    if not profession or lat is None or lon is None:
+        return []
+
+    candidates = list(
+        ProviderCoverageCell.objects.filter(
+            profession=profession,
+            grid_cell=grid_cell(lat, lon),
+        ).values_list(
+            "provider_id",
+            "provider__latitude",
+            "provider__longitude",
+            "provider__service_radius_km",
+        )
+    )
+
+    if not candidates:
+        return []
+
+    ids, lats, lons, radii = zip(*candidates)
+
+    distances = distances_km(lat, lon, lats, lons).tolist()
+
+    return sorted(
+        (
+            (provider_id, dist)
+            for provider_id, dist, radius in zip(ids, distances, radii)
+            if dist <= radius
+        ),
+        key=lambda match: match[1],
+    )
+
+
+def providers_for_issue(issue):
+    return providers_for_point(issue.category, issue.latitude, issue.longitude)
@@ -0,0 +1,225 @@
+"""
+In-memory spatial index of providers, one KD-tree per profession.
+
+Provider locations are projected onto the unit sphere, so straight-line
+(chord) distance in the tree is monotonic with great-circle distance and
+nearest-provider lookups are O(log n) instead of a scan over every
+provider in the department.
+
+Trees are built lazily and cached per process, tagged with the
+profession's version number from the shared cache. Provider changes that
+move a provider in or out of the index bump the version after their
+transaction commits (see reports/signals.py), so every process - web
+workers and the Celery auto-assigner alike - rebuilds on its next
+lookup. The TTL only bounds staleness if the shared cache loses a key.
+"""
+
+import threading
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from reports.geo import EARTH_RADIUS_KM
+
+
+PROVIDER_INDEX_TTL = 300  # seconds
+
+# CustomUser fields that decide whether and where a provider is indexed
+INDEXED_FIELDS = frozenset(
+    {"role", "profession", "latitude", "longitude", "service_radius_km", "is_active"}
+)
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def _to_unit_xyz(lats, lons):
+
+    lats = np.radians(np.asarray(lats, dtype=np.float64))
+    lons = np.radians(np.asarray(lons, dtype=np.float64))
+
+    return np.column_stack((
+        np.cos(lats) * np.cos(lons),
+        np.cos(lats) * np.sin(lons),
+        np.sin(lats),
+    ))
+
+
+def _version_key(profession):
+    return f"provider-index:{profession}:version"
+
+
+def _new_version():
+    # unique per initialisation, so a version key that was evicted and
+    # recreated never matches a tree built before
+    return time.time_ns()
+
+
+def _km_to_chord(km):
+    return 2 * np.sin(np.minimum(km / EARTH_RADIUS_KM, np.pi) / 2)
+
+
+def _chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chord / 2, 1.0))
+
+
+# =========================================================
+# Index
+# =========================================================
+class ProviderIndex:
+
+    def __init__(self, provider_ids, lats, lons, radii_km, version=None):
+
+        self.version = version
+        self.provider_ids = np.asarray(provider_ids, dtype=np.int64)
+        self.radii_km = np.asarray(radii_km, dtype=np.float64)
+        self.built_at = time.monotonic()
+
+        if len(self.provider_ids):
+            # imported here so loading the signal handlers stays cheap
+            from scipy.spatial import cKDTree
+
+            self.tree = cKDTree(_to_unit_xyz(lats, lons))
+            # query bounds are exclusive; pad so the edge stays covered
+            self.max_chord = float(_km_to_chord(self.radii_km.max())) * (1 + 1e-9)
+        else:
+            self.tree = None
+            self.max_chord = 0.0
+
+    def __len__(self):
+        return len(self.provider_ids)
+
+    @classmethod
+    def build(cls, profession, version=None):
+
+        rows = list(
+            get_user_model().objects.filter(
+                role="provider",
+                profession=profession,
+                is_active=True,
+                latitude__isnull=False,
+                longitude__isnull=False,
+            ).values_list("id", "latitude", "longitude", "service_radius_km")
+        )
+
+        if not rows:
+            return cls([], [], [], [], version)
+
+        ids, lats, lons, radii = zip(*rows)
+
+        return cls(ids, lats, lons, radii, version)
+
+    def nearest(self, lat, lon):
+        """
+        Return (provider_id, distance_km) for the nearest provider whose
+        service radius covers the point, or None.
+        """
+
+        if self.tree is None:
+            return None
+
+        point = _to_unit_xyz([lat], [lon])[0]
+        n = len(self)
+        k = min(8, n)
+
+        while True:
+
+            chords, idx = self.tree.query(
+                point,
+                k=k,
+                distance_upper_bound=self.max_chord,
+            )
+
+            chords, idx = np.atleast_1d(chords), np.atleast_1d(idx)
+            found = np.isfinite(chords)
+            chords, idx = chords[found], idx[found]
+
+            distances = _chord_to_km(chords)
+            covered = np.flatnonzero(distances <= self.radii_km[idx])
+
+            # results are sorted by distance, so the first covering
+            # provider is the nearest one
+            if covered.size:
+                i = covered[0]
+                return int(self.provider_ids[idx[i]]), float(distances[i])
+
+            # nothing left inside the largest service radius
+            if len(idx) < k or k == n:
+                return None
+
+            k = min(k * 2, n)
+
+
+# =========================================================
+# Per-process cache, versioned through the shared cache
+# =========================================================
+def current_version(profession):
+    return cache.get_or_set(_version_key(profession), _new_version, timeout=None)
+
+
+def _is_fresh(index, version):
+    return (
+        index is not None
+        and index.version == version
+        and time.monotonic() - index.built_at < PROVIDER_INDEX_TTL
+    )
+
+
+def get_index(profession):
+
+    version = current_version(profession)
+    index = _indexes.get(profession)
+
+    if _is_fresh(index, version):
+        return index
+
+    with _lock:
+
+        index = _indexes.get(profession)
+
+        if not _is_fresh(index, version):
+            # read before building: a change committed mid-build bumps
+            # past this version and forces another rebuild
+            index = ProviderIndex.build(profession, version)
+            _indexes[profession] = index
+
+    return index
+
+
+def invalidate(professions):
+    """
+    Bump the shared version of each profession, making every process
+    rebuild its tree on the next lookup. If the shared cache is
+    unreachable only this process rebuilds; the others pick the change
+    up when PROVIDER_INDEX_TTL expires.
+    """
+
+    for profession in professions:
+
+        try:
+            try:
+                cache.incr(_version_key(profession))
+            except ValueError:
+                # evicted or never read; a fresh value can't match any tree
+                cache.add(_version_key(profession), _new_version(), timeout=None)
+        except Exception:
+            # runs after the change has committed, so a cache outage must
+            # not fail the save; other processes catch up within the TTL
+            pass
+
+        with _lock:
+            _indexes.pop(profession, None)
+
+
+def nearest_provider(profession, lat, lon):
+    """
+    Return (provider_id, distance_km) of the nearest provider of the
+    given profession whose service radius covers (lat, lon), or None.
+    """
+
+    if not profession or lat is None or lon is None:
+        return None
+
+    return get_index(profession).nearest(float(lat), float(lon))
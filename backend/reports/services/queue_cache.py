@@ -0,0 +1,94 @@
+"""
+Shared cache of provider work queues.
+
+Every provider of a profession polls the same "pending, unassigned,
+category = profession" queue, so its first page is serialized once and
+stored in the shared cache under a per-profession version number.
+Issue changes bump the version after their transaction commits (see
+reports.signals), which orphans the old entry; a reader that raced the
+commit can only ever write under the old version.
+"""
+
+import time
+
+from django.core.cache import cache
+
+from civictrack.routers import replica_reads
+
+
+QUEUE_CACHE_TTL = 300
+
+STATS_KEYS = {
+    "hits": "provider-queue:stats:hits",
+    "misses": "provider-queue:stats:misses",
+}
+
+
+def _version_key(profession):
+    return f"provider-queue:{profession}:version"
+
+
+def _new_version():
+    # unique per initialisation, so a version key that was evicted and
+    # recreated never points back at a page cached before
+    return time.time_ns()
+
+
+def _count(name):
+
+    key = STATS_KEYS[name]
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def get_queue(profession, build):
+    """
+    Return the cached queue page for a profession, calling build() to
+    produce and store it on a miss.
+    """
+
+    version = cache.get_or_set(_version_key(profession), _new_version, timeout=None)
+    key = f"provider-queue:{profession}:v{version}"
+
+    data = cache.get(key)
+
+    if data is not None:
+        _count("hits")
+        return data
+
+    _count("misses")
+
+    # a lagging replica could refill the new version with old rows
+    with replica_reads(False):
+        data = build()
+
+    cache.set(key, data, QUEUE_CACHE_TTL)
+
+    return data
+
+
+def invalidate(professions):
+
+    for profession in professions:
+        try:
+            cache.incr(_version_key(profession))
+        except ValueError:
+            # evicted or never read; the next reader seeds a fresh version
+            pass
+
+
+def stats():
+
+    values = cache.get_many(STATS_KEYS.values())
+
+    hits = values.get(STATS_KEYS["hits"], 0)
+    misses = values.get(STATS_KEYS["misses"], 0)
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+    }
@@ -0,0 +1,198 @@
+"""
+Provider workflow transitions (claim -> start -> resolve).
+
+Each transition is a single conditional UPDATE whose WHERE clause holds
+every precondition (current status, assignment, category), so two
+providers racing for the same issue can never both win: the database
+applies the first UPDATE and the second matches zero rows.
+
+Transitions only move forward one step: a provider claims a pending
+issue of their category, starts work on an issue assigned to them
+(status "assigned"; already started or resolved issues are rejected)
+and resolves one they have in progress.
+
+Failures never tell a provider about issues that aren't theirs: issues
+outside their category, or assigned to someone else, are NOT_FOUND, and
+an issue of their category that can't be claimed is UNAVAILABLE. Only
+the assigned provider learns the issue's status (INVALID_STATUS).
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from reports.models import Issue
+from reports.signals import ISSUE_STATE_FIELDS, issues_changed
+
+
+CLAIM = "claim"
+START = "start"
+RESOLVE = "resolve"
+
+TRANSITIONS = {
+    CLAIM: ("pending", "assigned"),
+    START: ("assigned", "in_progress"),
+    RESOLVE: ("in_progress", "resolved"),
+}
+
+# failure reasons
+NOT_FOUND = "not_found"
+UNAVAILABLE = "unavailable"
+INVALID_STATUS = "invalid_status"
+
+
+def _preconditions(action, provider):
+
+    from_status, _ = TRANSITIONS[action]
+
+    if action == CLAIM:
+        return Q(
+            status=from_status,
+            assigned_provider__isnull=True,
+            category=provider.profession,
+        )
+
+    return Q(status=from_status, assigned_provider_id=provider.pk)
+
+
+def _allowed(action, provider, issue):
+    # Python mirror of _preconditions for rows that are already locked
+
+    if issue is None or issue["status"] != TRANSITIONS[action][0]:
+        return False
+
+    if action == CLAIM:
+        return (
+            issue["assigned_provider_id"] is None
+            and issue["category"] == provider.profession
+        )
+
+    return issue["assigned_provider_id"] == provider.pk
+
+
+def _failure_reason(action, provider, issue):
+
+    if issue is None:
+        return NOT_FOUND
+
+    if action == CLAIM:
+        if issue["category"] != provider.profession:
+            return NOT_FOUND
+        # claimed by anyone, or no longer pending
+        return UNAVAILABLE
+
+    if issue["assigned_provider_id"] != provider.pk:
+        return NOT_FOUND
+
+    return INVALID_STATUS
+
+
+def apply_transition(issue_id, provider, action):
+    """
+    Atomically move one issue through a workflow action for a provider.
+    Returns None on success, otherwise a failure reason.
+    """
+
+    from_status, to_status = TRANSITIONS[action]
+
+    values = {"status": to_status, "updated_at": timezone.now()}
+
+    if action == CLAIM:
+        values["assigned_provider_id"] = provider.pk
+
+    with transaction.atomic():
+
+        updated = Issue.objects.filter(
+            _preconditions(action, provider),
+            pk=issue_id,
+        ).update(**values)
+
+        if updated:
+            # the UPDATE holds the row lock, so this read is consistent
+            after = Issue.objects.filter(pk=issue_id).values(*ISSUE_STATE_FIELDS).get()
+
+            issues_changed.send(
+                sender=Issue,
+                changes=[({**after, "status": from_status}, after)],
+            )
+
+            return None
+
+    issue = (
+        Issue.objects.filter(pk=issue_id)
+        .values("category", "status", "assigned_provider_id")
+        .first()
+    )
+
+    return _failure_reason(action, provider, issue)
+
+
+# =========================================================
+# Batch transitions
+# =========================================================
+MAX_BATCH_SIZE = 200
+
+ACTION_FOR_STATUS = {
+    to_status: action
+    for action, (_, to_status) in TRANSITIONS.items()
+}
+
+
+def apply_transitions(issue_ids, provider, action):
+    """
+    Move many issues through the same workflow action in one go.
+
+    The rows are read and locked with a single SELECT ... FOR UPDATE,
+    validated in Python, and every eligible one is moved with a single
+    UPDATE. Returns {issue_id: None or failure reason}.
+    """
+
+    from_status, to_status = TRANSITIONS[action]
+
+    issue_ids = list(dict.fromkeys(issue_ids))
+
+    with transaction.atomic():
+
+        rows = {
+            row["id"]: row
+            # lock in pk order so overlapping batches cannot deadlock
+            for row in Issue.objects.filter(pk__in=issue_ids)
+            .order_by("pk")
+            .select_for_update()
+            .values(*ISSUE_STATE_FIELDS, "assigned_provider_id")
+        }
+
+        results = {
+            issue_id: (
+                None
+                if _allowed(action, provider, rows.get(issue_id))
+                else _failure_reason(action, provider, rows.get(issue_id))
+            )
+            for issue_id in issue_ids
+        }
+
+        eligible = [
+            issue_id for issue_id, failure in results.items() if failure is None
+        ]
+
+        if eligible:
+
+            values = {"status": to_status, "updated_at": timezone.now()}
+
+            if action == CLAIM:
+                values["assigned_provider_id"] = provider.pk
+
+            Issue.objects.filter(pk__in=eligible).update(**values)
+
+            changes = []
+
+            for issue_id in eligible:
+                before = {
+                    field: rows[issue_id][field]
+                    for field in ISSUE_STATE_FIELDS
+                }
+                changes.append((before, {**before, "status": to_status}))
+
+            issues_changed.send(sender=Issue, changes=changes)
+
+    return results
@@ -0,0 +1,203 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from . import clustering, heatmap
+from .models import Issue
+from .services import (
+    duplicate_detection,
+    provider_coverage,
+    provider_index,
+    queue_cache,
+)
+
+
+# =========================================================
+# Issue change notifications
+# =========================================================
+# Sent whenever issues are created, updated or deleted, including by
+# set-based queryset updates (which must send it explicitly).
+# `changes` is a list of (before, after) state dicts built with
+# issue_state(); before is None for new issues, after is None for
+# deleted ones. Receivers run inside the writing transaction.
+issues_changed = Signal()
+
+ISSUE_STATE_FIELDS = ("id", "latitude", "longitude", "category", "status")
+
+
+def issue_state(issue):
+    return {field: getattr(issue, field) for field in ISSUE_STATE_FIELDS}
+
+
+@receiver(pre_save, sender=Issue)
+def remember_issue_state(sender, instance, update_fields=None, raw=False, **kwargs):
+
+    instance._previous_state = None
+
+    if raw or instance._state.adding:
+        return
+
+    if update_fields is not None and not (
+        set(ISSUE_STATE_FIELDS) & set(update_fields)
+    ):
+        instance._previous_state = issue_state(instance)
+        return
+
+    instance._previous_state = (
+        Issue.objects.filter(pk=instance.pk)
+        .values(*ISSUE_STATE_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Issue)
+def announce_issue_saved(sender, instance, created, raw=False, **kwargs):
+
+    if raw:
+        return
+
+    before = None if created else instance.__dict__.pop("_previous_state", None)
+    after = issue_state(instance)
+
+    if before != after:
+        issues_changed.send(sender=Issue, changes=[(before, after)])
+
+
+@receiver(post_delete, sender=Issue)
+def announce_issue_deleted(sender, instance, **kwargs):
+
+    issues_changed.send(sender=Issue, changes=[(issue_state(instance), None)])
+
+
+# =========================================================
+# Duplicate detection text index
+# =========================================================
+@receiver(post_save, sender=Issue)
+def index_issue_text(sender, instance, created, update_fields=None, raw=False, **kwargs):
+
+    if raw:
+        return
+
+    if update_fields is not None and not (
+        {"title", "description"} & set(update_fields)
+    ):
+        return
+
+    duplicate_detection.index_issue(instance)
+
+
+# =========================================================
+# Map cluster aggregates
+# =========================================================
+@receiver(issues_changed)
+def update_cluster_cells(sender, changes, **kwargs):
+    clustering.apply_changes(changes)
+
+
+# =========================================================
+# Open issue heatmap
+# =========================================================
+@receiver(issues_changed)
+def update_heat_cells(sender, changes, **kwargs):
+    heatmap.apply_changes(changes)
+
+
+# =========================================================
+# Provider queue cache
+# =========================================================
+def _invalidate_queues_on_commit(professions):
+
+    professions = {profession for profession in professions if profession}
+
+    if professions:
+        transaction.on_commit(lambda: queue_cache.invalidate(professions))
+
+
+@receiver(issues_changed)
+def invalidate_queues_on_change(sender, changes, **kwargs):
+    # creates, claims, status/category changes, deletes, archival
+    _invalidate_queues_on_commit(
+        state["category"]
+        for before, after in changes
+        for state in (before, after)
+        if state and state["status"] == "pending"
+    )
+
+
+@receiver(post_save, sender=Issue)
+def invalidate_queue_on_edit(sender, instance, created, raw=False, **kwargs):
+    # content edits of queued issues don't change the tracked state
+    if not raw and not created and instance.status == "pending":
+        _invalidate_queues_on_commit([instance.category])
+
+
+# =========================================================
+# Provider indexes (KD-tree + coverage cells)
+# =========================================================
+def _provider_state(user):
+    # to_python: a float latitude must compare equal to the stored Decimal
+    return {
+        field: user._meta.get_field(field).to_python(getattr(user, field))
+        for field in provider_index.INDEXED_FIELDS
+    }
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_provider_state(sender, instance, update_fields=None, raw=False, **kwargs):
+
+    instance._previous_provider_state = None
+
+    if raw or instance._state.adding:
+        return
+
+    # e.g. update_last_login() only touches last_login
+    if update_fields is not None and not (
+        provider_index.INDEXED_FIELDS & set(update_fields)
+    ):
+        instance._previous_provider_state = _provider_state(instance)
+        return
+
+    instance._previous_provider_state = (
+        sender.objects.filter(pk=instance.pk)
+        .values(*provider_index.INDEXED_FIELDS)
+        .first()
+    )
+
+
+def _invalidate_provider_indexes_on_commit(states):
+
+    # only providers are indexed; a role change reaches the old profession
+    professions = {
+        state["profession"]
+        for state in states
+        if state and state["role"] == "provider" and state["profession"]
+    }
+
+    if professions:
+        transaction.on_commit(lambda: provider_index.invalidate(professions))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def update_provider_indexes_on_save(sender, instance, created, raw=False, **kwargs):
+
+    if raw:
+        return
+
+    before = instance.__dict__.pop("_previous_provider_state", None)
+    after = _provider_state(instance)
+
+    if before == after:
+        return
+
+    if created and instance.role != "provider":
+        return
+
+    _invalidate_provider_indexes_on_commit([before, after])
+    provider_coverage.update_provider(instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_provider_index_on_delete(sender, instance, **kwargs):
+    # coverage rows go with the user through the FK cascade
+    _invalidate_provider_indexes_on_commit([_provider_state(instance)])
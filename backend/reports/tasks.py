@@ -0,0 +1,57 @@
+from celery import shared_task
+
+from .services import archival, bulk_actions, categorization
+
+
+# idempotent tasks: safe to retry and to re-deliver after a worker crash
+RETRY_OPTIONS = {
+    "acks_late": True,
+    "autoretry_for": (Exception,),
+    "retry_backoff": True,
+    "max_retries": 5,
+}
+
+
+@shared_task(acks_late=True)
+def run_bulk_action_job(job_id):
+    """
+    Apply a queued admin bulk action in chunks.
+    """
+
+    job = bulk_actions.run_job(job_id)
+
+    return {"job": job.pk, "updated": job.updated}
+
+
+@shared_task
+def archive_closed_issues():
+    """
+    Periodic (celery beat): move long-closed issues to the archive.
+    """
+
+    return {"archived": archival.archive_closed_issues()}
+
+
+@shared_task(**RETRY_OPTIONS)
+def categorize_pending_issues():
+    """
+    Micro-batch: predict the category of every issue created without
+    one, then hand them to auto_assign_issues. Also run periodically
+    (celery beat) to sweep up issues whose batch was lost.
+    """
+
+    issue_ids = categorization.categorize_pending_issues()
+
+    if issue_ids:
+        auto_assign_issues.delay(issue_ids)
+
+    return {"categorized": len(issue_ids)}
+
+
+@shared_task(**RETRY_OPTIONS)
+def auto_assign_issues(issue_ids):
+    """
+    Assign new issues to the nearest covering provider.
+    """
+
+    return {"assigned": categorization.assign_issues(issue_ids)}
@@ -1,3 +1,1811 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from importlib import import_module
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import joblib
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from ml import predict, prediction_cache
+
+from . import clustering, geo, tasks, views
+from .models import (
+    ArchivedIssue,
+    FlagReport,
+    Issue,
+    IssueClusterCell,
+    IssueHeatCell,
+    IssuePhoto,
+    ProviderCoverageCell,
+)
+from .pagination import KeysetPagination
+from .services import (
+    archival,
+    bulk_actions,
+    categorization,
+    duplicate_detection,
+    provider_index,
+    queue_cache,
+    workflow,
+)
+from .services.likes import reconcile_like_counts, toggle_like
+
+
+User = get_user_model()
+
+
+# =========================================================
+# Helpers
+# =========================================================
+class IssueTestCase(TestCase):
+
+    def setUp(self):
+
+        self.consumer = User.objects.create_user(
+            username="citizen",
+            password="pass12345",
+            role="consumer",
+        )
+
+        self.provider = User.objects.create_user(
+            username="crew",
+            password="pass12345",
+            role="provider",
+            profession="road",
+            latitude=Decimal("28.613900"),
+            longitude=Decimal("77.209000"),
+        )
+
+        self.consumer_client = APIClient()
+        self.consumer_client.force_authenticate(self.consumer)
+
+        self.provider_client = APIClient()
+        self.provider_client.force_authenticate(self.provider)
+
+    def make_issue(self, **kwargs):
+
+        fields = {
+            "title": "Pothole",
+            "description": "Deep pothole on the main road",
+            "category": "road",
+            "latitude": Decimal("28.614000"),
+            "longitude": Decimal("77.209100"),
+            "reported_by": self.consumer,
+        }
+        fields.update(kwargs)
+
+        return Issue.objects.create(**fields)
+
+    def make_issues(self, count, **kwargs):
+
+        issues = [self.make_issue(**kwargs) for _ in range(count)]
+
+        for issue in issues:
+            toggle_like(issue.pk, self.consumer.pk)
+            IssuePhoto.objects.create(issue=issue, image="issue_photos/extra/x.jpg")
+
+        return issues
+
+
+# =========================================================
+# Grid cells + bounding boxes (no database)
+# =========================================================
+def q_matches(query, latitude, longitude):
+    """
+    Evaluate a geo Q object against one coordinate.
+    """
+
+    values = {"latitude": latitude, "longitude": longitude}
+    results = []
+
+    for child in query.children:
+
+        if isinstance(child, Q):
+            results.append(q_matches(child, latitude, longitude))
+            continue
+
+        lookup, bound = child
+        field, op = lookup.split("__")
+        value = values[field]
+
+        results.append({
+            "range": lambda: bound[0] <= value <= bound[1],
+            "gte": lambda: value >= bound,
+            "lte": lambda: value <= bound,
+            "isnull": lambda: (value is None) == bound,
+        }[op]())
+
+    matched = any(results) if query.connector == Q.OR else all(results)
+
+    return not matched if query.negated else matched
+
+
+class GeoGridTests(SimpleTestCase):
+
+    def assertCovered(self, ranges, lat, lon, covered=True):
+
+        cell = geo.grid_cell(lat, lon)
+
+        self.assertEqual(
+            any(low <= cell <= high for low, high in ranges),
+            covered,
+            f"cell of ({lat}, {lon})",
+        )
+
+    def test_antimeridian(self):
+
+        ranges = geo.grid_cell_ranges(0, 179.99, 5)
+
+        self.assertCovered(ranges, 0, 179.99)
+        self.assertCovered(ranges, 0.02, -179.98)
+        self.assertCovered(ranges, 0, 0, covered=False)
+        self.assertCovered(ranges, 0, 179.5, covered=False)
+
+        query = geo.bounding_box_filter(0, 179.99, 5)
+
+        self.assertTrue(q_matches(query, 0, 179.99))
+        self.assertTrue(q_matches(query, 0.02, -179.98))
+        self.assertFalse(q_matches(query, 0, 0))
+        self.assertFalse(q_matches(query, 0, -179.5))
+
+        query = geo.bounding_box_filter(0, -179.99, 5)
+
+        self.assertTrue(q_matches(query, 0, 179.98))
+        self.assertFalse(q_matches(query, 0, 179.5))
+
+    def test_near_pole_spans_every_longitude(self):
+
+        ranges = geo.grid_cell_ranges(89.99, 0, 5)
+
+        for lon in (-179.99, -90, 0, 90, 179.99):
+            self.assertCovered(ranges, 89.97, lon)
+
+        self.assertCovered(ranges, 89.9, 0, covered=False)
+
+        query = geo.bounding_box_filter(89.99, 0, 5)
+
+        self.assertTrue(q_matches(query, 89.98, 120))
+        self.assertTrue(q_matches(query, 89.98, -179))
+        self.assertFalse(q_matches(query, 89.9, 0))
+        self.assertFalse(q_matches(query, 89.98, None))
+
+
+# =========================================================
+# Map clusters
+# =========================================================
+class IssueClusterTests(IssueTestCase):
+
+    url = "/api/v1/reports/clusters/"
+
+    def test_rejects_bad_bbox_and_zoom(self):
+
+        for params in (
+            {"zoom": 5},
+            {"bbox": "1,2,3", "zoom": 5},
+            {"bbox": "-inf,0,10,10", "zoom": 5},
+            {"bbox": "nan,0,10,10", "zoom": 5},
+            {"bbox": "0,-91,10,10", "zoom": 5},
+            {"bbox": "0,0,181,10", "zoom": 5},
+            {"bbox": "0,10,10,0", "zoom": 5},
+            {"bbox": "0,0,10,10", "zoom": "inf"},
+        ):
+            response = self.consumer_client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def counts(self, zoom):
+        return {
+            (x, y, status): count
+            for x, y, status, count in IssueClusterCell.objects.filter(
+                zoom=zoom,
+            ).exclude(count=0).values_list("cell_x", "cell_y", "status", "count")
+        }
+
+    def snapshot(self):
+        return {
+            (cell.zoom, cell.cell_x, cell.cell_y, cell.status, cell.category): (
+                cell.count, round(cell.lat_sum, 6), round(cell.lon_sum, 6),
+            )
+            for cell in IssueClusterCell.objects.exclude(count=0)
+        }
+
+    def test_counts_follow_create_status_change_delete_and_archive(self):
+
+        first = self.make_issue()
+        second = self.make_issue(
+            latitude=Decimal("19.076000"), longitude=Decimal("72.877700"),
+        )
+
+        delhi = clustering.cell_for(first.latitude, first.longitude, 12)
+        mumbai = clustering.cell_for(second.latitude, second.longitude, 12)
+
+        self.assertEqual(
+            self.counts(12),
+            {(*delhi, "pending"): 1, (*mumbai, "pending"): 1},
+        )
+
+        workflow.apply_transition(first.pk, self.provider, workflow.CLAIM)
+        self.assertEqual(
+            self.counts(12),
+            {(*delhi, "assigned"): 1, (*mumbai, "pending"): 1},
+        )
+
+        second.delete()
+        self.assertEqual(self.counts(12), {(*delhi, "assigned"): 1})
+
+        first.refresh_from_db()
+        first.status = "resolved"
+        first.save()
+        self.assertEqual(self.counts(12), {(*delhi, "resolved"): 1})
+
+        archival.archive_batch([first.pk])
+
+        for zoom in clustering.CLUSTER_ZOOM_LEVELS:
+            self.assertEqual(self.counts(zoom), {}, zoom)
+
+    def test_backfill_matches_incremental_counts(self):
+
+        self.make_issue()
+        self.make_issue(status="resolved", category="water")
+        self.make_issue(latitude=Decimal("-33.868800"), longitude=Decimal("151.209300"))
+
+        incremental = self.snapshot()
+        IssueClusterCell.objects.all().delete()
+
+        import_module("reports.migrations.0014_issueclustercell").build_clusters(apps, None)
+
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_bbox_returns_counts_and_centroids(self):
+
+        self.make_issue(latitude=Decimal("28.614000"), longitude=Decimal("77.209000"))
+        self.make_issue(latitude=Decimal("28.616000"), longitude=Decimal("77.211000"))
+        self.make_issue(latitude=Decimal("19.076000"), longitude=Decimal("72.877700"))
+
+        response = self.consumer_client.get(
+            self.url, {"bbox": "77,28,78,29", "zoom": 10},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        [cluster] = response.data["clusters"]
+        self.assertEqual(cluster["count"], 2)
+        self.assertEqual(cluster["by_status"], {"pending": 2})
+        self.assertAlmostEqual(cluster["latitude"], 28.615)
+        self.assertAlmostEqual(cluster["longitude"], 77.21)
+
+    def test_bbox_crossing_the_antimeridian(self):
+
+        self.make_issue(latitude=Decimal("0.500000"), longitude=Decimal("179.500000"))
+        self.make_issue(latitude=Decimal("0.500000"), longitude=Decimal("-179.500000"))
+
+        crossing = self.consumer_client.get(
+            self.url, {"bbox": "179,0,-179,1", "zoom": 8},
+        )
+        self.assertEqual(
+            sum(cluster["count"] for cluster in crossing.data["clusters"]), 2,
+        )
+
+        # the same edges read west to east cover everything but the seam
+        inside = self.consumer_client.get(
+            self.url, {"bbox": "-179,0,179,1", "zoom": 8},
+        )
+        self.assertEqual(inside.data["clusters"], [])
+
+    def test_zoom_is_clamped(self):
+
+        self.make_issue()
+
+        for zoom, level in ((99, clustering.MAX_CLUSTER_ZOOM), (-5, 0)):
+            response = self.consumer_client.get(
+                self.url, {"bbox": "77.2,28.6,77.22,28.62", "zoom": zoom},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.data["clusters"][0]["cell"].startswith(f"{level}/"))
+
+        # too many cells at the deepest zoom
+        response = self.consumer_client.get(
+            self.url, {"bbox": "-180,-85,180,85", "zoom": 16},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+# =========================================================
+# Provider coverage
+# =========================================================
+class IssueProvidersTests(IssueTestCase):
+
+    url = "/api/v1/reports/coverage/"
+
+    def test_rejects_bad_coordinates(self):
+
+        for lat, lon in (
+            ("nan", "77.2"),
+            ("inf", "77.2"),
+            ("28.6", "-inf"),
+            ("91", "77.2"),
+            ("28.6", "181"),
+            ("north", "77.2"),
+        ):
+            response = self.consumer_client.get(
+                self.url, {"lat": lat, "lon": lon, "category": "road"}
+            )
+            self.assertEqual(response.status_code, 400, (lat, lon))
+
+    def coverage(self, provider):
+        return set(
+            ProviderCoverageCell.objects.filter(provider=provider)
+            .values_list("grid_cell", flat=True)
+        )
+
+    def covering(self, provider):
+        return set(geo.grid_cells_covering(
+            provider.latitude, provider.longitude, provider.service_radius_km,
+        ))
+
+    def provider_ids(self, **params):
+        response = self.consumer_client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [provider["id"] for provider in response.data["providers"]]
+
+    def test_cells_follow_create_move_deactivate_and_delete(self):
+
+        self.assertEqual(self.coverage(self.provider), self.covering(self.provider))
+        self.assertEqual(self.coverage(self.consumer), set())
+
+        self.provider.latitude = Decimal("19.076000")
+        self.provider.longitude = Decimal("72.877700")
+        self.provider.save()
+        self.assertEqual(self.coverage(self.provider), self.covering(self.provider))
+
+        self.provider.service_radius_km = 30
+        self.provider.save()
+        self.assertEqual(self.coverage(self.provider), self.covering(self.provider))
+
+        self.provider.is_active = False
+        self.provider.save()
+        self.assertEqual(self.coverage(self.provider), set())
+
+        self.provider.is_active = True
+        self.provider.save()
+        self.assertEqual(self.coverage(self.provider), self.covering(self.provider))
+
+        self.provider.delete()
+        self.assertFalse(ProviderCoverageCell.objects.exists())
+
+    def test_backfill_matches_incremental_cells(self):
+
+        User.objects.create_user(
+            username="plumber", password="pass12345",
+            role="provider", profession="water",
+            latitude=Decimal("19.076000"), longitude=Decimal("72.877700"),
+        )
+
+        incremental = set(ProviderCoverageCell.objects.values_list(
+            "grid_cell", "profession", "provider_id",
+        ))
+        ProviderCoverageCell.objects.all().delete()
+
+        import_module("reports.migrations.0015_providercoveragecell").build_coverage(apps, None)
+
+        self.assertEqual(
+            set(ProviderCoverageCell.objects.values_list(
+                "grid_cell", "profession", "provider_id",
+            )),
+            incremental,
+        )
+
+    def test_lists_providers_covering_a_point(self):
+
+        issue = self.make_issue()
+
+        self.assertEqual(self.provider_ids(issue=issue.pk), [self.provider.pk])
+        self.assertEqual(
+            self.provider_ids(lat="28.62", lon="77.21", category="road"),
+            [self.provider.pk],
+        )
+
+        # ~11.6 km to the north-east: a covered cell, outside the 10 km radius
+        self.assertEqual(self.provider_ids(lat="28.69", lon="77.29", category="road"), [])
+        self.assertEqual(self.provider_ids(lat="28.62", lon="77.21", category="water"), [])
+
+    def test_coverage_across_the_antimeridian(self):
+
+        islander = User.objects.create_user(
+            username="islander", password="pass12345",
+            role="provider", profession="road",
+            latitude=Decimal("0.010000"), longitude=Decimal("179.990000"),
+        )
+
+        self.assertEqual(
+            self.provider_ids(lat="0.02", lon="-179.98", category="road"),
+            [islander.pk],
+        )
+        self.assertEqual(self.provider_ids(lat="0", lon="-179.5", category="road"), [])
+
+
+# =========================================================
+# Heatmap
+# =========================================================
+class IssueHeatmapTests(IssueTestCase):
+
+    url = "/api/v1/reports/heatmap/"
+
+    def test_rejects_bad_bbox(self):
+
+        for params in (
+            {},
+            {"bbox": "0,0,10"},
+            {"bbox": "0,0,inf,10"},
+            {"bbox": "0,nan,10,10"},
+            {"bbox": "-181,0,10,10"},
+            {"bbox": "0,0,10,91"},
+            {"bbox": "0,10,10,0"},
+        ):
+            response = self.consumer_client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def counts(self):
+        return dict(
+            ((cell, category), count)
+            for cell, category, count in IssueHeatCell.objects.exclude(
+                open_count=0,
+            ).values_list("grid_cell", "category", "open_count")
+        )
+
+    def test_counts_follow_create_status_change_delete_and_archive(self):
+
+        first = self.make_issue()
+        second = self.make_issue(category="water")
+        cell = geo.grid_cell(first.latitude, first.longitude)
+
+        self.assertEqual(self.counts(), {(cell, "road"): 1, (cell, "water"): 1})
+
+        # still open once claimed
+        workflow.apply_transition(first.pk, self.provider, workflow.CLAIM)
+        self.assertEqual(self.counts(), {(cell, "road"): 1, (cell, "water"): 1})
+
+        second.latitude = Decimal("19.076000")
+        second.longitude = Decimal("72.877700")
+        second.save()
+        self.assertEqual(self.counts(), {
+            (cell, "road"): 1,
+            (geo.grid_cell(second.latitude, second.longitude), "water"): 1,
+        })
+
+        second.delete()
+        self.assertEqual(self.counts(), {(cell, "road"): 1})
+
+        first.refresh_from_db()
+        first.status = "resolved"
+        first.save()
+        self.assertEqual(self.counts(), {})
+
+        # closed issues were already subtracted
+        archival.archive_batch([first.pk])
+        self.assertEqual(self.counts(), {})
+        self.assertFalse(IssueHeatCell.objects.filter(open_count__lt=0).exists())
+
+    def test_backfill_matches_incremental_counts(self):
+
+        self.make_issue()
+        self.make_issue(category="water")
+        self.make_issue(status="resolved")
+        self.make_issue(latitude=Decimal("-33.868800"), longitude=Decimal("151.209300"))
+
+        incremental = self.counts()
+        IssueHeatCell.objects.all().delete()
+
+        import_module("reports.migrations.0017_issueheatcell").build_heatmap(apps, None)
+
+        self.assertEqual(self.counts(), incremental)
+
+    def test_bbox_returns_open_counts_per_cell(self):
+
+        self.make_issue()
+        self.make_issue(category="water")
+        self.make_issue(status="rejected")
+        self.make_issue(latitude=Decimal("19.076000"), longitude=Decimal("72.877700"))
+
+        response = self.consumer_client.get(self.url, {"bbox": "77,28,78,29"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["cell_size_deg"], geo.GRID_CELL_DEG)
+        [cell] = response.data["cells"]
+        self.assertEqual(cell["total"], 2)
+        self.assertEqual(cell["by_category"], {"road": 1, "water": 1})
+
+        response = self.consumer_client.get(
+            self.url, {"bbox": "77,28,78,29", "category": "water"},
+        )
+        self.assertEqual(response.data["cells"][0]["by_category"], {"water": 1})
+
+    def test_bbox_crossing_the_antimeridian(self):
+
+        self.make_issue(latitude=Decimal("0.475000"), longitude=Decimal("179.500000"))
+        self.make_issue(latitude=Decimal("0.475000"), longitude=Decimal("-179.500000"))
+
+        # one grid row, so the west-to-east box stays under MAX_HEATMAP_CELLS
+        crossing = self.consumer_client.get(self.url, {"bbox": "179,0.46,-179,0.49"})
+        self.assertEqual(len(crossing.data["cells"]), 2)
+
+        inside = self.consumer_client.get(self.url, {"bbox": "-179,0.46,179,0.49"})
+        self.assertEqual(inside.data["cells"], [])
+
+    def test_rejects_oversized_bbox(self):
+
+        response = self.consumer_client.get(self.url, {"bbox": "-180,-90,180,90"})
+        self.assertEqual(response.status_code, 400)
+
+
+# =========================================================
+# Keyset cursors
+# =========================================================
+class KeysetCursorTests(TestCase):
+
+    def setUp(self):
+
+        reporter = User.objects.create_user(
+            username="citizen",
+            password="pass12345",
+            role="consumer",
+        )
+
+        self.issues = [
+            Issue.objects.create(
+                title="Pothole",
+                description="Deep pothole on the main road",
+                category="road",
+                latitude=Decimal("28.614000"),
+                longitude=Decimal("77.209100"),
+                reported_by=reporter,
+            )
+            for _ in range(5)
+        ]
+
+        # every row shares one created_at, so only the id breaks ties
+        Issue.objects.update(created_at=timezone.now())
+
+        self.factory = APIRequestFactory()
+
+    def paginate(self, cursor=None):
+
+        params = {"page_size": 2}
+
+        if cursor:
+            params["cursor"] = cursor
+
+        paginator = KeysetPagination()
+        request = Request(self.factory.get("/issues/", params))
+
+        ids = [row.pk for row in paginator.paginate_queryset(Issue.objects.all(), request)]
+
+        def cursor_of(link):
+            return link and parse_qs(urlparse(link).query).get("cursor", [None])[0]
+
+        return (
+            ids,
+            cursor_of(paginator.get_next_link()),
+            cursor_of(paginator.get_previous_link()),
+        )
+
+    def test_cursor_round_trip(self):
+
+        paginator = KeysetPagination()
+        row = Issue.objects.get(pk=self.issues[2].pk)
+
+        for reverse in (False, True):
+
+            request = Request(self.factory.get(
+                "/issues/", {"cursor": paginator.encode_cursor(row, reverse)}
+            ))
+
+            self.assertEqual(
+                paginator.decode_cursor(request),
+                (row.created_at, row.pk, reverse),
+            )
+
+    def test_pages_with_tied_created_at(self):
+
+        expected = sorted((issue.pk for issue in self.issues), reverse=True)
+
+        first, second_cursor, _ = self.paginate()
+        second, third_cursor, _ = self.paginate(second_cursor)
+        third, end, previous_cursor = self.paginate(third_cursor)
+
+        self.assertEqual([first, second, third], [expected[0:2], expected[2:4], expected[4:]])
+        self.assertIsNone(end)
+
+        # and back again from the last page
+        ids, _, first_cursor = self.paginate(previous_cursor)
+        self.assertEqual(ids, expected[2:4])
+
+        self.assertEqual(self.paginate(first_cursor)[0], expected[0:2])
+
+
+# =========================================================
+# Query counts (no N+1 on list endpoints)
+# =========================================================
+class IssueListQueryCountTests(IssueTestCase):
+
+    def assert_constant_queries(self, client, url, expected, **issue_kwargs):
+
+        self.make_issues(1, **issue_kwargs)
+
+        # measure the uncached path of the provider queue
+        cache.clear()
+
+        with self.assertNumQueries(expected):
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        self.make_issues(9, **issue_kwargs)
+        cache.clear()
+
+        with self.assertNumQueries(expected):
+            response = client.get(url)
+
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_consumer_list(self):
+
+        # issues (with like count) + photos + archived issues
+        self.assert_constant_queries(
+            self.consumer_client,
+            "/api/v1/reports/consumer/issues/",
+            3,
+        )
+
+    def test_consumer_list_reports_likes_and_photos(self):
+
+        self.make_issues(2)
+
+        response = self.consumer_client.get("/api/v1/reports/consumer/issues/")
+
+        for row in response.data["results"]:
+            self.assertEqual(row["likes_count"], 1)
+            self.assertEqual(len(row["photos"]), 1)
+            self.assertEqual(row["reporter_name"], "citizen")
+
+    def test_provider_queue(self):
+
+        self.assert_constant_queries(
+            self.provider_client,
+            "/api/v1/reports/provider/issues/",
+            1,
+        )
+
+    def test_provider_my_issues(self):
+
+        # ETag aggregates + issues + archived issues
+        self.assert_constant_queries(
+            self.provider_client,
+            "/api/v1/reports/provider/issues/my-issues/",
+            4,
+            assigned_provider=self.provider,
+            status="assigned",
+        )
+
+
+# =========================================================
+# Like counter
+# =========================================================
+class LikeCountTests(IssueTestCase):
+
+    def like(self, client, issue):
+        response = client.post(f"/api/v1/reports/consumer/issues/{issue.pk}/like/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_like_then_unlike(self):
+
+        issue = self.make_issue()
+        neighbour = User.objects.create_user(
+            username="neighbour", password="pass12345", role="consumer",
+        )
+
+        self.assertEqual(self.like(self.consumer_client, issue), {"liked": True, "likes_count": 1})
+        self.assertEqual(toggle_like(issue.pk, neighbour.pk), (True, 2))
+        self.assertEqual(self.like(self.consumer_client, issue), {"liked": False, "likes_count": 1})
+
+        issue.refresh_from_db()
+        self.assertEqual(issue.likes_count, 1)
+        self.assertEqual(list(issue.likes.all()), [neighbour])
+
+    def test_repeated_toggles_match_the_through_table(self):
+
+        issue = self.make_issue()
+
+        for expected in (True, False, True, False, True):
+            liked, likes_count = toggle_like(issue.pk, self.consumer.pk)
+            self.assertEqual(liked, expected)
+            self.assertEqual(likes_count, issue.likes.count())
+
+        issue.refresh_from_db()
+        self.assertEqual(issue.likes_count, 1)
+
+    def test_reconcile_repairs_drifted_counts(self):
+
+        drifted, accurate = self.make_issue(), self.make_issue()
+        toggle_like(drifted.pk, self.consumer.pk)
+        toggle_like(accurate.pk, self.consumer.pk)
+
+        Issue.objects.filter(pk=drifted.pk).update(likes_count=7)
+
+        self.assertEqual(reconcile_like_counts(), 1)
+        self.assertEqual(
+            dict(Issue.objects.values_list("pk", "likes_count")),
+            {drifted.pk: 1, accurate.pk: 1},
+        )
+        self.assertEqual(reconcile_like_counts(), 0)
+
+
+# =========================================================
+# Radius search (?lat=&lon=&radius=)
+# =========================================================
+class RadiusSearchTests(IssueTestCase):
+
+    def test_nearby_clamps_large_radius(self):
+
+        near = self.make_issue()
+        # ~55 km and ~155 km north
+        middle = self.make_issue(latitude=Decimal("29.110000"))
+        self.make_issue(latitude=Decimal("30.010000"))
+
+        response = self.provider_client.get(
+            "/api/v1/reports/provider/issues/nearby/",
+            {"lat": "28.6139", "lon": "77.209", "radius": "500"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data], [near.pk, middle.pk])
+
+    def test_rejects_non_positive_radius(self):
+
+        response = self.provider_client.get(
+            "/api/v1/reports/provider/issues/nearby/",
+            {"lat": "28.6139", "lon": "77.209", "radius": "0"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+# =========================================================
+# Full-text search (?q=)
+# =========================================================
+class IssueSearchTests(IssueTestCase):
+
+    def test_consumer_search_ranks_title_matches_first(self):
+
+        in_title = self.make_issue(title="Broken streetlight", description="Dark at night")
+        in_body = self.make_issue(title="Dark corner", description="The streetlight is broken")
+        self.make_issue(title="Pothole", description="Deep hole")
+
+        response = self.consumer_client.get(
+            "/api/v1/reports/consumer/issues/", {"q": "streetlights"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["id"] for row in response.data],
+            [in_title.pk, in_body.pk],
+        )
+
+    def test_admin_search_ranks_text_and_matches_partial_usernames(self):
+
+        in_title = self.make_issue(title="Broken streetlight", description="Dark at night")
+        in_body = self.make_issue(title="Dark corner", description="The streetlight is broken")
+        by_watcher = self.make_issue(
+            title="Pothole",
+            description="Deep hole",
+            reported_by=User.objects.create_user(
+                username="roadwatcher", password="pass12345", role="consumer",
+            ),
+        )
+
+        self.client.force_login(User.objects.create_superuser(
+            username="admin", password="pass12345",
+        ))
+
+        def changelist(q):
+            response = self.client.get("/superadmin/reports/issue/", {"q": q})
+            self.assertEqual(response.status_code, 200)
+            return [issue.pk for issue in response.context["cl"].result_list]
+
+        self.assertEqual(changelist("streetlights"), [in_title.pk, in_body.pk])
+        self.assertEqual(changelist("WATCH"), [by_watcher.pk])
+
+    def test_provider_queue_and_my_issues_search(self):
+
+        queued = self.make_issue(title="Pothole near school")
+        self.make_issue(title="Cracked pavement", description="Uneven slabs")
+        mine = self.make_issue(
+            title="Pothole by the market",
+            assigned_provider=self.provider,
+            status="assigned",
+        )
+
+        response = self.provider_client.get(
+            "/api/v1/reports/provider/issues/", {"q": "pothole"}
+        )
+        self.assertEqual([row["id"] for row in response.data], [queued.pk])
+
+        response = self.provider_client.get(
+            "/api/v1/reports/provider/issues/my-issues/", {"q": "pothole -school"}
+        )
+        self.assertEqual([row["id"] for row in response.data], [mine.pk])
+
+    def test_search_includes_archived_issues(self):
+
+        live = self.make_issue(
+            title="Pothole by the market",
+            assigned_provider=self.provider,
+            status="assigned",
+        )
+        old = self.make_issue(
+            title="Pothole near the bridge",
+            description="Patched twice already",
+            assigned_provider=self.provider,
+            status="resolved",
+        )
+        self.make_issue(
+            title="Overflowing drain",
+            description="Water across the lane",
+            assigned_provider=self.provider,
+            status="resolved",
+        )
+
+        Issue.objects.exclude(pk=live.pk).update(
+            updated_at=timezone.now() - timedelta(days=400),
+        )
+        archival.archive_closed_issues()
+
+        response = self.provider_client.get(
+            "/api/v1/reports/provider/issues/my-issues/", {"q": "pothole"}
+        )
+        self.assertEqual(
+            sorted(row["id"] for row in response.data), sorted([live.pk, old.pk])
+        )
+
+        # archived descriptions are searched too
+        response = self.provider_client.get(
+            "/api/v1/reports/provider/issues/my-issues/", {"q": "patched"}
+        )
+        self.assertEqual([row["id"] for row in response.data], [old.pk])
+
+        response = self.consumer_client.get(
+            "/api/v1/reports/consumer/issues/", {"q": "bridge"}
+        )
+        self.assertEqual([row["id"] for row in response.data], [old.pk])
+
+    def test_search_vector_follows_updates(self):
+
+        issue = self.make_issue(title="Pothole")
+
+        Issue.objects.filter(pk=issue.pk).update(title="Flooded underpass")
+
+        response = self.consumer_client.get(
+            "/api/v1/reports/consumer/issues/", {"q": "flood"}
+        )
+        self.assertEqual([row["id"] for row in response.data], [issue.pk])
+
+
+# =========================================================
+# Provider queue cache
+# =========================================================
+class ProviderQueueCacheTests(IssueTestCase):
+
+    url = "/api/v1/reports/provider/issues/"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def queue_ids(self):
+        return [row["id"] for row in self.provider_client.get(self.url).data["results"]]
+
+    def test_second_poll_is_served_from_cache(self):
+
+        issue = self.make_issue()
+
+        self.assertEqual(self.queue_ids(), [issue.pk])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.queue_ids(), [issue.pk])
+
+        self.assertEqual(queue_cache.stats()["hits"], 1)
+        self.assertEqual(queue_cache.stats()["misses"], 1)
+
+    def test_create_claim_and_edit_invalidate(self):
+
+        first = self.make_issue()
+        self.assertEqual(self.queue_ids(), [first.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second = self.make_issue()
+        self.assertEqual(self.queue_ids(), [second.pk, first.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider_client.post(f"{self.url}{second.pk}/claim/")
+        self.assertEqual(self.queue_ids(), [first.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.title = "Crater"
+            first.save()
+        self.assertEqual(
+            self.provider_client.get(self.url).data["results"][0]["title"],
+            "Crater",
+        )
+
+    def test_other_professions_keep_their_cache(self):
+
+        self.make_issue()
+        self.queue_ids()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.make_issue(category="water")
+
+        with self.assertNumQueries(0):
+            self.queue_ids()
+
+    def test_evicted_version_does_not_revive_old_pages(self):
+
+        first = self.make_issue()
+        self.assertEqual(self.queue_ids(), [first.pk])
+
+        # the version key is evicted while the page it points to survives
+        cache.delete("provider-queue:road:version")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second = self.make_issue()
+        self.assertEqual(self.queue_ids(), [second.pk, first.pk])
+
+    def test_metrics_are_staff_only(self):
+
+        self.queue_ids()
+
+        self.assertEqual(self.provider_client.get("/health/queue-cache/").status_code, 403)
+
+        self.provider.is_staff = True
+        response = self.provider_client.get("/health/queue-cache/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["misses"], 1)
+
+
+# =========================================================
+# Conditional GET (ETag / Last-Modified)
+# =========================================================
+class ConditionalGetTests(IssueTestCase):
+
+    my_issues_url = "/api/v1/reports/provider/issues/my-issues/"
+    nearby_url = "/api/v1/reports/provider/issues/nearby/?lat=28.6139&lon=77.209"
+
+    def revalidate(self, client, url, response, expected_queries):
+
+        with self.assertNumQueries(expected_queries):
+            again = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        return again
+
+    def test_unchanged_collections_answer_304(self):
+
+        self.make_issue(assigned_provider=self.provider, status="assigned")
+        self.make_issue()
+
+        # one aggregate per table, no page query or serialization
+        for url, queries in ((self.my_issues_url, 2), (self.nearby_url, 1)):
+
+            response = self.provider_client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("Last-Modified", response)
+
+            again = self.revalidate(self.provider_client, url, response, queries)
+
+            self.assertEqual(again.status_code, 304)
+            self.assertEqual(again["ETag"], response["ETag"])
+
+    def test_changes_invalidate_etag(self):
+
+        queued = self.make_issue()
+
+        response = self.provider_client.get(self.nearby_url)
+
+        self.provider_client.post(f"/api/v1/reports/provider/issues/{queued.pk}/claim/")
+
+        self.assertEqual(
+            self.provider_client.get(
+                self.nearby_url, HTTP_IF_NONE_MATCH=response["ETag"],
+            ).status_code,
+            200,
+        )
+
+        response = self.provider_client.get(self.my_issues_url)
+
+        self.assertEqual(len(response.data["results"]), 1)
+
+        self.provider_client.post(f"/api/v1/reports/provider/issues/{queued.pk}/start/")
+
+        self.assertEqual(
+            self.provider_client.get(
+                self.my_issues_url, HTTP_IF_NONE_MATCH=response["ETag"],
+            ).status_code,
+            200,
+        )
+
+    def test_issue_detail_and_likes(self):
+
+        issue = self.make_issue()
+        url = f"/api/v1/reports/consumer/issues/{issue.pk}/"
+
+        response = self.consumer_client.get(url)
+
+        self.assertEqual(
+            self.revalidate(self.consumer_client, url, response, 1).status_code,
+            304,
+        )
+
+        self.consumer_client.post(f"{url}like/")
+
+        again = self.consumer_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.data["likes_count"], 1)
+
+    def test_archived_issue_detail(self):
+
+        issue = self.make_issue(status="resolved")
+        archival.archive_batch([issue.pk])
+
+        url = f"/api/v1/reports/consumer/issues/{issue.pk}/"
+
+        response = self.consumer_client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.revalidate(self.consumer_client, url, response, 2).status_code,
+            304,
+        )
+
+
+# =========================================================
+# Provider workflow (claim / start / resolve)
+# =========================================================
+class ProviderWorkflowTests(IssueTestCase):
+
+    def post(self, issue, action, client=None):
+
+        client = client or self.provider_client
+
+        return client.post(f"/api/v1/reports/provider/issues/{issue.pk}/{action}/")
+
+    def test_claim_start_resolve(self):
+
+        issue = self.make_issue()
+
+        for action, expected in (
+            ("claim", "assigned"),
+            ("start", "in_progress"),
+            ("resolve", "resolved"),
+        ):
+            response = self.post(issue, action)
+
+            self.assertEqual(response.status_code, 200)
+            issue.refresh_from_db()
+            self.assertEqual(issue.status, expected)
+
+        self.assertEqual(issue.assigned_provider, self.provider)
+
+    def make_rival(self):
+
+        return User.objects.create_user(
+            username="rival", password="pass12345",
+            role="provider", profession="road",
+            latitude=Decimal("28.600000"), longitude=Decimal("77.200000"),
+        )
+
+    def test_claim_rejects_assigned_and_wrong_category(self):
+
+        assigned = self.make_issue(assigned_provider=self.make_rival(), status="assigned")
+        water = self.make_issue(category="water")
+
+        response = self.post(assigned, "claim")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["detail"], "Issue is no longer available")
+
+        self.assertEqual(self.post(water, "claim").status_code, 404)
+
+    def test_start_and_resolve_require_owner_and_order(self):
+
+        issue = self.make_issue()
+
+        self.assertEqual(self.post(issue, "resolve").status_code, 404)
+
+        self.post(issue, "claim")
+
+        self.assertEqual(self.post(issue, "resolve").status_code, 400)
+
+    def test_start_requires_assigned_status(self):
+
+        for current in ("in_progress", "resolved"):
+
+            issue = self.make_issue(assigned_provider=self.provider, status=current)
+            response = self.post(issue, "start")
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data["detail"], "Issue must be assigned")
+
+            issue.refresh_from_db()
+            self.assertEqual(issue.status, current)
+
+    def test_failures_do_not_reveal_other_providers_issues(self):
+
+        rival = self.make_rival()
+        unknown = self.provider_client.post(
+            "/api/v1/reports/provider/issues/999999/start/"
+        )
+
+        for current in ("assigned", "in_progress", "resolved"):
+
+            issue = self.make_issue(assigned_provider=rival, status=current)
+
+            for action in ("start", "resolve"):
+                response = self.post(issue, action)
+
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.data, unknown.data)
+
+    def test_unknown_issue(self):
+
+        response = self.provider_client.post(
+            "/api/v1/reports/provider/issues/999999/claim/"
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_batch_transition_reports_per_issue_results(self):
+
+        mine = [
+            self.make_issue(assigned_provider=self.provider, status="assigned")
+            for _ in range(3)
+        ]
+        pending = self.make_issue()
+
+        ids = [issue.pk for issue in mine] + [pending.pk, 999999]
+
+        # one locking read and one UPDATE regardless of batch size; the
+        # rest is savepoints and the cluster rollup upsert
+        with self.assertNumQueries(7):
+            response = self.provider_client.post(
+                "/api/v1/reports/provider/issues/batch-transition/",
+                {"ids": ids, "status": "in_progress"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(
+            [row["ok"] for row in response.data["results"]],
+            [True, True, True, False, False],
+        )
+        self.assertEqual(
+            Issue.objects.filter(status="in_progress").count(), 3,
+        )
+
+    def test_batch_transition_validates_input(self):
+
+        url = "/api/v1/reports/provider/issues/batch-transition/"
+
+        for payload in (
+            {"ids": [1], "status": "pending"},
+            {"ids": "x", "status": "resolved"},
+            {"ids": "123", "status": "resolved"},
+            {"ids": {"1": 2}, "status": "resolved"},
+            {"ids": 1, "status": "resolved"},
+            {"ids": [True], "status": "resolved"},
+            {"ids": [1.9], "status": "resolved"},
+            {"ids": ["1"], "status": "resolved"},
+            {"ids": [], "status": "resolved"},
+            {"ids": list(range(1, workflow.MAX_BATCH_SIZE + 2)), "status": "resolved"},
+            {"status": "resolved"},
+        ):
+            response = self.provider_client.post(url, payload, format="json")
+            self.assertEqual(response.status_code, 400)
+
+
+class ConcurrentClaimTests(TransactionTestCase):
+
+    CONTENDERS = 8
+
+    def test_parallel_claims_have_exactly_one_winner(self):
+
+        reporter = User.objects.create_user(
+            username="citizen", password="pass12345", role="consumer",
+        )
+
+        providers = [
+            User.objects.create_user(
+                username=f"crew{n}", password="pass12345",
+                role="provider", profession="road",
+                latitude=Decimal("28.600000"), longitude=Decimal("77.200000"),
+            )
+            for n in range(self.CONTENDERS)
+        ]
+
+        issue = Issue.objects.create(
+            title="Pothole",
+            description="Deep pothole on the main road",
+            category="road",
+            latitude=Decimal("28.614000"),
+            longitude=Decimal("77.209100"),
+            reported_by=reporter,
+        )
+
+        barrier = threading.Barrier(self.CONTENDERS)
+        results = {}
+
+        def contend(provider):
+            try:
+                barrier.wait()
+                results[provider.pk] = workflow.apply_transition(
+                    issue.pk, provider, workflow.CLAIM,
+                )
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=contend, args=(provider,))
+            for provider in providers
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        winners = [pk for pk, failure in results.items() if failure is None]
+
+        self.assertEqual(len(results), self.CONTENDERS)
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(
+            set(results.values()) - {None},
+            {workflow.UNAVAILABLE},
+        )
+
+        issue.refresh_from_db()
+        self.assertEqual(issue.assigned_provider_id, winners[0])
+        self.assertEqual(issue.status, "assigned")
+
+
+# =========================================================
+# Admin bulk actions
+# =========================================================
+class AdminBulkActionTests(IssueTestCase):
+
+    def test_assign_only_touches_unassigned_issues(self):
+
+        other = User.objects.create_user(
+            username="other", password="pass12345",
+            role="provider", profession="road",
+            latitude=Decimal("28.600000"), longitude=Decimal("77.200000"),
+        )
+
+        free = [self.make_issue() for _ in range(3)]
+        taken = self.make_issue(assigned_provider=other, status="assigned")
+
+        updated, job = bulk_actions.run_action(
+            "assign_issues",
+            Issue.objects.all(),
+            provider_id=self.provider.pk,
+        )
+
+        self.assertIsNone(job)
+        self.assertEqual(updated, 3)
+        self.assertEqual(
+            Issue.objects.filter(assigned_provider=self.provider).count(), 3,
+        )
+
+        taken.refresh_from_db()
+        self.assertEqual(taken.assigned_provider, other)
+
+        for issue in free:
+            issue.refresh_from_db()
+            self.assertEqual(issue.status, "assigned")
+
+    def test_large_selection_runs_as_chunked_job(self):
+
+        issues = [self.make_issue() for _ in range(5)]
+
+        for issue in issues:
+            FlagReport.objects.create(
+                issue=issue, reported_by=self.consumer, reason="spam",
+            )
+
+        with mock.patch.object(bulk_actions, "BULK_JOB_THRESHOLD", 2), \
+                mock.patch.object(bulk_actions, "BULK_CHUNK_SIZE", 2), \
+                mock.patch("reports.tasks.run_bulk_action_job.delay") as delay:
+
+            with self.captureOnCommitCallbacks(execute=True):
+                updated, job = bulk_actions.run_action(
+                    "mark_flags_reviewed", FlagReport.objects.all(),
+                )
+
+            delay.assert_called_once_with(job.pk)
+
+            self.assertIsNone(updated)
+            self.assertEqual(job.total, 5)
+
+            job = bulk_actions.run_job(job.pk)
+
+        self.assertEqual(job.status, "done")
+        self.assertEqual((job.processed, job.updated, job.progress), (5, 5, 100))
+        self.assertFalse(FlagReport.objects.filter(reviewed=False).exists())
+
+    def test_failed_job_resumes_without_reapplying_chunks(self):
+
+        issues = [self.make_issue() for _ in range(5)]
+
+        for issue in issues:
+            FlagReport.objects.create(
+                issue=issue, reported_by=self.consumer, reason="spam",
+            )
+
+        calls = []
+
+        def crash_after_second_update(queryset):
+            calls.append(queryset)
+            updated = bulk_actions.mark_flags_reviewed(queryset)
+
+            if len(calls) == 2:
+                raise RuntimeError("worker lost")
+
+            return updated
+
+        with mock.patch.object(bulk_actions, "BULK_JOB_THRESHOLD", 2), \
+                mock.patch.object(bulk_actions, "BULK_CHUNK_SIZE", 2), \
+                mock.patch("reports.tasks.run_bulk_action_job.delay"):
+
+            _, job = bulk_actions.run_action(
+                "mark_flags_reviewed", FlagReport.objects.all(),
+            )
+
+            with mock.patch.dict(bulk_actions.ACTIONS, {
+                "mark_flags_reviewed": (FlagReport, crash_after_second_update),
+            }):
+                with self.assertRaises(RuntimeError):
+                    bulk_actions.run_job(job.pk)
+
+            job.refresh_from_db()
+
+            # the second chunk's UPDATE rolled back with its progress
+            self.assertEqual((job.status, job.processed, job.updated), ("failed", 2, 2))
+            self.assertEqual(FlagReport.objects.filter(reviewed=True).count(), 2)
+
+            job = bulk_actions.run_job(job.pk)
+
+        self.assertEqual((job.status, job.processed, job.updated), ("done", 5, 5))
+        self.assertFalse(FlagReport.objects.filter(reviewed=False).exists())
+
+
+# =========================================================
+# Archival (hot/cold split)
+# =========================================================
+class ArchivalTests(IssueTestCase):
+
+    def make_closed_issue(self, days_ago, **kwargs):
+
+        issue = self.make_issue(
+            status="resolved",
+            assigned_provider=self.provider,
+            **kwargs,
+        )
+
+        Issue.objects.filter(pk=issue.pk).update(
+            updated_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+        return issue
+
+    def test_archives_ids_beyond_32_bits(self):
+
+        issue = self.make_closed_issue(days_ago=200, id=2**31 + 5)
+
+        self.assertEqual(archival.archive_closed_issues(days=180), 1)
+        self.assertTrue(ArchivedIssue.objects.filter(pk=issue.pk).exists())
+
+    def test_moves_old_closed_issues_with_photos_likes_and_flags(self):
+
+        old = self.make_closed_issue(days_ago=200)
+        recent = self.make_closed_issue(days_ago=5)
+        toggle_like(old.pk, self.consumer.pk)
+        IssuePhoto.objects.create(issue=old, image="issue_photos/extra/x.jpg")
+        FlagReport.objects.create(issue=old, reported_by=self.consumer, reason="spam")
+
+        self.assertEqual(archival.archive_closed_issues(days=180), 1)
+
+        self.assertFalse(Issue.objects.filter(pk=old.pk).exists())
+        self.assertTrue(Issue.objects.filter(pk=recent.pk).exists())
+        self.assertFalse(FlagReport.objects.filter(issue_id=old.pk).exists())
+
+        archived = ArchivedIssue.objects.get(pk=old.pk)
+        self.assertEqual(archived.liked_by, [self.consumer.pk])
+        self.assertEqual(archived.likes_count, 1)
+        self.assertEqual(archived.photos[0]["image"], "issue_photos/extra/x.jpg")
+        self.assertEqual(archived.flags[0]["reason"], "spam")
+
+        # map clusters no longer count the archived issue
+        self.assertEqual(
+            sum(IssueClusterCell.objects.filter(zoom=0).values_list("count", flat=True)),
+            1,
+        )
+
+    def test_history_endpoints_serve_archived_issues(self):
+
+        old = self.make_closed_issue(days_ago=200)
+        IssuePhoto.objects.create(issue=old, image="issue_photos/extra/x.jpg")
+        new = self.make_issue()
+
+        archival.archive_closed_issues(days=180)
+
+        response = self.consumer_client.get("/api/v1/reports/consumer/issues/")
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [new.pk, old.pk],
+        )
+        self.assertEqual(len(response.data["results"][1]["photos"]), 1)
+
+        response = self.consumer_client.get(f"/api/v1/reports/consumer/issues/{old.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "resolved")
+
+        response = self.provider_client.get("/api/v1/reports/provider/issues/my-issues/")
+        self.assertEqual([row["id"] for row in response.data["results"]], [old.pk])
+
+    def test_keyset_pages_merge_hot_and_archived_rows(self):
+
+        issues = [self.make_closed_issue(days_ago=200) for _ in range(3)]
+        issues += [self.make_issue() for _ in range(2)]
+
+        archival.archive_closed_issues(days=180)
+
+        seen = []
+        url = "/api/v1/reports/consumer/issues/?page_size=2"
+
+        while url:
+            response = self.consumer_client.get(url)
+            seen += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+
+        self.assertEqual(seen, [issue.pk for issue in reversed(issues)])
+
+
+# =========================================================
+# Duplicate detection
+# =========================================================
+class DuplicateDetectionTests(IssueTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.original = self.make_issue(
+            title="Huge pothole on MG road",
+            description="Deep pothole near the bus stop is damaging cars",
+        )
+
+    def test_near_duplicate_is_found(self):
+
+        # ~15 m away, reworded
+        response = self.consumer_client.post(
+            "/api/v1/reports/consumer/issues/duplicates/",
+            {
+                "title": "Huge pothole on MG road",
+                "description": "Deep pothole near the bus stop, damaging cars",
+                "latitude": "28.614100",
+                "longitude": "77.209200",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([match["id"] for match in response.data], [self.original.pk])
+        self.assertGreaterEqual(response.data[0]["similarity"], 0.5)
+
+    def test_different_text_or_distant_location_is_not_flagged(self):
+
+        self.assertEqual(
+            duplicate_detection.find_duplicates(
+                "Streetlight out",
+                "The lamp at the corner has not worked for a week",
+                28.6141,
+                77.2092,
+            ),
+            [],
+        )
+
+        # same text ~0.7 km away, outside DUPLICATE_RADIUS_KM
+        self.assertEqual(
+            duplicate_detection.find_duplicates(
+                self.original.title,
+                self.original.description,
+                28.6200,
+                77.2100,
+            ),
+            [],
+        )
+
+    def test_rejects_bad_coordinates(self):
+
+        for latitude, longitude in (
+            ("NaN", "77.2"),
+            ("28.6", "inf"),
+            ("-91", "77.2"),
+            ("28.6", "180.5"),
+            (None, "77.2"),
+        ):
+            response = self.consumer_client.post(
+                "/api/v1/reports/consumer/issues/duplicates/",
+                {"title": "Pothole", "latitude": latitude, "longitude": longitude},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 400, (latitude, longitude))
+
+
+# =========================================================
+# Provider KD-tree index
+# =========================================================
+class ProviderIndexTests(IssueTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_nearest_provider_within_radius(self):
+
+        # ~0.7 km from the provider, inside the default 10 km radius
+        provider_id, distance = provider_index.nearest_provider(
+            "road", Decimal("28.620000"), Decimal("77.210000")
+        )
+
+        self.assertEqual(provider_id, self.provider.pk)
+        self.assertAlmostEqual(distance, 0.69, places=1)
+
+    def test_points_out_of_radius_have_no_provider(self):
+
+        # ~12 km north, and another profession at the provider's doorstep
+        self.assertIsNone(provider_index.nearest_provider("road", 28.72, 77.209))
+        self.assertIsNone(provider_index.nearest_provider("water", 28.6139, 77.209))
+
+    def test_only_index_changes_bump_the_shared_version(self):
+
+        index = provider_index.get_index("road")
+        water = provider_index.current_version("water")
+
+        # last_login / full saves without index changes keep the tree
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.first_name = "Crew"
+            self.provider.save()
+
+        self.assertIs(provider_index.get_index("road"), index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provider.latitude = Decimal("28.720000")
+            self.provider.save()
+
+        self.assertIsNot(provider_index.get_index("road"), index)
+        self.assertIsNotNone(provider_index.nearest_provider("road", 28.72, 77.209))
+        self.assertEqual(provider_index.current_version("water"), water)
+
+    def test_bumps_from_other_processes_rebuild_the_tree(self):
+
+        index = provider_index.get_index("road")
+
+        # e.g. a web worker saving a provider the Celery worker has indexed
+        cache.incr("provider-index:road:version")
+
+        self.assertIsNot(provider_index.get_index("road"), index)
+
+    def test_cache_outage_does_not_fail_the_save(self):
+
+        index = provider_index.get_index("road")
+
+        with mock.patch.object(cache, "incr", side_effect=ConnectionError), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.provider.latitude = Decimal("28.720000")
+            self.provider.save()
+
+        self.provider.refresh_from_db()
+        self.assertEqual(self.provider.latitude, Decimal("28.720000"))
+        self.assertIsNot(provider_index.get_index("road"), index)
+
+
+# =========================================================
+# Categorization + auto-assignment pipeline
+# =========================================================
+class CategorizationPipelineTests(IssueTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_creation_enqueues_one_batch_per_window(self):
+
+        url = "/api/v1/reports/consumer/issues/"
+        body = {
+            "title": "Pothole",
+            "description": "Deep pothole",
+            "latitude": "28.614000",
+            "longitude": "77.209100",
+        }
+
+        with mock.patch("reports.tasks.categorize_pending_issues.apply_async") as batch, \
+                mock.patch("reports.tasks.auto_assign_issues.delay") as assign:
+
+            for _ in range(2):
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.consumer_client.post(url, body)
+
+                self.assertEqual(response.status_code, 201)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.consumer_client.post(url, {**body, "category": "water"})
+
+        batch.assert_called_once_with(countdown=categorization.CATEGORIZE_WINDOW)
+        assign.assert_called_once_with([response.data["id"]])
+
+    def test_categorize_then_assign_is_idempotent(self):
+
+        issues = [
+            self.make_issue(category=None, description="Huge potholes on the road"),
+            self.make_issue(category=None, description="Garbage is piled up near the market"),
+        ]
+
+        with mock.patch("reports.tasks.auto_assign_issues.delay") as assign:
+            tasks.categorize_pending_issues()
+
+        ids = [issue.pk for issue in issues]
+        assign.assert_called_once_with(ids)
+
+        self.assertEqual(
+            dict(Issue.objects.filter(pk__in=ids).values_list("pk", "category")),
+            {ids[0]: "road", ids[1]: "garbage"},
+        )
+        self.assertEqual(categorization.categorize_pending_issues(), [])
+
+        self.assertEqual(tasks.auto_assign_issues(ids), {"assigned": 1})
+        self.assertEqual(tasks.auto_assign_issues(ids), {"assigned": 0})
+
+        issues[0].refresh_from_db()
+        self.assertEqual(issues[0].assigned_provider, self.provider)
+        self.assertEqual(issues[0].status, "assigned")
+
+
+# =========================================================
+# ML category prediction
+# =========================================================
+class CategoryPredictionTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(predict, "_loaded", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cache.clear()
+        prediction_cache._local.clear()
+
+    def count_predictions(self):
+        return mock.patch.object(
+            predict,
+            "predict_issue_categories",
+            wraps=predict.predict_issue_categories,
+        )
+
+    def test_concurrent_first_calls_load_once(self):
+
+        real_load = joblib.load
+        barrier = threading.Barrier(8)
+
+        with mock.patch("joblib.load", side_effect=real_load) as load:
+
+            def first_call():
+                barrier.wait()
+                predict.load_model()
+
+            threads = [threading.Thread(target=first_call) for _ in range(8)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        # model + vectorizer, once
+        self.assertEqual(load.call_count, 2)
+        self.assertIn(predict.predict_issue_category("pothole on the road"), {
+            "road", "garbage", "water", "electricity", "other",
+        })
+
+    def batch_client(self, username="citizen"):
+
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_user(username=username, password="pass12345", role="consumer")
+        )
+
+        return client
+
+    def test_batch_endpoint(self):
+
+        url = "/api/v1/reports/predict-category/batch/"
+        descriptions = ["Huge potholes on the road", "", "Garbage piled up near the market"]
+        client = self.batch_client()
+
+        with self.count_predictions() as batch:
+            response = client.post(url, {"descriptions": descriptions}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        batch.assert_called_once_with([descriptions[0], descriptions[2]])
+
+        results = response.data["results"]
+
+        self.assertEqual([row["category"] for row in results], ["road", "other", "garbage"])
+        self.assertIsNone(results[1]["confidence"])
+        self.assertTrue(0 < results[0]["confidence"] <= 1)
+
+        too_many = ["pothole"] * (views.MAX_PREDICT_BATCH + 1)
+
+        for body in ({"descriptions": too_many}, {"descriptions": "pothole"}, {}):
+            self.assertEqual(client.post(url, body, format="json").status_code, 400)
+
+    def test_batch_endpoint_requires_auth_and_is_throttled(self):
+
+        url = "/api/v1/reports/predict-category/batch/"
+        body = {"descriptions": ["Huge potholes on the road"]}
+
+        self.assertEqual(APIClient().post(url, body, format="json").status_code, 401)
+
+        client = self.batch_client()
+
+        with mock.patch.dict(views.PredictBatchThrottle.THROTTLE_RATES, predict_batch="2/min"):
+
+            statuses = [client.post(url, body, format="json").status_code for _ in range(3)]
+            self.assertEqual(statuses, [200, 200, 429])
+
+            # the limit is per user
+            other = self.batch_client("neighbour")
+            self.assertEqual(other.post(url, body, format="json").status_code, 200)
+
+    def test_predictions_are_memoized_per_model_version(self):
+
+        url = "/api/v1/reports/predict-category/"
+
+        with self.count_predictions() as batch:
+
+            first = APIClient().post(url, {"description": "Huge potholes on the road"})
+
+            # same tokens once case, punctuation, stop words and order go
+            APIClient().post(url, {"description": "road: huge POTHOLES!"})
+            self.assertEqual(batch.call_count, 1)
+
+            # shared tier survives a process-local miss
+            prediction_cache._local.clear()
+            APIClient().post(url, {"description": "Huge potholes on the road"})
+            self.assertEqual(batch.call_count, 1)
+
+            with mock.patch.object(predict, "_version", "retrained"):
+                again = APIClient().post(url, {"description": "Huge potholes on the road"})
+
+            self.assertEqual(batch.call_count, 2)
+
+        self.assertEqual(first.data, again.data)
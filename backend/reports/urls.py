@@ -7,7 +7,11 @@ from .views import (
     ProviderIssueViewSet,
     FlagReportViewSet,
     flagged_issues_list,
+    issue_clusters_api,
+    issue_heatmap_api,
+    issue_providers_api,
     predict_issue_category_api,
+    predict_issue_categories_api,
 )
 
 app_name = "reports"
@@ -53,6 +57,25 @@ urlpatterns = [
         name="flagged_issues_list",
     ),
 
+    # ---------------- Map ----------------
+    path(
+        "clusters/",
+        issue_clusters_api,
+        name="issue-clusters",
+    ),
+
+    path(
+        "heatmap/",
+        issue_heatmap_api,
+        name="issue-heatmap",
+    ),
+
+    path(
+        "coverage/",
+        issue_providers_api,
+        name="issue-providers",
+    ),
+
     # ---------------- ML Utility ----------------
     path(
         "predict-category/",
@@ -60,6 +83,12 @@ urlpatterns = [
         name="predict-category",
     ),
 
+    path(
+        "predict-category/batch/",
+        predict_issue_categories_api,
+        name="predict-category-batch",
+    ),
+
     # Optional success page
     path(
         "success/",
@@ -1,114 +1,571 @@
+import math
+
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
-from django.db import IntegrityError
-
-from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from rest_framework import generics, viewsets, status
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes,
+)
+from rest_framework.exceptions import NotFound, ParseError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.throttling import UserRateThrottle
 
-from math import radians, cos, sin, asin, sqrt
+from accounts.authentication import ClaimsJWTAuthentication
 
-from .models import Issue, FlagReport
+from .models import ArchivedIssue, Issue, FlagReport
 from .serializers import (
     ConsumerIssueSerializer,
     ProviderIssueSerializer,
     FlagReportSerializer,
+    DuplicateIssueSerializer,
 )
 from .permission import IsConsumer, IsProvider
+from .querysets import (
+    archived_issues,
+    consumer_issues,
+    provider_issues,
+    search_archived_issues,
+    search_issues,
+)
+from .conditional import (
+    collection_validators,
+    conditional_response,
+    detail_validators,
+)
+from .geo import radius_candidates, within_radius
+from .clustering import clusters_in_bbox
+from .heatmap import heatmap_in_bbox
+from .services.provider_coverage import providers_for_point
+from .services.duplicate_detection import find_duplicates
+from .services.likes import toggle_like
+from .services import categorization, queue_cache, workflow
+from .services.archival import as_issue, as_issues
 
-from ml.predict import predict_issue_category
+from ml.prediction_cache import cached_categories, cached_category
 
 
 # =========================================================
-# Utility: Haversine Distance (KM)
+# ML Category Prediction API
 # =========================================================
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
+@api_view(["POST"])
+def predict_issue_category_api(request):
 
-    lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
+    description = request.data.get("description")
 
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
+    if not description:
+        return Response(
+            {"error": "description is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    a = (
-        sin(dlat / 2) ** 2
-        + cos(radians(lat1))
-        * cos(radians(lat2))
-        * sin(dlon / 2) ** 2
-    )
+    category = cached_category(description)
 
-    c = 2 * asin(min(1, sqrt(a)))
+    return Response({"category": category})
 
-    return R * c
+
+# well under ml.predict.MAX_BATCH_SIZE, which in-process callers use
+MAX_PREDICT_BATCH = 100
+
+
+class PredictBatchThrottle(UserRateThrottle):
+    scope = "predict_batch"
+
+
+@api_view(["POST"])
+@authentication_classes([ClaimsJWTAuthentication])
+@permission_classes([IsAuthenticated])
+@throttle_classes([PredictBatchThrottle])
+def predict_issue_categories_api(request):
+    """
+    Classify up to MAX_PREDICT_BATCH descriptions in one call:
+    {"descriptions": [...]} -> {"results": [{"category", "confidence"}]}
+
+    Authenticated users only, rate limited per user (the
+    "predict_batch" rate in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]).
+    """
+
+    descriptions = request.data.get("descriptions")
+
+    if not isinstance(descriptions, list) or not descriptions or not all(
+        isinstance(text, str) for text in descriptions
+    ):
+        return Response(
+            {"error": "descriptions must be a non-empty list of strings"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if len(descriptions) > MAX_PREDICT_BATCH:
+        return Response(
+            {"error": f"at most {MAX_PREDICT_BATCH} descriptions per request"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response({
+        "results": [
+            {"category": category, "confidence": confidence}
+            for category, confidence in cached_categories(descriptions)
+        ]
+    })
 
 
 # =========================================================
-# ML Category Prediction API
+# Coordinate parsing
 # =========================================================
-@api_view(["POST"])
-def predict_issue_category_api(request):
+def parse_coordinate(value, limit):
+    """
+    Return value as a float, raising ValueError unless it is a finite
+    number between -limit and limit (90 for latitudes, 180 for
+    longitudes).
+    """
 
-    description = request.data.get("description")
+    number = float(value)
 
-    if not description:
+    if not (math.isfinite(number) and -limit <= number <= limit):
+        raise ValueError(f"{value!r} is not a coordinate")
+
+    return number
+
+
+def parse_bbox(value):
+    """
+    Parse "west,south,east,north" in degrees, raising ValueError. A box
+    with west > east crosses the antimeridian.
+    """
+
+    west, south, east, north = value.split(",")
+
+    west, east = parse_coordinate(west, 180), parse_coordinate(east, 180)
+    south, north = parse_coordinate(south, 90), parse_coordinate(north, 90)
+
+    if south > north:
+        raise ValueError("south is above north")
+
+    return west, south, east, north
+
+
+# =========================================================
+# Map Clusters API
+# =========================================================
+@api_view(["GET"])
+@authentication_classes([ClaimsJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def issue_clusters_api(request):
+    """
+    GET ?bbox=west,south,east,north&zoom=12[&status=a,b][&category=a,b]
+
+    Served from precomputed per-zoom cell aggregates.
+    """
+
+    try:
+        west, south, east, north = parse_bbox(request.query_params["bbox"])
+        zoom = int(request.query_params["zoom"])
+    except (KeyError, ValueError):
         return Response(
-            {"error": "description is required"},
+            {"detail": "bbox=west,south,east,north and zoom are required"},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    category = predict_issue_category(description)
+    statuses = request.query_params.get("status")
+    categories = request.query_params.get("category")
+
+    try:
+        clusters = clusters_in_bbox(
+            west,
+            south,
+            east,
+            north,
+            zoom,
+            statuses=statuses.split(",") if statuses else None,
+            categories=categories.split(",") if categories else None,
+        )
+    except ValueError as exc:
+        return Response(
+            {"detail": str(exc)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    return Response({"category": category})
+    return Response({"zoom": zoom, "clusters": clusters})
+
+
+# =========================================================
+# Open Issue Heatmap API
+# =========================================================
+@api_view(["GET"])
+@authentication_classes([ClaimsJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def issue_heatmap_api(request):
+    """
+    GET ?bbox=west,south,east,north[&category=a,b]
+
+    Served from the per-cell open issue rollup.
+    """
+
+    try:
+        west, south, east, north = parse_bbox(request.query_params["bbox"])
+    except (KeyError, ValueError):
+        return Response(
+            {"detail": "bbox=west,south,east,north is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    categories = request.query_params.get("category")
+
+    try:
+        heatmap = heatmap_in_bbox(
+            west,
+            south,
+            east,
+            north,
+            categories=categories.split(",") if categories else None,
+        )
+    except ValueError as exc:
+        return Response(
+            {"detail": str(exc)},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(heatmap)
+
+
+# =========================================================
+# Provider Coverage API
+# =========================================================
+@api_view(["GET"])
+@authentication_classes([ClaimsJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def issue_providers_api(request):
+    """
+    GET ?issue=<id>  or  ?lat=&lon=&category=
+
+    Lists the providers whose service radius covers the point,
+    nearest first, using the reverse coverage index.
+    """
+
+    issue_id = request.query_params.get("issue")
+
+    if issue_id:
+        issue = get_object_or_404(Issue, pk=issue_id)
+        category, lat, lon = issue.category, issue.latitude, issue.longitude
+
+    else:
+        category = request.query_params.get("category")
+
+        try:
+            lat = parse_coordinate(request.query_params["lat"], 90)
+            lon = parse_coordinate(request.query_params["lon"], 180)
+        except (KeyError, ValueError):
+            lat = lon = None
+
+    if not category or lat is None or lon is None:
+        return Response(
+            {"detail": "issue, or lat, lon and category are required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    matches = providers_for_point(category, lat, lon)
+
+    providers = get_user_model().objects.in_bulk(
+        [provider_id for provider_id, _ in matches]
+    )
+
+    return Response({
+        "providers": [
+            {
+                "id": provider_id,
+                "username": providers[provider_id].username,
+                "service_radius_km": providers[provider_id].service_radius_km,
+                "distance_km": round(distance, 2),
+            }
+            for provider_id, distance in matches
+            if provider_id in providers
+        ]
+    })
+
+
+# =========================================================
+# Radius Search (?lat=&lon=&radius=)
+# =========================================================
+MAX_RADIUS_KM = 100
+MAX_RADIUS_RESULTS = 100
+
+
+def result_limit(request, maximum):
+
+    try:
+        limit = int(request.query_params.get("limit", maximum))
+    except ValueError:
+        raise ParseError("limit must be an integer")
+
+    return min(max(limit, 1), maximum)
+
+
+class RadiusQueryMixin:
+    """
+    Adds ?lat=&lon=&radius= support to list endpoints.
+    Rows are prefiltered in SQL by grid cell and bounding box; exact
+    distances are only computed for rows inside the box. Results are
+    nearest first and capped at MAX_RADIUS_RESULTS (or ?limit=); larger
+    radii are clamped to MAX_RADIUS_KM rather than rejected.
+    """
+
+    def get_radius_params(self, request, default_radius=None):
+
+        lat = request.query_params.get("lat")
+        lon = request.query_params.get("lon")
+        radius = request.query_params.get("radius", default_radius)
+
+        if radius is None:
+            return None
+
+        if not lat or not lon:
+            raise ParseError("lat and lon are required")
+
+        try:
+            lat, lon, radius = float(lat), float(lon), float(radius)
+        except (TypeError, ValueError):
+            raise ParseError("lat, lon and radius must be numbers")
+
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ParseError("lat/lon out of range")
+
+        if not radius > 0:
+            raise ParseError("radius must be positive")
+
+        return lat, lon, min(radius, MAX_RADIUS_KM)
+
+    def radius_response(self, queryset, lat, lon, radius):
+        """
+        Takes a queryset, or a list of them (hot + archived issues).
+        """
+
+        limit = result_limit(self.request, MAX_RADIUS_RESULTS)
+
+        querysets = queryset if isinstance(queryset, (list, tuple)) else [queryset]
+
+        issues = [
+            row
+            for source in querysets
+            for row in within_radius(source, lat, lon, radius)
+        ]
+
+        if len(querysets) > 1:
+            issues.sort(key=lambda row: row._distance)
+
+        serializer = self.get_serializer(
+            as_issues(issues[:limit]),
+            many=True
+        )
+
+        return Response(serializer.data)
+
+    def list(self, request, *args, **kwargs):
+
+        params = self.get_radius_params(request)
+
+        if params is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        return self.radius_response(queryset, *params)
+
+
+MAX_SEARCH_RESULTS = 100
+
+
+class SearchQueryMixin:
+    """
+    Adds ?q= full-text search to list endpoints. Matches come from the
+    GIN-indexed search_vector, best ranked first (nearest first when
+    combined with ?lat=&lon=&radius=), capped at MAX_SEARCH_RESULTS
+    (or ?limit=).
+    """
+
+    def search_response(self, queryset, archived=None):
+        """
+        Return a ranked search Response, or None when there is no ?q=.
+        Matches from an `archived` queryset are merged in by rank.
+        """
+
+        text = self.request.query_params.get("q", "").strip()
+
+        if not text:
+            return None
+
+        querysets = [search_issues(queryset, text)]
+
+        if archived is not None:
+            querysets.append(search_archived_issues(archived, text))
+
+        params = self.get_radius_params(self.request)
+
+        if params is not None:
+            return self.radius_response(querysets, *params)
+
+        limit = result_limit(self.request, MAX_SEARCH_RESULTS)
+
+        issues = [row for source in querysets for row in source[:limit]]
+
+        if len(querysets) > 1:
+            issues.sort(key=lambda row: (row.rank, row.created_at, row.pk), reverse=True)
+
+        serializer = self.get_serializer(
+            as_issues(issues[:limit]),
+            many=True
+        )
+
+        return Response(serializer.data)
+
+    def list(self, request, *args, **kwargs):
+
+        # viewsets whose pages include archived issues search them too
+        get_archived = getattr(self, "get_archived_queryset", None)
+
+        response = self.search_response(
+            self.filter_queryset(self.get_queryset()),
+            get_archived() if get_archived else None,
+        )
+
+        if response is None:
+            return super().list(request, *args, **kwargs)
+
+        return response
 
 
 # =========================================================
 # CONSUMER ISSUE VIEWSET
 # =========================================================
-class ConsumerIssueViewSet(viewsets.ModelViewSet):
+class ConsumerIssueViewSet(SearchQueryMixin, RadiusQueryMixin, viewsets.ModelViewSet):
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated, IsConsumer]
     serializer_class = ConsumerIssueSerializer
 
     def get_queryset(self):
-        return Issue.objects.filter(
-            reported_by=self.request.user
+        return consumer_issues(
+            Issue.objects.filter(reported_by_id=self.request.user.pk)
         ).order_by("-created_at")
 
+    # ---------------- History (hot + archived issues) ----------------
+    def get_archived_queryset(self):
+        return archived_issues(
+            ArchivedIssue.objects.filter(reported_by_id=self.request.user.pk)
+        )
+
+    def paginate_queryset(self, queryset):
+        return as_issues(
+            super().paginate_queryset([queryset, self.get_archived_queryset()])
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+
+        validators = detail_validators(
+            kwargs["pk"],
+            self.get_queryset(),
+            self.get_archived_queryset(),
+        )
+
+        return conditional_response(
+            request,
+            validators,
+            lambda: self.retrieve_issue(request, *args, **kwargs),
+        )
+
+    def retrieve_issue(self, request, *args, **kwargs):
+
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # DRF's variant turns a malformed pk into a 404 as well
+            archived = generics.get_object_or_404(
+                self.get_archived_queryset(),
+                pk=kwargs["pk"],
+            )
+
+        return Response(self.get_serializer(as_issue(archived)).data)
+
+    def create(self, request, *args, **kwargs):
+
+        response = super().create(request, *args, **kwargs)
+
+        response.data["possible_duplicates"] = DuplicateIssueSerializer(
+            self.possible_duplicates,
+            many=True,
+        ).data
+
+        return response
+
     def perform_create(self, serializer):
 
-        serializer.save(
-            reported_by=self.request.user
+        data = serializer.validated_data
+
+        # looked up before saving so the new issue can't match itself
+        self.possible_duplicates = find_duplicates(
+            data.get("title"),
+            data.get("description"),
+            data.get("latitude"),
+            data.get("longitude"),
         )
 
-    # ---------------- Like Issue ----------------
-    @action(detail=True, methods=["post"])
-    def like(self, request, pk=None):
+        issue = serializer.save(
+            reported_by_id=self.request.user.pk
+        )
 
-        issue = self.get_object()
-        user = request.user
+        # ML category + auto-assignment run in Celery
+        transaction.on_commit(lambda: categorization.enqueue_issue(issue))
 
-        if user in issue.likes.all():
-            issue.likes.remove(user)
+    # ---------------- Duplicate Check (before submit) ----------------
+    @action(detail=False, methods=["post"])
+    def duplicates(self, request):
+
+        try:
+            latitude = parse_coordinate(request.data["latitude"], 90)
+            longitude = parse_coordinate(request.data["longitude"], 180)
+        except (KeyError, TypeError, ValueError):
             return Response(
-                {"liked": False, "likes_count": issue.likes.count()}
+                {"detail": "latitude and longitude are required"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        issue.likes.add(user)
+        matches = find_duplicates(
+            request.data.get("title"),
+            request.data.get("description"),
+            latitude,
+            longitude,
+        )
+
+        return Response(DuplicateIssueSerializer(matches, many=True).data)
+
+    # ---------------- Like Issue ----------------
+    @action(detail=True, methods=["post"])
+    def like(self, request, pk=None):
+
+        if not self.get_queryset().filter(pk=pk).exists():
+            raise NotFound()
+
+        liked, likes_count = toggle_like(pk, request.user.pk)
 
         return Response(
-            {"liked": True, "likes_count": issue.likes.count()}
+            {"liked": liked, "likes_count": likes_count}
         )
 
 
 # =========================================================
 # PROVIDER ISSUE VIEWSET
 # =========================================================
-class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
+class ProviderIssueViewSet(SearchQueryMixin, RadiusQueryMixin, viewsets.ReadOnlyModelViewSet):
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated, IsProvider]
     serializer_class = ProviderIssueSerializer
 
@@ -116,14 +573,40 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
 
         user = self.request.user
 
-        queryset = Issue.objects.filter(
-            assigned_provider__isnull=True,
-            status="pending",
-            category=user.profession
+        queryset = provider_issues(
+            Issue.objects.filter(
+                assigned_provider__isnull=True,
+                status="pending",
+                category=user.profession
+            )
         ).order_by("-created_at")
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+
+        # plain polls of the queue share one cached page per profession;
+        # cursors, search and radius queries go to the database
+        if request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        def build():
+            return super(ProviderIssueViewSet, self).list(
+                request, *args, **kwargs
+            ).data
+
+        return Response(queue_cache.get_queue(request.user.profession, build))
+
+    def retrieve(self, request, *args, **kwargs):
+
+        return conditional_response(
+            request,
+            detail_validators(kwargs["pk"], self.get_queryset()),
+            lambda: super(ProviderIssueViewSet, self).retrieve(
+                request, *args, **kwargs
+            ),
+        )
+
 
     # =====================================================
     # Provider Dashboard → My Assigned Issues
@@ -131,16 +614,35 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"], url_path="my-issues")
     def my_issues(self, request):
 
-        issues = Issue.objects.filter(
-            assigned_provider=request.user
-        ).order_by("-created_at")
+        issues = provider_issues(
+            Issue.objects.filter(assigned_provider_id=request.user.pk)
+        )
 
-        serializer = self.get_serializer(
-            issues,
-            many=True
+        archived = archived_issues(
+            ArchivedIssue.objects.filter(assigned_provider_id=request.user.pk)
         )
 
-        return Response(serializer.data)
+        def build():
+
+            response = self.search_response(issues, archived)
+
+            if response is not None:
+                return response
+
+            page = as_issues(self.paginate_queryset([issues, archived]))
+
+            serializer = self.get_serializer(
+                page,
+                many=True
+            )
+
+            return self.get_paginated_response(serializer.data)
+
+        return conditional_response(
+            request,
+            collection_validators(issues, archived),
+            build,
+        )
 
 
     # =====================================================
@@ -149,52 +651,59 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"], url_path="nearby")
     def nearby_issues(self, request):
 
-        lat = request.query_params.get("lat")
-        lon = request.query_params.get("lon")
-        radius = float(request.query_params.get("radius", 10))
+        lat, lon, radius = self.get_radius_params(
+            request,
+            default_radius=10,
+        )
 
-        if not lat or not lon:
-            return Response(
-                {"detail": "lat and lon are required"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        queryset = self.get_queryset()
 
-        provider_profession = request.user.profession
+        return conditional_response(
+            request,
+            collection_validators(radius_candidates(queryset, lat, lon, radius)),
+            lambda: self.radius_response(queryset, lat, lon, radius),
+        )
 
-        issues_in_radius = []
 
-        issues = Issue.objects.filter(
-            assigned_provider__isnull=True,
-            status="pending",
-            category=provider_profession
-        )
+    # =====================================================
+    # Workflow (claim / start / resolve)
+    # =====================================================
+    # generic on purpose: the status and assignment of issues that
+    # aren't the caller's are never revealed (see services/workflow.py)
+    TRANSITION_ERRORS = {
+        workflow.NOT_FOUND: (
+            "Not found.",
+            status.HTTP_404_NOT_FOUND,
+        ),
+        workflow.UNAVAILABLE: (
+            "Issue is no longer available",
+            status.HTTP_409_CONFLICT,
+        ),
+    }
 
-        for issue in issues:
+    # only reported to the assigned provider
+    INVALID_STATUS_ERRORS = {
+        workflow.START: "Issue must be assigned",
+        workflow.RESOLVE: "Issue must be in progress",
+    }
 
-            if issue.latitude and issue.longitude:
+    def transition_response(self, pk, action, success_detail):
 
-                dist = haversine(
-                    lat,
-                    lon,
-                    issue.latitude,
-                    issue.longitude
-                )
+        failure = workflow.apply_transition(pk, self.request.user, action)
 
-                if dist <= radius:
+        if failure is None:
+            return Response({"detail": success_detail})
 
-                    issue._distance = dist
-                    issues_in_radius.append(issue)
+        detail, code = self.transition_error(action, failure)
 
-        issues_in_radius.sort(
-            key=lambda x: x._distance
-        )
+        return Response({"detail": detail}, status=code)
 
-        serializer = self.get_serializer(
-            issues_in_radius,
-            many=True
-        )
+    def transition_error(self, action, failure):
 
-        return Response(serializer.data)
+        if failure == workflow.INVALID_STATUS:
+            return self.INVALID_STATUS_ERRORS[action], status.HTTP_400_BAD_REQUEST
+
+        return self.TRANSITION_ERRORS[failure]
 
 
     # =====================================================
@@ -203,26 +712,11 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=["post"])
     def claim(self, request, pk=None):
 
-        issue = self.get_object()
-
-        if issue.assigned_provider:
-            return Response(
-                {"detail": "Issue already assigned"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # department validation
-        if issue.category != request.user.profession:
-            return Response(
-                {"detail": "You cannot claim this issue category"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        issue.assigned_provider = request.user
-        issue.status = "assigned"
-        issue.save()
-
-        return Response({"detail": "Issue claimed successfully"})
+        return self.transition_response(
+            pk,
+            workflow.CLAIM,
+            "Issue claimed successfully",
+        )
 
 
     # =====================================================
@@ -231,18 +725,12 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=["post"])
     def start(self, request, pk=None):
 
-        issue = self.get_object()
-
-        if issue.assigned_provider != request.user:
-            return Response(
-                {"detail": "Not authorized"},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        issue.status = "in_progress"
-        issue.save()
-
-        return Response({"detail": "Work started"})
+        # from "assigned" only; started or resolved issues are rejected
+        return self.transition_response(
+            pk,
+            workflow.START,
+            "Work started",
+        )
 
 
     # =====================================================
@@ -251,24 +739,63 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=["post"])
     def resolve(self, request, pk=None):
 
-        issue = self.get_object()
+        return self.transition_response(
+            pk,
+            workflow.RESOLVE,
+            "Issue resolved",
+        )
+
 
-        if issue.assigned_provider != request.user:
+    # =====================================================
+    # Batch Transition (end-of-shift start / resolve)
+    # =====================================================
+    @action(detail=False, methods=["post"], url_path="batch-transition")
+    def batch_transition(self, request):
+
+        ids = request.data.get("ids")
+        target = request.data.get("status")
+
+        action_name = workflow.ACTION_FOR_STATUS.get(target)
+
+        if action_name is None:
             return Response(
-                {"detail": "Not authorized"},
-                status=status.HTTP_403_FORBIDDEN,
+                {"detail": "status must be one of: "
+                 + ", ".join(workflow.ACTION_FOR_STATUS)},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if issue.status != "in_progress":
+        # bool is an int subclass; strings, floats and dicts are not ids
+        if not isinstance(ids, list) or not all(
+            isinstance(pk, int) and not isinstance(pk, bool) for pk in ids
+        ):
             return Response(
-                {"detail": "Issue must be in progress"},
+                {"detail": "ids must be a list of issue ids"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        issue.status = "resolved"
-        issue.save()
+        if not ids or len(ids) > workflow.MAX_BATCH_SIZE:
+            return Response(
+                {"detail": f"ids must contain 1 to {workflow.MAX_BATCH_SIZE} issues"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        return Response({"detail": "Issue resolved"})
+        results = workflow.apply_transitions(ids, request.user, action_name)
+
+        return Response({
+            "status": target,
+            "updated": sum(failure is None for failure in results.values()),
+            "results": [
+                {
+                    "id": pk,
+                    "ok": failure is None,
+                    "detail": (
+                        None if failure is None
+                        else self.transition_error(action_name, failure)[0]
+                    ),
+                }
+                for pk, failure in results.items()
+            ],
+        })
 
 
 # =========================================================
@@ -276,7 +803,7 @@ class ProviderIssueViewSet(viewsets.ReadOnlyModelViewSet):
 # =========================================================
 class FlagReportViewSet(viewsets.ModelViewSet):
 
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated, IsConsumer]
     serializer_class = FlagReportSerializer
     queryset = FlagReport.objects.all()
@@ -285,7 +812,7 @@ class FlagReportViewSet(viewsets.ModelViewSet):
 
         try:
             serializer.save(
-                reported_by=self.request.user
+                reported_by_id=self.request.user.pk
             )
 
         except IntegrityError:
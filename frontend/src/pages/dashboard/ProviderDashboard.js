@@ -75,7 +75,9 @@ export default function ProviderDashboard() {
           nearbyRes.json(),
         ]);
 
-        setAssignedIssues(assignedData);
+        setAssignedIssues(
+          Array.isArray(assignedData) ? assignedData : assignedData.results || []
+        );
         setNearbyIssues(nearbyData);
       } catch (err) {
         if (err.name !== "AbortError") {